@@ -0,0 +1,292 @@
+"""
+1Hz Training Pipeline Benchmark
+===============================
+Runs every stage of train_1hz_model.main() on a synthetic dataset and records,
+per stage, wall time, peak RSS and throughput (rows/s, sequences/s).
+Results are written as JSON so runs can be compared across commits.
+
+Usage:
+    python benchmark_training.py --rows 300000 --epochs 1 --output bench_300k.json
+
+Stages:
+    csv_load         Parse the CSV and group by state (no cache)
+    csv_cache_build  First cached load: parse + write per-state .npy files
+    csv_cache_load   Warm cached load (memory-mapped)
+    normalize        Per-state MinMax normalization
+    sequences        Build window datasets and gather every training batch once
+    fit              model.fit for --epochs epochs
+    thresholds       Streaming threshold calibration on the test windows
+    save             Model, scaler and threshold artifacts
+"""
+
+import os
+# Set Keras backend to JAX before importing keras
+os.environ['KERAS_BACKEND'] = 'jax'
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import keras
+
+import train_1hz_model as trainer
+from src.data.cache import load_grouped_cached
+
+MIN_ROWS = 1_000
+MAX_ROWS = 5_000_000
+
+# Per-state band means used to synthesize data (roughly the real recordings)
+SYNTHETIC_STATES = {
+    'Baseline': [10.0, 15.0, 33.0, 18.0, 5.0],
+    'Focused': [8.0, 12.0, 25.0, 28.0, 7.0],
+    'Stressed': [12.0, 20.0, 18.0, 35.0, 10.0],
+}
+
+
+# =============================================================================
+# SYNTHETIC DATA
+# =============================================================================
+def make_synthetic_csv(path, rows, seed=0):
+    """Write a State,Delta,...,Gamma CSV with `rows` rows split across states."""
+    rng = np.random.default_rng(seed)
+    per_state = np.array_split(np.arange(rows), len(SYNTHETIC_STATES))
+
+    frames = []
+    for (state, means), idx in zip(SYNTHETIC_STATES.items(), per_state):
+        t = np.arange(len(idx))[:, None]
+        means = np.asarray(means)
+        values = means * (1 + 0.2 * np.sin(t / 30.0 + np.arange(len(means))))
+        values += rng.normal(0, 0.05 * means, (len(idx), len(means)))
+        frame = pd.DataFrame(np.round(values, 2), columns=trainer.EEG_BANDS)
+        frame.insert(0, 'State', state)
+        frames.append(frame)
+
+    pd.concat(frames, ignore_index=True).to_csv(path, index=False)
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+def _read_status_kb(field):
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss():
+    """Reset the kernel's peak RSS counter (Linux). Returns False if unsupported."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def current_rss_mb():
+    rss = _read_status_kb('VmRSS')
+    return None if rss is None else rss / 1024
+
+
+def peak_rss_mb():
+    """Peak RSS since the last reset_peak_rss() (or process start if unsupported)."""
+    peak = _read_status_kb('VmHWM')
+    if peak is None:
+        # ru_maxrss is KB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak = peak / 1024 if sys.platform == 'darwin' else peak
+    return peak / 1024
+
+
+class StageRecorder:
+    """Collects wall time, peak RSS and throughput for each pipeline stage."""
+
+    def __init__(self):
+        self.stages = []
+        self.per_stage_peak = reset_peak_rss()
+
+    @contextmanager
+    def stage(self, name, rows=None, sequences=None):
+        """
+        Time a block. `rows`/`sequences` may be ints or set later on the
+        yielded dict (e.g. when the count is only known afterwards).
+        """
+        counts = {'rows': rows, 'sequences': sequences}
+        if self.per_stage_peak:
+            reset_peak_rss()
+        rss_before = current_rss_mb()
+        start = time.perf_counter()
+        yield counts
+        wall = time.perf_counter() - start
+
+        record = {
+            'stage': name,
+            'wall_s': wall,
+            'rss_before_mb': rss_before,
+            'peak_rss_mb': peak_rss_mb(),
+            'peak_rss_scope': 'stage' if self.per_stage_peak else 'process',
+        }
+        for key in ('rows', 'sequences'):
+            if counts[key] is not None:
+                record[key] = int(counts[key])
+                record[f'{key}_per_s'] = counts[key] / wall if wall > 0 else None
+        self.stages.append(record)
+
+
+class EpochTimer(keras.callbacks.Callback):
+    """Records the wall time of each training epoch."""
+
+    def on_train_begin(self, logs=None):
+        self.epoch_times = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.epoch_times.append(time.perf_counter() - self._start)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+def run_benchmark(rows, epochs=1, work_dir=None, seed=0):
+    """
+    Run every training stage on `rows` synthetic rows.
+
+    Returns:
+        dict with 'meta' (configuration and environment) and 'stages'
+        (one record per stage).
+    """
+    if not MIN_ROWS <= rows <= MAX_ROWS:
+        raise ValueError(f"rows must be between {MIN_ROWS:,} and {MAX_ROWS:,}, got {rows:,}")
+
+    work_dir = work_dir or tempfile.mkdtemp(prefix='eeg_bench_')
+    os.makedirs(work_dir, exist_ok=True)
+    csv_path = os.path.join(work_dir, 'Synthetic_EEG_Data.csv')
+    make_synthetic_csv(csv_path, rows, seed=seed)
+
+    np.random.seed(seed)
+    keras.utils.set_random_seed(seed)
+    recorder = StageRecorder()
+
+    with recorder.stage('csv_load', rows=rows):
+        trainer.load_and_group_data(csv_path, use_cache=False)
+
+    # rebuild=True: a reused --work-dir would otherwise only time the freshness check
+    with recorder.stage('csv_cache_build', rows=rows):
+        load_grouped_cached(csv_path, trainer.EEG_BANDS, rebuild=True)
+
+    with recorder.stage('csv_cache_load', rows=rows):
+        grouped_data = trainer.load_and_group_data(csv_path, use_cache=True)
+
+    with recorder.stage('normalize', rows=rows):
+        normalized_data, scalers = trainer.normalize_data(grouped_data)
+
+    with recorder.stage('sequences', rows=rows) as counts:
+        train_ds, val_ds, test_windows, _ = trainer.prepare_window_datasets(
+            normalized_data,
+            lookback=trainer.LOOKBACK,
+            test_split=trainer.TEST_SPLIT,
+            validation_split=trainer.VALIDATION_SPLIT,
+            batch_size=trainer.BATCH_SIZE
+        )
+        for i in range(len(train_ds)):
+            train_ds[i]
+        counts['sequences'] = len(train_ds.windows)
+
+    model = trainer.build_model(
+        input_shape=(trainer.LOOKBACK, len(trainer.EEG_BANDS)),
+        output_units=len(trainer.EEG_BANDS)
+    )
+    epoch_timer = EpochTimer()
+
+    with recorder.stage('fit', sequences=len(train_ds.windows) * epochs):
+        model.fit(train_ds, epochs=epochs, validation_data=val_ds,
+                  callbacks=[epoch_timer], verbose=0)
+    recorder.stages[-1]['epoch_wall_s'] = epoch_timer.epoch_times
+
+    with recorder.stage('thresholds', sequences=len(test_windows)):
+        mae_per_band, thresholds, percentile_thresholds = trainer.calculate_thresholds(
+            model, test_windows, multiplier=trainer.GLITCH_MULTIPLIER
+        )
+
+    with recorder.stage('save'):
+        trainer.save_artifacts(model, scalers, mae_per_band, thresholds,
+                               percentile_thresholds, output_dir=work_dir)
+
+    meta = {
+        'rows': rows,
+        'epochs': epochs,
+        'lookback': trainer.LOOKBACK,
+        'batch_size': trainer.BATCH_SIZE,
+        'dtype': np.dtype(trainer.FLOAT_DTYPE).name,
+        'git_commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'keras': keras.__version__,
+        'keras_backend': keras.backend.backend(),
+        'work_dir': work_dir,
+    }
+    return {'meta': meta, 'stages': recorder.stages}
+
+
+def print_summary(results):
+    print("\n" + "=" * 78)
+    print(f"  BENCHMARK: {results['meta']['rows']:,} rows, {results['meta']['epochs']} epoch(s)")
+    print("=" * 78)
+    print(f"  {'Stage':<16} {'Wall (s)':>10} {'Peak RSS (MB)':>14} {'Rows/s':>14} {'Seq/s':>14}")
+    print("  " + "-" * 72)
+    for stage in results['stages']:
+        rows_per_s = stage.get('rows_per_s')
+        seq_per_s = stage.get('sequences_per_s')
+        print(f"  {stage['stage']:<16} {stage['wall_s']:>10.3f} {stage['peak_rss_mb']:>14.1f} "
+              f"{rows_per_s or 0:>14,.0f} {seq_per_s or 0:>14,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=100_000,
+                        help=f"Synthetic rows ({MIN_ROWS:,} to {MAX_ROWS:,})")
+    parser.add_argument('--epochs', type=int, default=1, help="Training epochs to time")
+    parser.add_argument('--output', default='benchmark_results.json', help="JSON results path")
+    parser.add_argument('--work-dir', default=None, help="Where to put the CSV and artifacts")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.rows, epochs=args.epochs, work_dir=args.work_dir, seed=args.seed)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print_summary(results)
+    print(f"\nResults saved: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
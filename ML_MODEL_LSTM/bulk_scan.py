@@ -0,0 +1,270 @@
+"""
+Offline Bulk Glitch Scan
+========================
+Scans a whole band-power recording (State,Delta,Theta,Alpha,Beta,Gamma CSV)
+for sensor glitches with the 1Hz detector, without a per-row Python loop.
+
+Each contiguous run of one state is normalized with that state's scaler,
+every lookback window of the run is taken as a zero-copy strided view, and
+windows are predicted in large batches. The output CSV is the input, each
+line copied verbatim (full precision), plus:
+
+    checked         False for the first `lookback` rows of every state run
+                    (no full history yet) and rows of unknown states
+    is_glitch       True if any band's error exceeds its threshold
+    <Band>_error    Absolute normalized prediction error (NaN if unchecked)
+
+Verdicts match EEGGlitchDetector.check_reading on the same windows.
+
+The CSV is read in typed chunks (float32 bands, categorical State) and the
+annotated rows are written out chunk by chunk, so memory stays bounded by
+one chunk however long the recording is. The last `lookback` rows of each
+chunk are carried into the next as history, so results match one pass
+over the whole file.
+
+Throughput is bound by the LSTM forward pass, not by I/O. Every row costs
+a full `lookback`-step LSTM run (about 2 MFLOP at lookback 60) because the scan
+stays exact rather than reusing carried state. Measured on one CPU core with
+the jit-compiled Keras engine: 1M rows in 76 s (13k rows/s), against a raw
+forward-pass ceiling of about 17k windows/s. Batches larger than 4096 do
+not help, and the NumPy engine manages about 4k windows/s. Batches run on
+one thread per core (--workers), outside the GIL, so wall time should fall
+with core count: a million rows in seconds needs a 16+ core host.
+
+Usage:
+    python bulk_scan.py recording.csv --output recording_glitches.csv
+"""
+
+import io
+import itertools
+import os
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from glitch_detector import EEGGlitchDetector
+from src.data.windows import window_view
+
+BATCH_SIZE = 4096  # Windows per forward pass
+CHUNK_ROWS = 64 * BATCH_SIZE  # CSV rows per chunk (whole batches for a single-state chunk)
+
+
+def scan_frame(df, detector, batch_size=BATCH_SIZE, state_column='State', workers=None):
+    """
+    Scan a band-power DataFrame for glitches.
+    
+    Args:
+        df: DataFrame with the state column and the detector's band columns,
+            rows in recording order.
+        detector: An EEGGlitchDetector (its model, scalers and thresholds are used).
+        batch_size: Windows per forward pass.
+        state_column: Name of the state column.
+        workers: Threads running forward passes concurrently (default: one
+                 per CPU core). The jit forward pass runs outside the GIL.
+    
+    Returns:
+        DataFrame indexed like df with checked, is_glitch and <Band>_error columns.
+    """
+    bands = detector.bands
+    lookback = detector.lookback
+    thresholds = np.array([detector.thresholds[b] for b in bands])
+    
+    values = df[bands].to_numpy(dtype=np.float32)
+    states = pd.Categorical(df[state_column])
+    codes = states.codes
+    
+    errors = np.full((len(df), len(bands)), np.nan, dtype=np.float32)
+    
+    # Contiguous runs of one state: [start, stop)
+    boundaries = np.flatnonzero(np.diff(codes)) + 1
+    starts = np.r_[0, boundaries]
+    stops = np.r_[boundaries, len(df)]
+    
+    # One job per batch: (first target row, windows, targets)
+    jobs = []
+    for start, stop in zip(starts, stops):
+        code = codes[start]
+        if stop - start <= lookback or code < 0 or states.categories[code] not in detector.scalers:
+            continue
+        
+        scaler = detector.scalers[states.categories[code]]
+        run = values[start:stop] * np.asarray(scaler.scale, dtype=np.float32)
+        run += np.asarray(scaler.offset, dtype=np.float32)
+        
+        windows = window_view(run, lookback)
+        targets = run[lookback:]
+        for i in range(0, len(windows), batch_size):
+            jobs.append((start + lookback + i, windows[i:i + batch_size], targets[i:i + batch_size]))
+    
+    def run_job(job):
+        row, windows, targets = job
+        errors[row:row + len(targets)] = np.abs(targets - detector.predict_windows(windows))
+    
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(run_job, jobs))
+    else:
+        for job in jobs:
+            run_job(job)
+    
+    checked = ~np.isnan(errors[:, 0])
+    result = pd.DataFrame({'checked': checked}, index=df.index)
+    result['is_glitch'] = checked & (errors > thresholds).any(axis=1)
+    for i, band in enumerate(bands):
+        result[f'{band}_error'] = errors[:, i]
+    return result
+
+
+def _line_chunks(input_path, chunk_rows):
+    """Yields (header, lines) with up to chunk_rows non-blank data lines per chunk."""
+    with open(input_path, 'r', newline='') as f:
+        header = f.readline()
+        while True:
+            block = list(itertools.islice(f, chunk_rows))
+            if not block:
+                return
+            lines = [line for line in block if line.strip()]
+            if lines:
+                yield header, lines
+
+
+def iter_scan(input_path, detector, batch_size=BATCH_SIZE, chunk_rows=CHUNK_ROWS, state_column='State',
+              workers=None):
+    """
+    Scan a recording CSV chunk by chunk.
+    
+    Each chunk is parsed from its raw lines with typed columns (float32
+    bands, categorical state), and the raw lines are yielded alongside the
+    parsed rows so a writer can pass the input through untouched. Every CSV
+    record must sit on one line (no quoted line breaks).
+    
+    Args:
+        input_path: Band-power CSV (a state column plus one column per band).
+        detector: EEGGlitchDetector to scan with.
+        batch_size: Windows per forward pass.
+        chunk_rows: CSV rows read per chunk.
+        state_column: Name of the state column.
+        workers: Threads running forward passes (see scan_frame).
+    
+    Yields:
+        tuple: (lines, scanned) where lines are the chunk's raw CSV lines
+        and scanned holds its parsed input rows with the scan columns appended.
+    
+    Raises:
+        ValueError: If the CSV lacks the state column or a band column.
+    """
+    bands = detector.bands
+    header = pd.read_csv(input_path, nrows=0).columns
+    missing = [c for c in [state_column] + bands if c not in header]
+    if missing:
+        raise ValueError(f"{input_path} is missing column(s): {missing}")
+    
+    dtype = {band: np.float32 for band in bands}
+    dtype[state_column] = 'category'
+    tail = None
+    rows = 0
+    for header_line, lines in _line_chunks(input_path, chunk_rows):
+        chunk = pd.read_csv(io.StringIO(header_line + ''.join(lines)), dtype=dtype)
+        chunk.index += rows
+        rows += len(chunk)
+        
+        # Carried rows are history only: their results went out with the last chunk
+        carried = 0 if tail is None else len(tail)
+        frame = chunk if tail is None else pd.concat([tail, chunk], ignore_index=True)
+        scanned = scan_frame(frame, detector, batch_size, state_column, workers).iloc[carried:]
+        scanned.index = chunk.index
+        yield lines, pd.concat([chunk, scanned], axis=1)
+        tail = frame.iloc[-detector.lookback:]
+
+
+def scan_csv(input_path, output_path=None, detector=None, batch_size=BATCH_SIZE,
+             chunk_rows=CHUNK_ROWS, state_column='State', workers=None, **detector_kwargs):
+    """
+    Scan a recording CSV, optionally writing it back with the glitch columns.
+    
+    Only one chunk of rows is held in memory at a time. Input lines are
+    copied to the output verbatim, so their values keep full precision;
+    only the appended error columns are rounded (6 significant digits).
+    
+    Args:
+        input_path: Band-power CSV (a state column plus one column per band).
+        output_path: Where to write the annotated CSV (None = don't write).
+        detector: EEGGlitchDetector to use; built from detector_kwargs if None.
+        batch_size: Windows per forward pass.
+        chunk_rows: CSV rows read per chunk.
+        state_column: Name of the state column.
+        workers: Threads running forward passes (see scan_frame).
+    
+    Returns:
+        DataFrame: Per-state counts of rows, checked rows and glitches.
+    """
+    detector = detector or EEGGlitchDetector(**detector_kwargs)
+    scan_columns = ['checked', 'is_glitch'] + [f'{band}_error' for band in detector.bands]
+    counts = []
+    out = open(output_path, 'w', newline='') if output_path else None
+    try:
+        if out is not None:
+            with open(input_path, 'r', newline='') as f:
+                out.write(f.readline().rstrip('\r\n') + ',' + ','.join(scan_columns) + '\n')
+        for lines, scanned in iter_scan(input_path, detector, batch_size, chunk_rows, state_column, workers):
+            if out is not None:
+                cells = scanned[scan_columns].to_csv(index=False, header=False, float_format='%.6g',
+                                                     lineterminator='\n').splitlines()
+                out.writelines(line.rstrip('\r\n') + ',' + row + '\n' for line, row in zip(lines, cells))
+            counts.append(scanned.groupby(state_column, observed=True)[['checked', 'is_glitch']]
+                          .agg(rows=('checked', 'size'), checked=('checked', 'sum'),
+                               glitches=('is_glitch', 'sum')))
+    finally:
+        if out is not None:
+            out.close()
+    if not counts:
+        return pd.DataFrame(columns=['rows', 'checked', 'glitches'])
+    return pd.concat(counts).groupby(level=0).sum()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scan a band-power CSV for sensor glitches")
+    parser.add_argument('input', help="Band-power CSV (State,Delta,Theta,Alpha,Beta,Gamma)")
+    parser.add_argument('--state-column', default='State', help="Name of the state column")
+    parser.add_argument('--output', default=None,
+                        help="Annotated CSV (default: <input>_glitches.csv)")
+    parser.add_argument('--model', default=None, help="Model path (.keras, or .npz with --engine numpy)")
+    parser.add_argument('--scaler', default=None,
+                        help="Scaler .npz path (a legacy .pkl of sklearn scalers also works)")
+    parser.add_argument('--thresholds', default=None, help="Thresholds .json path")
+    parser.add_argument('--bundle', default=None, help="Detector bundle (replaces --model/--scaler/--thresholds)")
+    parser.add_argument('--engine', choices=['keras', 'numpy'], default=None,
+                        help="Inference engine (default: the jit-compiled keras pass; numpy, about 4x "
+                             "slower here, when only --bundle is given)")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="CSV rows read per chunk")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Threads running forward passes (default: one per CPU core)")
+    args = parser.parse_args()
+    
+    output_path = args.output or os.path.splitext(args.input)[0] + '_glitches.csv'
+    engine = args.engine or ('numpy' if args.bundle and not args.model else 'keras')
+    detector = EEGGlitchDetector(model_path=args.model, scaler_path=args.scaler,
+                                 thresholds_path=args.thresholds, engine=engine,
+                                 bundle_path=args.bundle)
+    
+    start = time.perf_counter()
+    summary = scan_csv(args.input, output_path, detector=detector, batch_size=args.batch_size,
+                       chunk_rows=args.chunk_rows, state_column=args.state_column,
+                       workers=args.workers)
+    elapsed = time.perf_counter() - start
+    
+    rows = int(summary['rows'].sum())
+    print(f"\nScanned {rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+    print(f"  Checked: {summary['checked'].sum():,}  Glitches: {summary['glitches'].sum():,}")
+    for state, counts in summary.iterrows():
+        print(f"  {state:<10} {counts['glitches']:>8,} / {counts['checked']:,}")
+    print(f"✓ Results: {output_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""
+Export the 1Hz LSTM to the NumPy inference format
+==================================================
+Pulls the weights out of eeg_1hz_model.keras into a compact .npz (BatchNorm
+folded into the first Dense layer) that EEGGlitchDetector(engine='numpy')
+runs without importing Keras or JAX.
+
+Usage:
+    python export_numpy_model.py [model.keras] [--output model.npz]
+"""
+
+import argparse
+import os
+
+from src.inference.numpy_lstm import export_npz
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(MODEL_DIR, 'eeg_1hz_model.keras')
+
+# Largest prediction difference (normalized units) accepted from the export
+MAX_ABS_DIFF = 1e-5
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a .keras LSTM model to .npz for NumPy inference")
+    parser.add_argument('model', nargs='?', default=MODEL_PATH, help="Path to the .keras model")
+    parser.add_argument('--output', default=None, help="Output .npz (default: next to the model)")
+    args = parser.parse_args()
+
+    npz_path, max_abs_diff = export_npz(args.model, args.output)
+    print(f"✓ Exported: {npz_path} ({os.path.getsize(npz_path) / 1024:.1f} KB)")
+    print(f"  Max |NumPy - Keras| on random windows: {max_abs_diff:.2e}")
+    if max_abs_diff > MAX_ABS_DIFF:
+        raise SystemExit(f"Export mismatch: {max_abs_diff:.2e} > {MAX_ABS_DIFF:.0e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -11,27 +11,131 @@ Usage:
     
     # Pass 60 readings + 1 new reading to validate
     is_valid, details = detector.check_reading(last_60_readings, new_reading)
+    
+    # Hot path: a GlitchResult record, details dict only on .to_dict()
+    result = detector.check_reading(last_60_readings, new_reading, compact=True)
+    
+    # Or feed a stream one reading at a time (None until 60 readings are buffered)
+    is_valid = detector.push(new_reading)
+    
+    # Many headsets at once: one normalization pass and one forward pass
+    results = detector.check_readings_batch(histories, new_readings, states)
+    
+    # Continuous 1Hz stream: one LSTM step per reading instead of 60
+    stream = StreamingGlitchDetector(state='Focused')
+    stream.prime(last_60_readings)
+    is_valid, details = stream.check_next(new_reading)
+    
+    # Detectors share loaded artifacts; switching state only swaps the scaler
+    detector.set_state('Stressed')
+    
+    # Without Keras: export once (python export_numpy_model.py), then
+    detector = EEGGlitchDetector(state='Focused', engine='numpy')
+    
+    # Everything from the single-file bundle written by training
+    detector = EEGGlitchDetector(state='Focused', bundle_path=BUNDLE_PATH)
 """
 
 import os
-# Set Keras backend before importing keras
+# Set Keras backend before keras is (lazily) imported
 os.environ['KERAS_BACKEND'] = 'jax'
 
 import numpy as np
-import pickle
-import json
-from keras.models import load_model
+
+from src.data.windows import window_view
+from src.inference.bundle import load_bundle
+from src.inference.compiled import make_forward_fn, measure_latency
+from src.inference.numpy_lstm import NumpyLSTM
+from src.inference.registry import (registry as default_registry, load_json, load_keras_model,
+                                    load_numpy_model, load_scalers)
 
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
 MODEL_DIR = os.path.dirname(__file__)
 MODEL_PATH = os.path.join(MODEL_DIR, 'eeg_1hz_model.keras')
-SCALER_PATH = os.path.join(MODEL_DIR, 'eeg_1hz_scaler.pkl')
+BUNDLE_PATH = os.path.join(MODEL_DIR, 'eeg_1hz_detector.bundle')
+NUMPY_MODEL_PATH = os.path.join(MODEL_DIR, 'eeg_1hz_model.npz')
+SCALER_PATH = os.path.join(MODEL_DIR, 'eeg_1hz_scaler.npz')
+SCALER_PICKLE_PATH = os.path.join(MODEL_DIR, 'eeg_1hz_scaler.pkl')  # Legacy sklearn pickle
 THRESHOLDS_PATH = os.path.join(MODEL_DIR, 'eeg_1hz_thresholds.json')
 
 EEG_BANDS = ['Delta', 'Theta', 'Alpha', 'Beta', 'Gamma']
-LOOKBACK = 60  # Must match training
+LOOKBACK = 60  # Fallback when the thresholds file does not record the lookback
+
+
+# =============================================================================
+# RESULT RECORD
+# =============================================================================
+class GlitchResult:
+    """
+    Outcome of one glitch check, kept as NumPy arrays.
+    
+    The per-band details dict that check_reading returns by default is only
+    built, and the prediction only denormalized, when to_dict() is called.
+    
+    Attributes:
+        is_valid: True if no band exceeds its threshold
+        actual: The reading, original scale, shape (5,)
+        predicted_norm: Predicted reading, normalized, shape (5,)
+        errors: Absolute normalized errors, shape (5,)
+        glitch_mask: Boolean per-band glitch flags, shape (5,)
+        state: Calibration state (set by check_readings_batch)
+    """
+    
+    __slots__ = ('is_valid', 'actual', 'predicted_norm', 'errors', 'glitch_mask',
+                 'state', '_bands', '_thresholds', '_scaler')
+    
+    def __init__(self, actual, predicted_norm, errors, threshold_vector, bands, thresholds,
+                 scaler, state=None):
+        self.actual = actual
+        self.predicted_norm = predicted_norm
+        self.errors = errors
+        self.glitch_mask = errors > threshold_vector
+        self.is_valid = not self.glitch_mask.any()
+        self.state = state
+        self._bands = bands
+        self._thresholds = thresholds
+        self._scaler = scaler
+    
+    def __bool__(self):
+        return self.is_valid
+    
+    def __repr__(self):
+        return f"GlitchResult(is_valid={self.is_valid}, glitch_bands={self.glitch_bands})"
+    
+    @property
+    def glitch_bands(self):
+        return [b for b, is_glitch in zip(self._bands, self.glitch_mask) if is_glitch]
+    
+    @property
+    def predicted(self):
+        """Predicted reading in the original scale."""
+        return self._scaler.inverse_transform([self.predicted_norm])[0]
+    
+    def to_dict(self):
+        """The details dict returned by check_reading."""
+        errors = self.errors
+        band_analysis = {
+            band: {
+                'error': float(errors[i]),
+                'threshold': float(self._thresholds[band]),
+                'is_glitch': bool(self.glitch_mask[i])
+            }
+            for i, band in enumerate(self._bands)
+        }
+        predicted = self.predicted
+        details = {
+            'is_valid': self.is_valid,
+            'predicted': {b: float(predicted[i]) for i, b in enumerate(self._bands)},
+            'actual': {b: float(self.actual[i]) for i, b in enumerate(self._bands)},
+            'normalized_errors': {b: float(errors[i]) for i, b in enumerate(self._bands)},
+            'band_analysis': band_analysis,
+            'glitch_bands': self.glitch_bands
+        }
+        if self.state is not None:
+            details['state'] = self.state
+        return details
 
 
 # =============================================================================
@@ -62,61 +166,202 @@ class EEGGlitchDetector:
             print("GLITCH DETECTED!")
     """
     
-    def __init__(self, state='Baseline', model_path=None, scaler_path=None, thresholds_path=None):
+    def __init__(self, state='Baseline', model_path=None, scaler_path=None, thresholds_path=None,
+                 fast_inference=True, engine=None, registry=None, bundle_path=None):
         """
         Initialize the glitch detector.
         
         Args:
             state: EEG state for normalization ('Baseline', 'Focused', or 'Stressed')
             model_path: Optional custom path to .keras model file
-            scaler_path: Optional custom path to scaler .pkl file
+                        (or .npz file for engine='numpy')
+            scaler_path: Optional custom path to the scaler .npz file
+                         (a legacy .pkl of sklearn MinMaxScalers also works)
             thresholds_path: Optional custom path to thresholds .json file
+            fast_inference: Use a jit-compiled forward function (built and
+                            warmed up here) instead of model.predict
+            engine: 'keras', or 'numpy' to run the exported .npz weights
+                    with NumPy only (Keras/JAX are never imported).
+                    Defaults to 'numpy' with a bundle, 'keras' otherwise.
+            registry: ArtifactRegistry to load through; defaults to the
+                      process-wide one, so detectors on the same files share
+                      one model, compiled forward pass, scalers and thresholds
+            bundle_path: Single-file detector bundle written by training
+                         (weights, scalers, thresholds, bands, lookback),
+                         loaded with one memory map instead of the three
+                         separate files. With engine='keras' the model
+                         itself still comes from model_path.
         """
-        self.state = state
-        self.lookback = LOOKBACK
+        engine = engine or ('numpy' if bundle_path else 'keras')
+        if engine not in ('keras', 'numpy'):
+            raise ValueError(f"engine must be 'keras' or 'numpy', got {engine!r}")
         
-        # Resolve paths
-        model_path = model_path or MODEL_PATH
-        scaler_path = scaler_path or SCALER_PATH
-        thresholds_path = thresholds_path or THRESHOLDS_PATH
-        
-        # Load model
-        print(f"Loading model: {os.path.basename(model_path)}")
-        self.model = load_model(model_path)
+        self.state = state
+        self.engine = engine
+        self._registry = registry or default_registry
         
-        # Load scalers (dict keyed by state)
-        print(f"Loading scalers: {os.path.basename(scaler_path)}")
-        with open(scaler_path, 'rb') as f:
-            self.scalers = pickle.load(f)
+        # Load thresholds/config and scalers (dict keyed by state)
+        bundle = None
+        if bundle_path:
+            bundle = self._load('bundle', bundle_path, load_bundle, 'bundle')
+            self.config = bundle.config
+            self.scalers = self._registry.get('bundle_scalers', bundle_path, lambda _: bundle.scalers())
+        else:
+            self.config = self._load('thresholds', thresholds_path or THRESHOLDS_PATH, load_json, 'thresholds')
+            if scaler_path is None:
+                scaler_path = SCALER_PATH if os.path.exists(SCALER_PATH) else SCALER_PICKLE_PATH
+            self.scalers = self._load('scalers', scaler_path, load_scalers, 'scalers')
         
         if state not in self.scalers:
             available = list(self.scalers.keys())
             raise ValueError(f"State '{state}' not found. Available: {available}")
         
-        self.scaler = self.scalers[state]
+        self._use_scaler(self.scalers[state])
+        
+        # Lookback the model was trained with (older thresholds files predate the key)
+        self.lookback = int(self.config.get('lookback', LOOKBACK))
+        
+        # Load model
+        self.model = None
+        self.numpy_model = None
+        if bundle is not None and engine == 'numpy':
+            self.model_path = bundle_path
+            self.numpy_model = self._registry.get('bundle_numpy', bundle_path, lambda _: bundle.numpy_model())
+        else:
+            self.model_path = model_path or (NUMPY_MODEL_PATH if engine == 'numpy' else MODEL_PATH)
+            if engine == 'numpy' and self.model_path.endswith('.npz'):
+                self.numpy_model = self._load('numpy', self.model_path, load_numpy_model, 'model')
+            else:
+                self.model = self._load('keras', self.model_path, load_keras_model, 'model')
+                if engine == 'numpy':
+                    self.numpy_model = self._numpy_from_keras()
         
-        # Load thresholds
-        print(f"Loading thresholds: {os.path.basename(thresholds_path)}")
-        with open(thresholds_path, 'r') as f:
-            self.config = json.load(f)
+        if engine == 'numpy':
+            self._forward = self.numpy_model.predict
+        elif fast_inference:
+            # Compile and warm up the direct forward pass once per model file
+            self._forward = self._registry.get(
+                ('forward', self.lookback), self.model_path,
+                lambda _: make_forward_fn(self.model, warmup_shape=(self.lookback, 5))
+            )
+        else:
+            self._forward = self._predict
         
         self.thresholds = self.config['glitch_thresholds']
         self.mae_per_band = self.config['mae_per_band']
         self.bands = self.config['bands']
+        self._threshold_vector = np.array([self.thresholds[b] for b in self.bands])
+        
+        # Stream state for push(): normalized rows are written twice into a
+        # (2 * lookback, 5) buffer so the current window is always the
+        # contiguous view buffer[pos:pos + lookback], oldest row first
+        self._buffer = np.zeros((2 * self.lookback, 5))
+        self._row = np.empty(5)
+        self._errors = np.empty(5)
+        self.reset_stream()
+        
+        # Scratch buffers for check_reading / is_valid_reading
+        self._check_window = np.empty((1, self.lookback, 5))
+        self._check_actual = np.empty(5)
+        self._check_errors = np.empty(5)
         
         print(f"\n✓ Detector ready for state: {state}")
         print(f"  Lookback window: {self.lookback} seconds")
         print(f"  Glitch thresholds: {self.thresholds}")
     
-    def normalize(self, data):
-        """Normalize data using the state's scaler."""
-        return self.scaler.transform(np.array(data))
+    def _load(self, kind, path, loader, label):
+        """Fetch an artifact through the registry, reading the file only on first use."""
+        shared = (kind, path) in self._registry
+        print(f"{'Using shared' if shared else 'Loading'} {label}: {os.path.basename(path)}")
+        return self._registry.get(kind, path, loader)
+    
+    def _numpy_from_keras(self):
+        """NumPy engine converted from the loaded Keras model (cached per model file)."""
+        return self._registry.get('numpy', self.model_path, lambda _: NumpyLSTM.from_keras(self.model))
     
-    def denormalize(self, data):
+    def predict_windows(self, X):
+        """
+        Predict the next normalized reading for a batch of normalized windows.
+        
+        Args:
+            X: Array of shape (N, lookback, 5), already normalized.
+        
+        Returns:
+            numpy.ndarray: Shape (N, 5), normalized predictions.
+        """
+        return np.asarray(self._forward(X))
+    
+    def _predict(self, X):
+        """Reference forward pass through Keras' full predict machinery."""
+        return self.model.predict(X, verbose=0, batch_size=max(len(X), 1))
+    
+    def _use_scaler(self, scaler):
+        """Select the state's AffineScaler and cache its scale/offset for the hot paths."""
+        self.scaler = scaler
+        self._scale = np.asarray(scaler.scale, dtype=float)
+        self._offset = np.asarray(scaler.offset, dtype=float)
+    
+    def set_state(self, state):
+        """
+        Switch the calibration state without touching disk or the model.
+        
+        Only the scaler changes. Buffered push() history is re-normalized
+        in place with the new scaler, so a stream continues across the switch.
+        
+        Args:
+            state: One of the states in the scaler file.
+        """
+        if state not in self.scalers:
+            raise ValueError(f"State '{state}' not found. Available: {list(self.scalers)}")
+        if state == self.state:
+            return
+        
+        # norm_new = (norm_old - offset_old) / scale_old * scale_new + offset_new
+        old_scale, old_offset = self._scale, self._offset
+        self._use_scaler(self.scalers[state])
+        ratio = self._scale / old_scale
+        self._buffer *= ratio
+        self._buffer += self._offset - old_offset * ratio
+        self.state = state
+    
+    def normalize(self, data, out=None):
+        """Normalize data using the state's scaler (optionally into a preallocated out)."""
+        return self.scaler.transform(np.asarray(data, dtype=float), out=out)
+    
+    def denormalize(self, data, out=None):
         """Inverse transform normalized data back to original scale."""
-        return self.scaler.inverse_transform(data)
+        return self.scaler.inverse_transform(np.asarray(data, dtype=float), out=out)
     
-    def check_reading(self, last_60_readings, actual_next_reading):
+    def _score(self, history, actual):
+        """
+        Normalized prediction and per-band errors for one reading.
+        
+        Normalization is the MinMax multiply-add written into preallocated
+        buffers; the returned errors array is one of those buffers and is
+        overwritten by the next call.
+        """
+        if history.shape != (self.lookback, 5):
+            raise ValueError(
+                f"Expected last_60_readings shape ({self.lookback}, 5), got {history.shape}"
+            )
+        if actual.shape != (5,):
+            raise ValueError(
+                f"Expected actual_next_reading shape (5,), got {actual.shape}"
+            )
+        
+        X = self._check_window
+        np.multiply(history, self._scale, out=X[0])
+        X[0] += self._offset
+        actual_norm = self._check_actual
+        np.multiply(actual, self._scale, out=actual_norm)
+        actual_norm += self._offset
+        
+        predicted_norm = self._forward(X)[0]
+        errors = np.subtract(actual_norm, predicted_norm, out=self._check_errors)
+        np.abs(errors, out=errors)
+        return predicted_norm, errors
+    
+    def check_reading(self, last_60_readings, actual_next_reading, compact=False):
         """
         Check if a new EEG reading is valid or a glitch.
         
@@ -126,77 +371,348 @@ class EEGGlitchDetector:
                               Each row is [Delta, Theta, Alpha, Beta, Gamma].
             actual_next_reading: The new reading to validate, shape (5,).
                                  Format: [Delta, Theta, Alpha, Beta, Gamma].
+            compact: Return a GlitchResult instead of building the details dict.
         
         Returns:
             tuple: (is_valid, details)
                 - is_valid (bool): True if reading is valid, False if glitch
                 - details (dict): Prediction info, errors, and per-band analysis
+            or a GlitchResult when compact=True (details via .to_dict()).
+        """
+        actual = np.array(actual_next_reading, dtype=float)
+        predicted_norm, errors = self._score(np.asarray(last_60_readings, dtype=float), actual)
+        result = self._result(actual, predicted_norm, errors.copy(), self.scaler)
+        return result if compact else (result.is_valid, result.to_dict())
+    
+    def _result(self, actual, predicted_norm, errors, scaler, state=None):
+        return GlitchResult(actual, predicted_norm, errors, self._threshold_vector,
+                            self.bands, self.thresholds, scaler, state)
+    
+    def _analyze(self, actual, predicted_norm, errors, scaler):
+        """Compare per-band errors with the thresholds and build the details dict."""
+        result = self._result(actual, predicted_norm, errors, scaler)
+        return result.is_valid, result.to_dict()
+    
+    def check_readings_batch(self, histories, new_readings, states=None, compact=False):
+        """
+        Check N readings from N sessions (e.g. headsets) in one forward pass.
+        
+        Rows are normalized with one scaler call per distinct state and all
+        sessions are predicted together, so cost grows with the batch size
+        rather than with the number of model calls.
+        
+        Args:
+            histories: Array-like of shape (N, 60, 5), one history per session.
+            new_readings: Array-like of shape (N, 5), the reading to validate
+                          for each session.
+            states: Optional calibration state per session (list of N names,
+                    or a single name for all). Defaults to the detector's state.
+            compact: Return GlitchResult objects instead of (is_valid, details).
+        
+        Returns:
+            list: N (is_valid, details) tuples in input order, as returned by
+                  check_reading; each details dict also carries 'state'.
+                  With compact=True, N GlitchResults.
         """
-        # Validate inputs
-        history = np.array(last_60_readings)
-        actual = np.array(actual_next_reading)
+        histories = np.asarray(histories, dtype=float)
+        readings = np.asarray(new_readings, dtype=float)
+        n = len(histories)
         
-        if history.shape != (60, 5):
+        if histories.shape != (n, self.lookback, 5):
             raise ValueError(
-                f"Expected last_60_readings shape (60, 5), got {history.shape}"
+                f"Expected histories shape (N, {self.lookback}, 5), got {histories.shape}"
             )
-        if actual.shape != (5,):
+        if readings.shape != (n, 5):
             raise ValueError(
-                f"Expected actual_next_reading shape (5,), got {actual.shape}"
+                f"Expected new_readings shape ({n}, 5), got {readings.shape}"
             )
         
-        # Normalize inputs
-        history_norm = self.normalize(history)
-        actual_norm = self.normalize([actual])[0]
-        
-        # Reshape for LSTM: (batch=1, timesteps=60, features=5)
-        X = history_norm.reshape(1, 60, 5)
+        if states is None or isinstance(states, str):
+            states = [states or self.state] * n
+        if len(states) != n:
+            raise ValueError(f"Expected {n} states, got {len(states)}")
+        unknown = set(states) - set(self.scalers)
+        if unknown:
+            raise ValueError(f"State(s) {sorted(unknown)} not found. Available: {list(self.scalers)}")
         
-        # Predict
-        predicted_norm = self.model.predict(X, verbose=0)[0]
+        # Normalize each state's histories and readings together in one call
+        X = np.empty((n, self.lookback, 5))
+        actual_norm = np.empty((n, 5))
+        states_arr = np.asarray(states)
+        for state in dict.fromkeys(states):
+            idx = np.flatnonzero(states_arr == state)
+            rows = np.concatenate([histories[idx].reshape(-1, 5), readings[idx]])
+            normalized = self.scalers[state].transform(rows)
+            X[idx] = normalized[:len(idx) * self.lookback].reshape(len(idx), self.lookback, 5)
+            actual_norm[idx] = normalized[len(idx) * self.lookback:]
         
-        # Calculate normalized errors
+        # One forward pass for every session
+        predicted_norm = self._forward(X)
         errors = np.abs(actual_norm - predicted_norm)
         
-        # Analyze each band
-        band_analysis = {}
-        any_glitch = False
-        
-        for i, band in enumerate(self.bands):
-            threshold = self.thresholds[band]
-            is_glitch = errors[i] > threshold
-            
-            if is_glitch:
-                any_glitch = True
-            
-            band_analysis[band] = {
-                'error': float(errors[i]),
-                'threshold': float(threshold),
-                'is_glitch': bool(is_glitch)
-            }
+        results = [
+            self._result(readings[i], predicted_norm[i], errors[i], self.scalers[state], state)
+            for i, state in enumerate(states)
+        ]
+        return results if compact else [(r.is_valid, r.to_dict()) for r in results]
+    
+    # -------------------------------------------------------------------------
+    # Streaming API
+    # -------------------------------------------------------------------------
+    def reset_stream(self):
+        """Forget the buffered history used by push()."""
+        self._pos = 0
+        self._filled = 0
+    
+    @property
+    def window(self):
+        """The buffered normalized history, shape (lookback, 5), oldest first."""
+        return self._buffer[self._pos:self._pos + self.lookback]
+    
+    @property
+    def primed(self):
+        """True once `lookback` readings are buffered and push() can check readings."""
+        return self._filled == self.lookback
+    
+    def _append(self, row):
+        """Store a normalized row as the newest history entry."""
+        self._buffer[self._pos] = row
+        self._buffer[self._pos + self.lookback] = row
+        self._pos = (self._pos + 1) % self.lookback
+        self._filled = min(self._filled + 1, self.lookback)
+    
+    def _predict_next(self):
+        """Normalized prediction for the reading following the buffered window."""
+        return self._forward(self.window[np.newaxis])[0]
+    
+    def prime(self, last_60_readings):
+        """
+        Start (or restart) the stream from a full history window.
         
-        # Denormalize predictions for human-readable output
-        predicted_original = self.denormalize([predicted_norm])[0]
+        Args:
+            last_60_readings: Array-like of shape (60, 5), oldest first.
+        """
+        history = np.asarray(last_60_readings, dtype=float)
+        if history.shape != (self.lookback, 5):
+            raise ValueError(
+                f"Expected last_60_readings shape ({self.lookback}, 5), got {history.shape}"
+            )
+        self.reset_stream()
+        for row in self.normalize(history):
+            self._append(row)
+    
+    def push(self, reading, return_details=False):
+        """
+        Check the next reading of a stream against the buffered history, then buffer it.
         
-        details = {
-            'is_valid': not any_glitch,
-            'predicted': {b: float(predicted_original[i]) for i, b in enumerate(self.bands)},
-            'actual': {b: float(actual[i]) for i, b in enumerate(self.bands)},
-            'normalized_errors': {b: float(errors[i]) for i, b in enumerate(self.bands)},
-            'band_analysis': band_analysis,
-            'glitch_bands': [b for b, info in band_analysis.items() if info['is_glitch']]
-        }
+        Only the incoming reading is normalized; the history is kept normalized
+        in a preallocated ring buffer, so no lists or arrays are rebuilt per
+        call. Every reading enters the history, glitch or not, exactly as a
+        caller sliding last_60_readings would do.
         
-        return not any_glitch, details
+        Args:
+            reading: The new reading, shape (5,).
+            return_details: Also return the details dict of check_reading.
+        
+        Returns:
+            None while the first `lookback` readings are buffered, then
+            is_valid (bool), or (is_valid, details) if return_details is set.
+        """
+        actual = np.asarray(reading, dtype=float)
+        if actual.shape != (5,):
+            raise ValueError(f"Expected reading shape (5,), got {actual.shape}")
+        
+        row = self._row
+        np.multiply(actual, self._scale, out=row)
+        row += self._offset
+        
+        if not self.primed:
+            self._append(row)
+            return None
+        
+        predicted = self._predict_next()
+        errors = np.abs(row - predicted, out=self._errors)
+        is_valid = bool((errors <= self._threshold_vector).all())
+        result = self._analyze(actual, predicted, errors, self.scaler) if return_details else is_valid
+        
+        self._append(row)
+        return result
     
     def is_valid_reading(self, last_60_readings, actual_next_reading):
         """
         Simplified boolean check - returns True for valid, False for glitch.
         
-        This is a convenience method when you don't need detailed analysis.
+        This is a convenience method when you don't need detailed analysis:
+        nothing is denormalized and no result object or dict is built.
         """
-        is_valid, _ = self.check_reading(last_60_readings, actual_next_reading)
-        return is_valid
+        _, errors = self._score(np.asarray(last_60_readings, dtype=float),
+                                np.asarray(actual_next_reading, dtype=float))
+        return bool((errors <= self._threshold_vector).all())
+
+
+class StreamingGlitchDetector(EEGGlitchDetector):
+    """
+    Glitch detector for a continuous stream that advances the LSTM one reading at a time.
+    
+    check_reading re-runs the LSTM over all 60 timesteps for every reading,
+    although 59 of them were processed a second earlier. This detector runs
+    the LSTM once over the first window (prime, or the first 60 push calls)
+    and then carries the hidden and cell state forward, so each check_next /
+    push costs one LSTM step plus the Dense head: about 1/60 of a full window.
+    
+    Carried state is an approximation of the sliding-window prediction. The
+    model was trained on windows that start from zero state, while carried
+    state also remembers readings older than the window. Every `resync_every`
+    readings the state is recomputed exactly over the last 60 normalized
+    readings, which bounds the drift (at an amortized cost of about two steps
+    per reading with the default of 60). Use compare_streaming_accuracy() to
+    measure the prediction difference and the validity agreement with
+    check_reading on a recording.
+    
+    Example:
+        stream = StreamingGlitchDetector(state='Focused')
+        stream.prime(first_60_readings)
+        for reading in readings:
+            is_valid, details = stream.check_next(reading)
+    """
+    
+    def __init__(self, state='Baseline', resync_every=LOOKBACK, **kwargs):
+        """
+        Args:
+            state: EEG state for normalization
+            resync_every: Readings between exact re-syncs over the full window
+                          (1 = exact every reading, 0/None = never)
+            **kwargs: Passed to EEGGlitchDetector
+        """
+        super().__init__(state=state, **kwargs)
+        if self.numpy_model is None:
+            self.numpy_model = self._numpy_from_keras()
+        self.resync_every = resync_every
+    
+    def reset_stream(self):
+        """Forget the stream; prime() or `lookback` push() calls start it again."""
+        super().reset_stream()
+        self._h = self._c = None
+        self._prediction = None
+        self._steps_since_sync = 0
+    
+    def set_state(self, state):
+        """Switch the scaler; carried LSTM state is recomputed from the re-normalized window."""
+        changed = state != self.state
+        super().set_state(state)
+        if changed and self._prediction is not None:
+            self._resync()
+    
+    def _resync(self):
+        """Recompute (h, c) exactly from zero state over the buffered window."""
+        self._h, self._c = self.numpy_model.run(self.window)
+        self._prediction = self.numpy_model.head(self._h)
+        self._steps_since_sync = 0
+    
+    def _append(self, row):
+        """Buffer the row and advance the carried LSTM state by it."""
+        super()._append(row)
+        if not self.primed:
+            return
+        
+        self._steps_since_sync += 1
+        if self._prediction is None or (self.resync_every and self._steps_since_sync >= self.resync_every):
+            self._resync()
+        else:
+            self._h, self._c = self.numpy_model.step(row, self._h, self._c)
+            self._prediction = self.numpy_model.head(self._h)
+    
+    def _predict_next(self):
+        return self._prediction
+    
+    def check_next(self, actual_next_reading):
+        """
+        Check the next reading of the stream, then advance the stream by it.
+        
+        Args:
+            actual_next_reading: The new reading, shape (5,).
+        
+        Returns:
+            tuple: (is_valid, details) as returned by check_reading.
+        """
+        if not self.primed:
+            raise RuntimeError("Call prime() with the first 60 readings before check_next()")
+        return self.push(actual_next_reading, return_details=True)
+
+
+def compare_streaming_accuracy(detector, readings):
+    """
+    Compare a StreamingGlitchDetector with the sliding-window path on a recording.
+    
+    The first `lookback` readings prime the stream; every later reading is
+    checked both with check_next and with an exact full-window prediction.
+    
+    Args:
+        detector: A StreamingGlitchDetector (it is re-primed).
+        readings: Array-like of shape (T, 5), T > lookback, one state only.
+    
+    Returns:
+        dict: readings checked, resync_every, max/mean absolute difference of
+              the normalized predictions (overall and max per band), and the
+              fraction of readings with the same valid/glitch verdict.
+    """
+    readings = np.asarray(readings, dtype=float)
+    lookback = detector.lookback
+    if len(readings) <= lookback:
+        raise ValueError(f"Need more than {lookback} readings, got {len(readings)}")
+    
+    normalized = detector.normalize(readings)
+    actual = normalized[lookback:]
+    exact = detector._forward(window_view(normalized, lookback))
+    
+    streamed = np.empty_like(exact)
+    streamed_valid = np.empty(len(actual), dtype=bool)
+    detector.prime(readings[:lookback])
+    for i, reading in enumerate(readings[lookback:]):
+        streamed[i] = detector._prediction
+        streamed_valid[i] = detector.check_next(reading)[0]
+    
+    thresholds = np.array([detector.thresholds[b] for b in detector.bands])
+    exact_valid = (np.abs(actual - exact) <= thresholds).all(axis=1)
+    diff = np.abs(streamed - exact)
+    
+    return {
+        'readings': len(actual),
+        'resync_every': detector.resync_every,
+        'max_abs_diff': float(diff.max()),
+        'mean_abs_diff': float(diff.mean()),
+        'max_abs_diff_per_band': {b: float(diff[:, i].max()) for i, b in enumerate(detector.bands)},
+        'validity_agreement': float(np.mean(streamed_valid == exact_valid)),
+    }
+
+
+def compare_inference_latency(detector, history, reading, iterations=200):
+    """
+    Measure check_reading latency with the compiled forward pass vs model.predict.
+    
+    Returns:
+        dict: {'model.predict': stats, 'compiled': stats, 'speedup_p50': float}
+              where stats holds mean/p50/p99 milliseconds per check_reading call.
+    """
+    if detector.model is None:
+        raise ValueError("Latency comparison needs a detector built from a .keras model")
+    
+    fast_forward = detector._forward
+    if fast_forward == detector._predict:
+        fast_forward = make_forward_fn(detector.model, warmup_shape=(detector.lookback, 5))
+    
+    results = {}
+    try:
+        for name, forward in (('model.predict', detector._predict), ('compiled', fast_forward)):
+            detector._forward = forward
+            results[name] = measure_latency(
+                lambda: detector.check_reading(history, reading), iterations=iterations
+            )
+    finally:
+        detector._forward = fast_forward
+    
+    results['speedup_p50'] = results['model.predict']['p50_ms'] / results['compiled']['p50_ms']
+    return results
 
 
 # =============================================================================
@@ -204,7 +720,7 @@ class EEGGlitchDetector:
 # =============================================================================
 def demo():
     """Demonstrate the glitch detector with synthetic data."""
-    import pandas as pd
+    from src.data.cache import load_grouped_cached
     
     print("\n" + "=" * 60)
     print("  EEG GLITCH DETECTOR DEMO")
@@ -217,8 +733,7 @@ def demo():
         print(f"Demo data not found at: {data_path}")
         return
     
-    df = pd.read_csv(data_path)
-    baseline_data = df[df['State'] == 'Baseline'][EEG_BANDS].values
+    baseline_data = load_grouped_cached(data_path, EEG_BANDS)['Baseline']
     
     # Initialize detector
     detector = EEGGlitchDetector(state='Baseline')
@@ -263,6 +778,29 @@ def demo():
             print(f"    {band}: error={info['error']:.4f}, "
                   f"threshold={info['threshold']:.4f} → {status}")
     
+    # Test 3: Inference latency
+    print("\n" + "-" * 40)
+    print("TEST 3: check_reading Latency")
+    print("-" * 40)
+    
+    latency = compare_inference_latency(detector, history, normal_reading)
+    for name in ('model.predict', 'compiled'):
+        stats = latency[name]
+        print(f"  {name:<14} p50={stats['p50_ms']:.3f} ms  p99={stats['p99_ms']:.3f} ms")
+    print(f"  Speedup (p50): {latency['speedup_p50']:.1f}x")
+    
+    # Test 4: Streaming (stateful) detector vs the sliding window
+    print("\n" + "-" * 40)
+    print("TEST 4: Streaming Detector Accuracy")
+    print("-" * 40)
+    
+    stream = StreamingGlitchDetector(state='Baseline')
+    comparison = compare_streaming_accuracy(stream, baseline_data[:600])
+    print(f"  Readings checked:       {comparison['readings']}")
+    print(f"  Max |prediction diff|:  {comparison['max_abs_diff']:.5f} (normalized)")
+    print(f"  Mean |prediction diff|: {comparison['mean_abs_diff']:.5f} (normalized)")
+    print(f"  Same verdict:           {comparison['validity_agreement']:.1%}")
+    
     return detector
 
 
@@ -10,15 +10,18 @@ import os
 os.environ['KERAS_BACKEND'] = 'jax'
 
 import numpy as np
-import pickle
-import json
-from keras.models import load_model
+
+from src.inference.bundle import load_bundle
+from src.inference.compiled import make_forward_fn
+from src.inference.registry import registry as default_registry, load_json, load_keras_model, load_scalers
 
 # Configuration
 MODEL_DIR = os.path.dirname(__file__)
 MODEL_PATH = os.path.join(MODEL_DIR, 'eeg_lstm_model.keras')
-SCALER_PATH = os.path.join(MODEL_DIR, 'eeg_scaler.pkl')
+SCALER_PATH = os.path.join(MODEL_DIR, 'eeg_scaler.npz')
+SCALER_PICKLE_PATH = os.path.join(MODEL_DIR, 'eeg_scaler.pkl')  # Legacy sklearn pickle
 THRESHOLDS_PATH = os.path.join(MODEL_DIR, 'eeg_thresholds.json')
+BUNDLE_PATH = os.path.join(MODEL_DIR, 'eeg_detector.bundle')
 
 # EEG Band columns (must match training)
 EEG_BANDS = ['Delta', 'Theta', 'Alpha', 'Beta', 'Gamma']
@@ -40,31 +43,63 @@ class EEGGlitchDetector:
         is_valid, details = detector.check_reading(last_45_readings, new_reading)
     """
     
-    def __init__(self, state='Baseline', model_path=None, scaler_path=None, thresholds_path=None):
+    def __init__(self, state='Baseline', model_path=None, scaler_path=None, thresholds_path=None,
+                 fast_inference=True, registry=None, bundle_path=None):
         """
         Initialize the detector.
         
         Args:
             state: The EEG state (Baseline, Focused, or Stressed)
             model_path: Path to the Keras model file
-            scaler_path: Path to the scaler pickle file
+            scaler_path: Path to the scaler .npz file (or legacy sklearn .pkl)
             thresholds_path: Path to the thresholds JSON file
+            fast_inference: Use a jit-compiled forward function instead of model.predict
+            registry: ArtifactRegistry to load through (default: the process-wide one,
+                      shared by every detector)
+            bundle_path: Single-file detector bundle (weights, scalers, thresholds,
+                         lookback) to load instead of the three files above; the
+                         model then runs on the NumPy engine without Keras
         """
         self.state = state
+        registry = registry or default_registry
         
-        # Use defaults if not specified
-        model_path = model_path or MODEL_PATH
-        scaler_path = scaler_path or SCALER_PATH
-        thresholds_path = thresholds_path or THRESHOLDS_PATH
-        
-        # Load model
-        print(f"Loading model from: {model_path}")
-        self.model = load_model(model_path)
-        
-        # Load scalers (dictionary keyed by state)
-        print(f"Loading scalers from: {scaler_path}")
-        with open(scaler_path, 'rb') as f:
-            self.scalers = pickle.load(f)
+        if bundle_path:
+            print(f"Loading detector bundle from: {bundle_path}")
+            bundle = registry.get('bundle', bundle_path, load_bundle)
+            self.thresholds_data = bundle.config
+            self.scalers = registry.get('bundle_scalers', bundle_path, lambda _: bundle.scalers())
+            self.model = None
+            numpy_model = registry.get('bundle_numpy', bundle_path, lambda _: bundle.numpy_model())
+            self._forward = numpy_model.predict
+            self.lookback = bundle.lookback
+        else:
+            # Use defaults if not specified
+            model_path = model_path or MODEL_PATH
+            if scaler_path is None:
+                scaler_path = SCALER_PATH if os.path.exists(SCALER_PATH) else SCALER_PICKLE_PATH
+            thresholds_path = thresholds_path or THRESHOLDS_PATH
+            
+            # Load thresholds
+            print(f"Loading thresholds from: {thresholds_path}")
+            self.thresholds_data = registry.get('thresholds', thresholds_path, load_json)
+            
+            # Load model
+            print(f"Loading model from: {model_path}")
+            self.model = registry.get('keras', model_path, load_keras_model)
+            
+            # Older thresholds files predate the 'lookback' key: use the model's input length
+            self.lookback = int(self.thresholds_data.get('lookback') or self.model.input_shape[1])
+            
+            # Compile and warm up the direct forward pass once per model file
+            if fast_inference:
+                self._forward = registry.get(('forward', self.lookback), model_path,
+                                             lambda _: make_forward_fn(self.model, warmup_shape=(self.lookback, 5)))
+            else:
+                self._forward = self._predict
+            
+            # Load scalers (dictionary keyed by state)
+            print(f"Loading scalers from: {scaler_path}")
+            self.scalers = registry.get('scalers', scaler_path, load_scalers)
         
         if state not in self.scalers:
             available_states = list(self.scalers.keys())
@@ -72,33 +107,40 @@ class EEGGlitchDetector:
         
         self.scaler = self.scalers[state]
         
-        # Load thresholds
-        print(f"Loading thresholds from: {thresholds_path}")
-        with open(thresholds_path, 'r') as f:
-            self.thresholds_data = json.load(f)
-        
         self.thresholds = self.thresholds_data['glitch_thresholds']
         self.mae_per_band = self.thresholds_data['mae_per_band']
         self.bands = self.thresholds_data['bands']
         
-        print(f"Detector initialized for state: {state}")
+        print(f"Detector initialized for state: {state} (lookback {self.lookback})")
         print(f"Glitch thresholds: {self.thresholds}")
     
+    def _predict(self, X):
+        """Reference forward pass through Keras' full predict machinery."""
+        return self.model.predict(X, verbose=0, batch_size=max(len(X), 1))
+    
+    def set_state(self, state):
+        """Switch to another state's scaler (no disk I/O, no model reload)."""
+        if state not in self.scalers:
+            raise ValueError(f"State '{state}' not found. Available: {list(self.scalers.keys())}")
+        self.state = state
+        self.scaler = self.scalers[state]
+    
     def normalize(self, readings):
         """Normalize readings using the state's scaler."""
-        return self.scaler.transform(np.array(readings))
+        return self.scaler.transform(np.asarray(readings, dtype=float))
     
     def denormalize(self, normalized_readings):
         """Inverse transform normalized readings."""
-        return self.scaler.inverse_transform(normalized_readings)
+        return self.scaler.inverse_transform(np.asarray(normalized_readings, dtype=float))
     
     def check_reading(self, last_45_readings, actual_next_reading):
         """
         Check if the actual next reading is valid or a glitch.
         
         Args:
-            last_45_readings: List of 45 readings, each is [Delta, Theta, Alpha, Beta, Gamma]
-            actual_next_reading: The actual 46th reading to validate [Delta, Theta, Alpha, Beta, Gamma]
+            last_45_readings: List of `lookback` readings (45 for the default model),
+                              each is [Delta, Theta, Alpha, Beta, Gamma]
+            actual_next_reading: The actual next reading to validate [Delta, Theta, Alpha, Beta, Gamma]
         
         Returns:
             tuple: (is_valid: bool, details: dict)
@@ -109,8 +151,8 @@ class EEGGlitchDetector:
         last_45 = np.array(last_45_readings)
         actual = np.array(actual_next_reading)
         
-        if last_45.shape != (45, 5):
-            raise ValueError(f"last_45_readings must be shape (45, 5), got {last_45.shape}")
+        if last_45.shape != (self.lookback, 5):
+            raise ValueError(f"last_45_readings must be shape ({self.lookback}, 5), got {last_45.shape}")
         if actual.shape != (5,):
             raise ValueError(f"actual_next_reading must be shape (5,), got {actual.shape}")
         
@@ -118,11 +160,11 @@ class EEGGlitchDetector:
         normalized_input = self.normalize(last_45)
         normalized_actual = self.normalize([actual])[0]
         
-        # Reshape for LSTM: (1, 45, 5)
-        X = normalized_input.reshape(1, 45, 5)
+        # Reshape for LSTM: (1, lookback, 5)
+        X = normalized_input.reshape(1, self.lookback, 5)
         
         # Predict
-        predicted_normalized = self.model.predict(X, verbose=0)[0]
+        predicted_normalized = self._forward(X)[0]
         
         # Calculate errors (in normalized space)
         errors = np.abs(normalized_actual - predicted_normalized)
@@ -211,6 +253,17 @@ def demo():
         if info['is_glitch']:
             print(f"  {band}: GLITCH! (error={info['error']:.4f} > threshold={info['threshold']:.4f})")
     
+    # Test 3: Latency of the compiled forward pass vs model.predict
+    if detector.model is not None:
+        from glitch_detector import compare_inference_latency
+        
+        print("\n--- Test 3: check_reading latency ---")
+        latency = compare_inference_latency(detector, sample_readings, normal_reading)
+        for name in ('model.predict', 'compiled'):
+            stats = latency[name]
+            print(f"  {name:<14} p50={stats['p50_ms']:.3f} ms  p99={stats['p99_ms']:.3f} ms")
+        print(f"  Speedup (p50): {latency['speedup_p50']:.1f}x")
+    
     return detector
 
 
@@ -0,0 +1,307 @@
+"""
+Hyperparameter Sweep Runner
+===========================
+Expands experiments/*.yaml into trials, trains each trial with the 1Hz
+pipeline in a CPU process pool, and writes the best result back into every
+experiment's `results` block.
+
+Trial expansion (per experiment file):
+    - Any list value under `parameters` is a grid axis; the cartesian
+      product of all axes is run.
+    - An optional top-level `trials:` list of parameter overrides is run
+      instead of the grid, each override merged onto `parameters`.
+
+Parallelism:
+    Trials run in separate 'spawn' processes. Each worker is pinned to its
+    own set of `--threads-per-trial` cores (sched_setaffinity on Linux)
+    before JAX is imported. XLA sizes its CPU thread pool from the cores the
+    process may run on, so the pinning is what caps its threads. Workers
+    also get matching OMP/MKL/OpenBLAS thread caps, and with one thread per
+    trial XLA's multi-threaded Eigen is switched off
+    (--xla_cpu_multi_thread_eigen=false). By default the pool uses every
+    core: workers = cpu_count // threads_per_trial.
+
+Usage:
+    python run_sweep.py experiments/*.yaml --threads-per-trial 2
+"""
+
+import argparse
+import contextlib
+import glob
+import itertools
+import multiprocessing
+import os
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import yaml
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(MODEL_DIR, 'data', 'Synthetic_EEG_Data.csv')
+SWEEP_OUTPUT_DIR = os.path.join(MODEL_DIR, 'experiments', 'models')
+SWEEP_LOG_DIR = os.path.join(MODEL_DIR, 'logs')
+
+EARLY_STOPPING_PATIENCE = 5
+
+
+# =============================================================================
+# EXPERIMENT FILES
+# =============================================================================
+def load_experiment(path):
+    """Read an experiment YAML, keeping its leading comment lines."""
+    with open(path, 'r') as f:
+        text = f.read()
+    header = []
+    for line in text.splitlines():
+        if not line.startswith('#') and line.strip():
+            break
+        header.append(line)
+    return yaml.safe_load(text), '\n'.join(header)
+
+
+def save_experiment(path, experiment, header=''):
+    """Write an experiment YAML back, restoring its leading comments."""
+    body = yaml.safe_dump(experiment, sort_keys=False, default_flow_style=False)
+    with open(path, 'w') as f:
+        if header.strip():
+            f.write(header.rstrip('\n') + '\n\n')
+        f.write(body)
+
+
+def expand_trials(experiment):
+    """
+    Expand an experiment into a list of concrete parameter dicts.
+
+    Returns:
+        list of dicts with scalar values only.
+    """
+    base = dict(experiment.get('parameters') or {})
+
+    if experiment.get('trials'):
+        return [{**base, **overrides} for overrides in experiment['trials']]
+
+    axes = [key for key, value in base.items() if isinstance(value, list)]
+    if not axes:
+        return [base]
+    return [{**base, **dict(zip(axes, values))}
+            for values in itertools.product(*(base[key] for key in axes))]
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+def _init_worker(threads, cpu_sets):
+    """
+    Pin this worker to a free core set and cap library threads.
+
+    Runs before keras/jax are imported, so XLA sees only the pinned cores.
+    """
+    threads = str(threads)
+    for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS',
+                'NUMEXPR_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS'):
+        os.environ[var] = threads
+    os.environ['TF_NUM_INTEROP_THREADS'] = '1'
+    if threads == '1':
+        os.environ['XLA_FLAGS'] = (os.environ.get('XLA_FLAGS', '') +
+                                   ' --xla_cpu_multi_thread_eigen=false').strip()
+
+    if hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, cpu_sets.get_nowait())
+        except (queue.Empty, OSError):
+            pass
+
+
+def run_trial(trial_id, params, data_path, output_dir, log_path):
+    """
+    Train one trial with the 1Hz pipeline. Runs inside a worker process.
+
+    Returns:
+        dict with best_validation_loss, best_epoch, rmse, mae, model_path,
+        wall_s (and the trial's params).
+    """
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    with open(log_path, 'w') as log, contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        import numpy as np
+        import train_1hz_model as trainer
+        from keras.callbacks import EarlyStopping
+        from src.evaluation.thresholds import calibrate_thresholds
+
+        start = time.perf_counter()
+        lookback = int(params.get('sequence_length', trainer.LOOKBACK))
+        batch_size = int(params.get('batch_size', trainer.BATCH_SIZE))
+
+        grouped_data = trainer.load_and_group_data(data_path)
+        normalized_data, _ = trainer.normalize_data(grouped_data)
+        train_ds, val_ds, test_windows, _ = trainer.prepare_window_datasets(
+            normalized_data,
+            lookback=lookback,
+            test_split=1 - float(params.get('train_test_split', 1 - trainer.TEST_SPLIT)),
+            validation_split=trainer.VALIDATION_SPLIT,
+            batch_size=batch_size
+        )
+
+        model = trainer.build_model(
+            input_shape=(lookback, len(trainer.EEG_BANDS)),
+            output_units=len(trainer.EEG_BANDS),
+            learning_rate=params.get('learning_rate'),
+            dropout_rate=float(params.get('dropout_rate', 0.0)),
+            optimizer=params.get('optimizer', 'adam'),
+            loss=params.get('loss_function', 'mse')
+        )
+        history = model.fit(
+            train_ds,
+            epochs=int(params.get('epochs', trainer.EPOCHS)),
+            validation_data=val_ds,
+            callbacks=[EarlyStopping(monitor='val_loss', patience=EARLY_STOPPING_PATIENCE,
+                                     restore_best_weights=True)],
+            verbose=2
+        )
+
+        _, _, _, stats = calibrate_thresholds(
+            lambda X: model.predict(X, verbose=0, batch_size=batch_size),
+            test_windows.iter_chunks(trainer.CALIBRATION_CHUNK),
+            trainer.EEG_BANDS
+        )
+
+        model_path = os.path.join(output_dir, f'{trial_id}.keras')
+        model.save(model_path)
+
+        val_loss = history.history['val_loss']
+        best_epoch = int(np.argmin(val_loss))
+        return {
+            'trial_id': trial_id,
+            'params': params,
+            'best_validation_loss': float(val_loss[best_epoch]),
+            'best_epoch': best_epoch + 1,
+            'rmse': float(np.sqrt(np.mean(stats.sq_sum) / max(stats.count, 1))),
+            'mae': float(np.mean(stats.mae)),
+            'model_path': model_path,
+            'wall_s': time.perf_counter() - start,
+        }
+
+
+# =============================================================================
+# RESULTS
+# =============================================================================
+def write_results(experiment, trial_results):
+    """Fill the experiment's `results` block from its best trial (lowest val loss)."""
+    best = min(trial_results, key=lambda r: r['best_validation_loss'])
+    results = experiment.get('results') or {}
+
+    results['best_validation_loss'] = best['best_validation_loss']
+    results['best_epoch'] = best['best_epoch']
+    metrics = results.get('metrics') or [{'name': 'RMSE'}, {'name': 'MAE'}]
+    for metric in metrics:
+        key = str(metric.get('name', '')).lower()
+        if key in best:
+            metric['value'] = best[key]
+    results['metrics'] = metrics
+    model_path = os.path.abspath(best['model_path'])
+    if model_path.startswith(MODEL_DIR + os.sep):
+        model_path = os.path.relpath(model_path, MODEL_DIR)
+    results['model_path'] = model_path
+    results['best_parameters'] = dict(best['params'])
+    results['trials'] = [
+        {
+            'trial_id': r['trial_id'],
+            'parameters': dict(r['params']),
+            'best_validation_loss': r['best_validation_loss'],
+            'best_epoch': r['best_epoch'],
+            'rmse': r['rmse'],
+            'mae': r['mae'],
+            'wall_s': round(r['wall_s'], 2),
+        }
+        for r in sorted(trial_results, key=lambda r: r['trial_id'])
+    ]
+    experiment['results'] = results
+    return experiment
+
+
+def run_sweep(experiment_paths, data_path=DATA_PATH, threads_per_trial=1, workers=None,
+              output_dir=SWEEP_OUTPUT_DIR, log_dir=SWEEP_LOG_DIR):
+    """
+    Run every trial of every experiment file and update the files in place.
+
+    Returns:
+        {experiment_path: [trial result dicts]}
+    """
+    cpu_count = os.cpu_count() or 1
+    workers = workers or max(1, cpu_count // threads_per_trial)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Build the CSV cache once here so workers only memory-map it
+    from src.data.cache import load_grouped_cached
+    load_grouped_cached(data_path, ['Delta', 'Theta', 'Alpha', 'Beta', 'Gamma'])
+
+    experiments, jobs = {}, []
+    for path in experiment_paths:
+        experiment, header = load_experiment(path)
+        experiments[path] = (experiment, header)
+        name = os.path.splitext(os.path.basename(path))[0]
+        for i, params in enumerate(expand_trials(experiment)):
+            trial_id = f'{name}_trial_{i:03d}'
+            jobs.append((path, trial_id, params, os.path.join(log_dir, f'{trial_id}.log')))
+
+    print(f"Running {len(jobs)} trial(s) from {len(experiment_paths)} experiment(s) "
+          f"on {workers} worker(s) x {threads_per_trial} thread(s)")
+
+    context = multiprocessing.get_context('spawn')
+    cpu_sets = context.Queue()
+    cores = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else list(range(cpu_count))
+    for w in range(workers):
+        core_set = cores[w * threads_per_trial:(w + 1) * threads_per_trial]
+        if core_set:
+            cpu_sets.put(set(core_set))
+
+    results = {path: [] for path in experiment_paths}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker,
+                             initargs=(threads_per_trial, cpu_sets)) as pool:
+        futures = {pool.submit(run_trial, trial_id, params, data_path, output_dir, log_path): (path, trial_id)
+                   for path, trial_id, params, log_path in jobs}
+        for future in as_completed(futures):
+            path, trial_id = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"  ✗ {trial_id}: {e}")
+                continue
+            results[path].append(result)
+            print(f"  ✓ {trial_id}: val_loss={result['best_validation_loss']:.6f} "
+                  f"(epoch {result['best_epoch']}), RMSE={result['rmse']:.6f}, "
+                  f"MAE={result['mae']:.6f}, {result['wall_s']:.1f}s")
+
+    for path, trial_results in results.items():
+        if trial_results:
+            experiment, header = experiments[path]
+            save_experiment(path, write_results(experiment, trial_results), header)
+            print(f"Results written: {path}")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run experiments/*.yaml hyperparameter sweeps")
+    parser.add_argument('experiments', nargs='*',
+                        default=[os.path.join(MODEL_DIR, 'experiments', '*.yaml')],
+                        help="Experiment YAML files or glob patterns")
+    parser.add_argument('--data', default=DATA_PATH, help="Training CSV")
+    parser.add_argument('--threads-per-trial', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Parallel trials (default: cpu_count // threads-per-trial)")
+    parser.add_argument('--output-dir', default=SWEEP_OUTPUT_DIR, help="Where trial models are saved")
+    parser.add_argument('--log-dir', default=SWEEP_LOG_DIR, help="Per-trial training logs")
+    args = parser.parse_args()
+
+    paths = sorted({p for pattern in args.experiments for p in glob.glob(pattern)})
+    if not paths:
+        parser.error(f"No experiment files matched: {args.experiments}")
+
+    run_sweep(paths, data_path=args.data, threads_per_trial=args.threads_per_trial,
+              workers=args.workers, output_dir=args.output_dir, log_dir=args.log_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+#!/bin/bash
+
+# This script runs the hyperparameter sweeps defined in experiments/*.yaml.
+
+# Activate the conda environment if using conda
+# conda activate your_environment_name
+
+# Threads per trial (the pool size defaults to cores / threads per trial)
+THREADS_PER_TRIAL=${THREADS_PER_TRIAL:-1}
+
+# Run the sweep runner; results are written back into each experiment file
+python run_sweep.py experiments/*.yaml --threads-per-trial $THREADS_PER_TRIAL
+
+# Note: Grid axes are list values under `parameters` in the experiment YAML.
@@ -0,0 +1,169 @@
+# Binary cache for band-power CSVs: one float32 .npy file per state next to the source.
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from src.data.loader import load_grouped_by_state
+
+CACHE_VERSION = 1
+CACHE_DTYPE = np.float32
+
+
+def default_cache_dir(file_path):
+    """
+    Returns the cache directory used for a source file (next to it).
+
+    Parameters:
+    file_path (str): Path to the source CSV.
+
+    Returns:
+    str: e.g. 'data/Synthetic_EEG_Data.csv' -> 'data/Synthetic_EEG_Data.csv.cache'
+    """
+    return file_path + '.cache'
+
+
+def file_digest(file_path, chunk_size=1 << 20):
+    """
+    Computes the SHA-256 of a file, reading it in chunks.
+
+    Parameters:
+    file_path (str): Path to the file.
+    chunk_size (int): Bytes read per chunk.
+
+    Returns:
+    str: Hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_manifest(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, 'manifest.json'), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(cache_dir, manifest):
+    path = os.path.join(cache_dir, 'manifest.json')
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _is_fresh(manifest, file_path, bands, state_column, cache_dir):
+    """
+    Checks a manifest against the source file.
+
+    Size and mtime are compared first; if only the mtime changed (e.g. the file
+    was touched or copied) the content hash decides, and the manifest is updated
+    so the next check is cheap again.
+    """
+    if manifest is None:
+        return False
+    if (manifest.get('version') != CACHE_VERSION
+            or manifest.get('bands') != list(bands)
+            or manifest.get('state_column') != state_column):
+        return False
+    if not all(os.path.isfile(os.path.join(cache_dir, entry['file'])) for entry in manifest['states']):
+        return False
+
+    stat = os.stat(file_path)
+    if manifest['source_size'] != stat.st_size:
+        return False
+    if manifest['source_mtime_ns'] == stat.st_mtime_ns:
+        return True
+
+    if manifest['source_sha256'] != file_digest(file_path):
+        return False
+    manifest['source_mtime_ns'] = stat.st_mtime_ns
+    return True
+
+
+def build_cache(file_path, bands, state_column='State', cache_dir=None):
+    """
+    Parses the CSV once and writes one float32 .npy file per state plus a manifest.
+
+    Parameters:
+    file_path (str): Path to the source CSV.
+    bands (list): Band columns, in output column order.
+    state_column (str): Name of the state column.
+    cache_dir (str, optional): Where to write the cache (default: next to the source).
+
+    Returns:
+    dict: The manifest that was written.
+    """
+    cache_dir = cache_dir or default_cache_dir(file_path)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # Stat and hash before parsing so a concurrent edit invalidates the cache
+    stat = os.stat(file_path)
+    digest = file_digest(file_path)
+    grouped = load_grouped_by_state(file_path, bands, state_column)
+
+    states = []
+    for i, (state, data) in enumerate(grouped.items()):
+        file_name = f'state_{i:03d}.npy'
+        tmp_path = os.path.join(cache_dir, file_name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(data, dtype=CACHE_DTYPE))
+        os.replace(tmp_path, os.path.join(cache_dir, file_name))
+        states.append({'state': str(state), 'file': file_name, 'rows': int(len(data))})
+
+    manifest = {
+        'version': CACHE_VERSION,
+        'source': os.path.basename(file_path),
+        'source_size': stat.st_size,
+        'source_mtime_ns': stat.st_mtime_ns,
+        'source_sha256': digest,
+        'state_column': state_column,
+        'bands': list(bands),
+        'dtype': np.dtype(CACHE_DTYPE).name,
+        'states': states
+    }
+    _write_manifest(cache_dir, manifest)
+    return manifest
+
+
+def load_grouped_cached(file_path, bands, state_column='State', cache_dir=None, rebuild=False):
+    """
+    Loads per-state band data through the binary cache, building it if needed.
+
+    After the first call the CSV is not parsed again: each state is a read-only
+    memory-mapped float32 array, so repeated training or calibration runs start
+    in milliseconds and only touch the pages they read.
+
+    Parameters:
+    file_path (str): Path to the source CSV.
+    bands (list): Band columns, in output column order.
+    state_column (str): Name of the state column.
+    cache_dir (str, optional): Cache location (default: next to the source).
+    rebuild (bool): Force re-parsing the CSV.
+
+    Returns:
+    dict: {state: numpy.memmap of shape (rows, len(bands))} in order of first appearance.
+    """
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"The file {file_path} does not exist.")
+
+    cache_dir = cache_dir or default_cache_dir(file_path)
+    manifest = None if rebuild else _read_manifest(cache_dir)
+    cached_mtime = manifest.get('source_mtime_ns') if manifest else None
+
+    if _is_fresh(manifest, file_path, bands, state_column, cache_dir):
+        # Persist the refreshed mtime after a hash match
+        if manifest['source_mtime_ns'] != cached_mtime:
+            _write_manifest(cache_dir, manifest)
+    else:
+        manifest = build_cache(file_path, bands, state_column, cache_dir)
+
+    return {entry['state']: np.load(os.path.join(cache_dir, entry['file']), mmap_mode='r')
+            for entry in manifest['states']}
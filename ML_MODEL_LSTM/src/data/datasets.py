@@ -1,22 +1,76 @@
+import numpy as np
+
+from src.data.windows import SequenceWindows, WindowSampler
+
+
 class TimeSeriesDataset:
+    """
+    Lazy (window, next step) pairs over one time series, split in temporal order.
+
+    Nothing is built up front: the dataset, its train and test splits and
+    contiguous batches are all read-only views over one array. Only shuffled
+    batches and fancy-indexed lookups copy, and only the windows they return.
+
+    Example:
+        dataset = TimeSeriesDataset(series, sequence_length=60)
+        X, y = dataset[0]
+        batches = dataset.iter_batches(256, split='train', shuffle=True, seed=0, repeat=True)
+        model.fit(batches, steps_per_epoch=dataset.num_batches(256, 'train'), epochs=10)
+    """
+
     def __init__(self, data, sequence_length, train_size=0.8):
         """
         Initializes the TimeSeriesDataset with the provided data and parameters.
 
         Parameters:
-        data (array-like): The input time series data.
+        data (array-like): The input time series data, shape (timesteps, features).
         sequence_length (int): The length of the sequences to create.
         train_size (float): The proportion of the dataset to include in the train split.
         """
-        self.data = data
+        self.data = np.asarray(data)
         self.sequence_length = sequence_length
         self.train_size = train_size
         self.train_data, self.test_data = self.split_data()
 
+        # Windows never cross the split: test windows start at the first test row
+        self.windows = SequenceWindows(self.data, sequence_length)
+        train_windows = max(len(self.train_data) - sequence_length, 0)
+        self.train_windows = self.windows.subset(0, train_windows)
+        self.test_windows = self.windows.subset(len(self.train_data))
+
+    def __len__(self):
+        return len(self.windows)
+
+    def __getitem__(self, index):
+        """
+        Window(s) and target(s) by index over the whole series.
+
+        An int or a contiguous slice returns read-only views; an array of
+        indices (or a stepped slice) copies the selected windows.
+
+        Returns:
+        tuple: (X, y)
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                part = self.windows.subset(start, max(start, stop))
+                return part.X, part.y
+            return self.windows.gather(np.arange(start, stop, step))
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError(f"Window index {index} out of range for {len(self)} windows")
+            return self.windows.X[index], self.windows.y[index]
+        return self.windows.gather(index)
+
     def split_data(self):
         """
         Splits the data into training and testing sets based on the specified train size.
 
+        Both sets are views of the input array.
+
         Returns:
         tuple: A tuple containing the training and testing datasets.
         """
@@ -25,21 +79,60 @@ class TimeSeriesDataset:
         test_data = self.data[train_size:]
         return train_data, test_data
 
+    def _split_windows(self, split):
+        if split is None:
+            return self.windows
+        if split == 'train':
+            return self.train_windows
+        if split == 'test':
+            return self.test_windows
+        raise ValueError(f"split must be 'train', 'test' or None, got {split!r}")
+
+    def num_batches(self, batch_size, split=None):
+        """Number of batches per pass over a split (the last one may be short)."""
+        return -(-len(self._split_windows(split)) // batch_size)
+
+    def iter_batches(self, batch_size, split=None, shuffle=False, seed=None, repeat=False):
+        """
+        Yields (X, y) batches that Keras fit can consume directly.
+
+        Contiguous batches are views over the data. Shuffled batches draw a new
+        permutation of window indices each pass and copy one batch at a time.
+
+        Parameters:
+        batch_size (int): Windows per batch.
+        split (str, optional): 'train', 'test', or None for the whole series.
+        shuffle (bool): Visit windows in random order.
+        seed (int, optional): Seed for the shuffling permutation.
+        repeat (bool): Loop forever (pass steps_per_epoch=num_batches(...) to fit).
+
+        Yields:
+        tuple: (X, y) of shapes (batch, sequence_length, features) and (batch, features).
+        """
+        windows = self._split_windows(split)
+        sampler = WindowSampler(len(windows), batch_size, shuffle=shuffle, seed=seed)
+        while True:
+            for batch in range(len(sampler)):
+                if shuffle:
+                    yield windows.gather(sampler.batch_indices(batch))
+                else:
+                    part = windows.subset(batch * batch_size, (batch + 1) * batch_size)
+                    yield part.X, part.y
+            if not repeat:
+                return
+            sampler.on_epoch_end()
+
     def create_sequences(self):
         """
         Creates sequences from the dataset for LSTM input.
 
+        The sequences are read-only strided views over the training data, so no
+        rows are copied; index them to materialize a batch.
+
         Returns:
         tuple: A tuple containing the input sequences and their corresponding targets.
         """
-        sequences = []
-        targets = []
-        for i in range(len(self.train_data) - self.sequence_length):
-            seq = self.train_data[i:i + self.sequence_length]
-            target = self.train_data[i + self.sequence_length]
-            sequences.append(seq)
-            targets.append(target)
-        return np.array(sequences), np.array(targets)
+        return self.train_windows.X, self.train_windows.y
 
     def get_train_data(self):
         """
@@ -57,11 +150,4 @@ class TimeSeriesDataset:
         Returns:
         tuple: A tuple containing the testing sequences and targets.
         """
-        sequences = []
-        targets = []
-        for i in range(len(self.test_data) - self.sequence_length):
-            seq = self.test_data[i:i + self.sequence_length]
-            target = self.test_data[i + self.sequence_length]
-            sequences.append(seq)
-            targets.append(target)
-        return np.array(sequences), np.array(targets)
\ No newline at end of file
+        return self.test_windows.X, self.test_windows.y
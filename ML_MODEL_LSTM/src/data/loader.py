@@ -1,14 +1,20 @@
 # File: /lstm-deep-learning-project/lstm-deep-learning-project/src/data/loader.py
 
-import pandas as pd
+import glob
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
 
-def load_data(file_path):
+def load_data(file_path, dtype=None):
     """
     Load dataset from a specified file path.
     
     Parameters:
     file_path (str): The path to the dataset file (CSV format).
+    dtype (dict, optional): {column: dtype} passed to the CSV parser.
     
     Returns:
     DataFrame: A pandas DataFrame containing the loaded data.
@@ -25,30 +31,178 @@ def load_data(file_path):
     file_extension = os.path.splitext(file_path)[1]
     
     if file_extension == '.csv':
-        data = pd.read_csv(file_path)
+        data = pd.read_csv(file_path, dtype=dtype)
     else:
         raise ValueError("Unsupported file format. Please use a CSV file.")
     
     return data
 
-def load_multiple_files(file_paths):
+def expand_file_paths(file_paths):
     """
-    Load multiple datasets from a list of file paths.
+    Expand glob patterns into file paths.
     
     Parameters:
-    file_paths (list): A list of paths to the dataset files (CSV format).
+    file_paths (str or list): A path or glob pattern, or a list of them.
     
     Returns:
-    DataFrame: A pandas DataFrame containing the concatenated data from all files.
+    list: Matching paths, sorted within each pattern, without duplicates.
+    Entries without glob characters are kept as given, even if missing.
     """
-    data_frames = []
+    if isinstance(file_paths, (str, os.PathLike)):
+        file_paths = [file_paths]
+    
+    expanded = []
+    for entry in file_paths:
+        entry = os.fspath(entry)
+        expanded.extend(sorted(glob.glob(entry)) if glob.has_magic(entry) else [entry])
+    return list(dict.fromkeys(expanded))
+
+def _try_load(file_path, dtype):
+    """(data, None), or (None, message) for a missing or non-CSV file."""
+    try:
+        return load_data(file_path, dtype), None
+    except (FileNotFoundError, ValueError) as e:
+        return None, str(e)
+
+def _dtype_family(dtype):
+    """Dtypes that concatenate without changing meaning (int and float mix to float)."""
+    return 'numeric' if dtype.kind in 'iuf' else str(dtype)
+
+def _check_schema(file_path, data, columns, dtypes):
+    """Raise ValueError if a file's columns or dtypes differ from the reference schema."""
+    if set(data.columns) != set(columns):
+        missing = [c for c in columns if c not in data.columns]
+        extra = [c for c in data.columns if c not in columns]
+        raise ValueError(f"{file_path}: columns differ from the first file "
+                         f"(missing {missing}, unexpected {extra})")
+    
+    mismatched = [f"{c} is {data[c].dtype}, expected {dtypes[c]}" for c in columns
+                  if _dtype_family(data[c].dtype) != _dtype_family(dtypes[c])]
+    if mismatched:
+        raise ValueError(f"{file_path}: dtype mismatch: {'; '.join(mismatched)}")
+
+def load_multiple_files(file_paths, workers=None, executor='thread', dtype=None,
+                        source_column='source_file'):
+    """
+    Load multiple datasets from a list of file paths or glob patterns.
+    
+    Files are parsed in parallel, then checked against the schema of the
+    first file (same columns, compatible dtypes) before anything is
+    concatenated. Missing and non-CSV files are reported and skipped.
+    
+    Parameters:
+    file_paths (str or list): Paths and/or glob patterns, e.g.
+        'Resource files/EEG_Dataset_*.csv'.
+    workers (int, optional): Parallel parsers; defaults to the CPU count.
+    executor (str): 'thread' (the CSV parser releases the GIL) or 'process'.
+    dtype (dict, optional): {column: dtype} passed to the CSV parser, e.g.
+        {'State': 'category'} or float32 bands.
+    source_column (str, optional): Column tagging each row with the path of
+        its file (categorical); None to leave it out.
+    
+    Returns:
+    DataFrame: A pandas DataFrame containing the concatenated data from all
+    files, in file order.
+    
+    Raises:
+    ValueError: If a file's columns or dtypes do not match the first file, or
+    executor is unknown.
+    """
+    if executor not in ('thread', 'process'):
+        raise ValueError(f"executor must be 'thread' or 'process', got {executor!r}")
+    
+    file_paths = expand_file_paths(file_paths)
+    workers = min(workers or os.cpu_count() or 1, max(len(file_paths), 1))
+    
+    if workers == 1:
+        outcomes = [_try_load(file_path, dtype) for file_path in file_paths]
+    else:
+        if executor == 'thread':
+            pool = ThreadPoolExecutor(max_workers=workers)
+        else:
+            # Spawn, not fork: the parent may already hold JAX/TensorFlow threads
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        with pool:
+            outcomes = list(pool.map(_try_load, file_paths, [dtype] * len(file_paths)))
     
-    for file_path in file_paths:
-        try:
-            data = load_data(file_path)
-            data_frames.append(data)
-        except (FileNotFoundError, ValueError) as e:
-            print(e)
+    loaded = []
+    for file_path, (data, error) in zip(file_paths, outcomes):
+        if error is not None:
+            print(error)
+        else:
+            loaded.append((file_path, data))
+    if not loaded:
+        return pd.DataFrame()
+    
+    # Check every file against the first one before concatenating anything
+    columns = list(loaded[0][1].columns)
+    dtypes = loaded[0][1].dtypes
+    for file_path, data in loaded[1:]:
+        _check_schema(file_path, data, columns, dtypes)
     
     # Concatenate all data frames into a single data frame
-    return pd.concat(data_frames, ignore_index=True) if data_frames else pd.DataFrame()
\ No newline at end of file
+    combined = pd.concat([data[columns] for _, data in loaded], ignore_index=True)
+    for column in columns:
+        # Categoricals with different categories per file concatenate to object
+        if isinstance(dtypes[column], pd.CategoricalDtype) and combined[column].dtype == object:
+            combined[column] = combined[column].astype('category')
+    if source_column is not None:
+        codes = np.repeat(np.arange(len(loaded)), [len(data) for _, data in loaded])
+        combined[source_column] = pd.Categorical.from_codes(codes, categories=[path for path, _ in loaded])
+    return combined
+
+def load_grouped_by_state(file_path, bands, state_column='State', dtype=np.float32):
+    """
+    Load a band-power CSV and split its rows by state in a single pass.
+    
+    Only the state and band columns are parsed, the state as a categorical and
+    the bands as `dtype`. Rows are then grouped with one stable sort on the state
+    codes, so every state is a contiguous slice of one array and keeps its
+    original temporal order.
+    
+    Parameters:
+    file_path (str): Path to a CSV with a state column and one column per band.
+    bands (list): Band columns to keep, in output column order.
+    state_column (str): Name of the state column.
+    dtype (numpy.dtype): Dtype of the band values.
+    
+    Returns:
+    dict: {state: numpy.ndarray of shape (rows, len(bands))}, states in order of
+    first appearance and rows in their original order.
+    
+    Raises:
+    FileNotFoundError: If the specified file does not exist.
+    ValueError: If the file is not a CSV or lacks one of the requested columns.
+    """
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"The file {file_path} does not exist.")
+    if os.path.splitext(file_path)[1] != '.csv':
+        raise ValueError("Unsupported file format. Please use a CSV file.")
+    
+    column_types = {band: dtype for band in bands}
+    column_types[state_column] = 'category'
+    data = pd.read_csv(file_path, usecols=[state_column] + list(bands), dtype=column_types)
+    
+    states = data[state_column].cat
+    codes = states.codes.to_numpy()
+    values = data[list(bands)].to_numpy(dtype=dtype)
+    del data
+    
+    # Rows without a state cannot be assigned to a group
+    if (codes < 0).any():
+        values = values[codes >= 0]
+        codes = codes[codes >= 0]
+    
+    # One stable sort groups every state while keeping temporal order inside it
+    order = np.argsort(codes, kind='stable')
+    values = values[order]
+    counts = np.bincount(codes, minlength=len(states.categories))
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    
+    # Report states in order of first appearance, like DataFrame.unique()
+    present, first_rows = np.unique(codes, return_index=True)
+    grouped = {}
+    for code in present[np.argsort(first_rows)]:
+        grouped[states.categories[code]] = values[bounds[code]:bounds[code + 1]]
+    
+    return grouped
@@ -1,3 +1,8 @@
+import numpy as np
+
+from src.data.windows import window_view, target_view
+
+
 def minmax_scaling(data):
     """
     Scales the input data to a range between 0 and 1 using Min-Max scaling.
@@ -17,6 +22,9 @@ def minmax_scaling(data):
 def create_sliding_windows(data, window_size):
     """
     Creates sliding windows from the input data for time series forecasting.
+
+    The windows are a read-only strided view over the input, so no rows are copied.
+    Index or slice the result to materialize only the windows you need.
     
     Parameters:
     data (numpy.ndarray): The input data to create windows from.
@@ -25,8 +33,222 @@ def create_sliding_windows(data, window_size):
     Returns:
     tuple: A tuple containing the input windows and the corresponding target values.
     """
-    X, y = [], []
-    for i in range(len(data) - window_size):
-        X.append(data[i:i + window_size])
-        y.append(data[i + window_size])
-    return np.array(X), np.array(y)
\ No newline at end of file
+    return window_view(data, window_size), target_view(data, window_size)
+
+
+def _handle_zeros_in_scale(scale):
+    """Constant features get a scale of 1, as in sklearn."""
+    scale = np.array(scale)
+    scale[scale < 10 * np.finfo(scale.dtype).eps] = 1.0
+    return scale
+
+
+class StreamingMinMaxScaler:
+    """
+    Min-Max scaler fitted one chunk at a time.
+
+    partial_fit only keeps the running per-feature min and max, so a series
+    can be fitted chunk by chunk without ever being fully in memory. The
+    fitted attributes mirror sklearn's MinMaxScaler (data_min_, data_max_,
+    data_range_, scale_, min_) and give identical results; NaNs are ignored
+    while fitting. Parameters are kept in the float dtype of the first chunk.
+
+    Example:
+        scaler = StreamingMinMaxScaler()
+        for chunk in chunks:
+            scaler.partial_fit(chunk)
+        for chunk in chunks:
+            scaler.transform(chunk, out=chunk)
+    """
+
+    def __init__(self, feature_range=(0, 1)):
+        self.feature_range = feature_range
+        self.data_min_ = None
+        self.data_max_ = None
+        self.n_samples_seen_ = 0
+
+    def partial_fit(self, X):
+        """
+        Updates the running min and max with a chunk of shape (rows, features).
+
+        Returns:
+        StreamingMinMaxScaler: self
+        """
+        X = np.asarray(X)
+        if X.dtype.kind != 'f':
+            X = X.astype(np.float64)
+        if not len(X):
+            return self
+
+        chunk_min = np.nanmin(X, axis=0)
+        chunk_max = np.nanmax(X, axis=0)
+        if self.data_min_ is None:
+            self.data_min_, self.data_max_ = chunk_min, chunk_max
+        else:
+            self.data_min_ = np.fmin(self.data_min_, chunk_min)
+            self.data_max_ = np.fmax(self.data_max_, chunk_max)
+        self.n_samples_seen_ += len(X)
+        return self
+
+    def fit(self, X):
+        """Fits on a whole array (or one chunk), discarding previous state."""
+        self.data_min_ = self.data_max_ = None
+        self.n_samples_seen_ = 0
+        return self.partial_fit(X)
+
+    @property
+    def data_range_(self):
+        return self.data_max_ - self.data_min_
+
+    @property
+    def scale_(self):
+        low, high = self.feature_range
+        return (high - low) / _handle_zeros_in_scale(self.data_range_)
+
+    @property
+    def min_(self):
+        return self.feature_range[0] - self.data_min_ * self.scale_
+
+    def transform(self, X, out=None):
+        """
+        Scales X; pass out=X to normalize a chunk in place.
+
+        Returns:
+        numpy.ndarray: The scaled values (out, if given).
+        """
+        out = np.multiply(X, self.scale_, out=out)
+        out += self.min_
+        return out
+
+    def inverse_transform(self, X, out=None):
+        """Maps scaled values back to the original range (optionally in place)."""
+        out = np.subtract(X, self.min_, out=out)
+        out /= self.scale_
+        return out
+
+    def to_arrays(self):
+        """The fitted state as plain arrays, e.g. for np.savez(path, **scaler.to_arrays())."""
+        return {
+            'data_min': self.data_min_,
+            'data_max': self.data_max_,
+            'n_samples_seen': np.array(self.n_samples_seen_),
+            'feature_range': np.array(self.feature_range, dtype=np.float64),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Restores a scaler from to_arrays() output (a dict or a loaded .npz); partial_fit can resume."""
+        scaler = cls(feature_range=tuple(float(v) for v in arrays['feature_range']))
+        scaler.data_min_ = np.array(arrays['data_min'])
+        scaler.data_max_ = np.array(arrays['data_max'])
+        scaler.n_samples_seen_ = int(arrays['n_samples_seen'])
+        return scaler
+
+
+class StreamingStandardScaler:
+    """
+    Standard (z-score) scaler fitted one chunk at a time.
+
+    Per-feature mean and variance are accumulated in float64 with Welford's
+    update, merging each chunk's statistics with Chan's parallel formula, so
+    the result does not depend on how the series is chunked. Fitted
+    attributes mirror sklearn's StandardScaler (mean_, var_, scale_,
+    n_samples_seen_ per feature); NaNs are ignored while fitting.
+    """
+
+    def __init__(self, with_mean=True, with_std=True):
+        self.with_mean = with_mean
+        self.with_std = with_std
+        self.n_samples_seen_ = None
+        self.mean_ = None
+        self._m2 = None
+
+    def partial_fit(self, X):
+        """
+        Merges the mean and variance of a chunk of shape (rows, features).
+
+        Returns:
+        StreamingStandardScaler: self
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if self.n_samples_seen_ is None:
+            self.n_samples_seen_ = np.zeros(X.shape[1], dtype=np.int64)
+            self.mean_ = np.zeros(X.shape[1])
+            self._m2 = np.zeros(X.shape[1])
+        count = np.count_nonzero(~np.isnan(X), axis=0)
+        if not count.any():
+            return self
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            chunk_mean = np.where(count > 0, np.nansum(X, axis=0) / count, 0.0)
+            chunk_m2 = np.nansum((X - chunk_mean) ** 2, axis=0)
+            total = self.n_samples_seen_ + count
+            weight = np.where(total > 0, count / total, 0.0)
+
+        delta = chunk_mean - self.mean_
+        self.mean_ += delta * weight
+        self._m2 += chunk_m2 + delta ** 2 * self.n_samples_seen_ * weight
+        self.n_samples_seen_ = total
+        return self
+
+    def fit(self, X):
+        """Fits on a whole array (or one chunk), discarding previous state."""
+        self.n_samples_seen_ = self.mean_ = self._m2 = None
+        return self.partial_fit(X)
+
+    @property
+    def var_(self):
+        return np.divide(self._m2, self.n_samples_seen_, out=np.zeros_like(self._m2),
+                         where=self.n_samples_seen_ > 0)
+
+    @property
+    def scale_(self):
+        return _handle_zeros_in_scale(np.sqrt(self.var_)) if self.with_std else None
+
+    def transform(self, X, out=None):
+        """
+        Standardizes X; pass out=X to standardize a chunk in place.
+
+        Returns:
+        numpy.ndarray: The standardized values (out, if given).
+        """
+        if out is None:
+            out = np.array(X, dtype=np.result_type(X, np.float32))
+        elif out is not X:
+            out[...] = X
+        if self.with_mean:
+            out -= self.mean_.astype(out.dtype, copy=False)
+        if self.with_std:
+            out /= self.scale_.astype(out.dtype, copy=False)
+        return out
+
+    def inverse_transform(self, X, out=None):
+        """Maps standardized values back to the original scale (optionally in place)."""
+        if out is None:
+            out = np.array(X, dtype=np.result_type(X, np.float32))
+        elif out is not X:
+            out[...] = X
+        if self.with_std:
+            out *= self.scale_.astype(out.dtype, copy=False)
+        if self.with_mean:
+            out += self.mean_.astype(out.dtype, copy=False)
+        return out
+
+    def to_arrays(self):
+        """The fitted state as plain arrays, e.g. for np.savez(path, **scaler.to_arrays())."""
+        return {
+            'mean': self.mean_,
+            'var': self.var_,
+            'n_samples_seen': self.n_samples_seen_,
+            'with_mean': np.array(self.with_mean),
+            'with_std': np.array(self.with_std),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Restores a scaler from to_arrays() output (a dict or a loaded .npz); partial_fit can resume."""
+        scaler = cls(with_mean=bool(arrays['with_mean']), with_std=bool(arrays['with_std']))
+        scaler.n_samples_seen_ = np.array(arrays['n_samples_seen'], dtype=np.int64)
+        scaler.mean_ = np.array(arrays['mean'], dtype=np.float64)
+        scaler._m2 = np.array(arrays['var'], dtype=np.float64) * scaler.n_samples_seen_
+        return scaler
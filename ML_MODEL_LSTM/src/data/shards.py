@@ -0,0 +1,143 @@
+# Memory-mapped per-state shards for out-of-core training.
+
+import json
+import os
+
+import numpy as np
+
+from src.data.preprocessing import StreamingMinMaxScaler
+
+SHARD_CHUNK_ROWS = 1 << 16
+
+
+def _chunks(num_rows, chunk_rows):
+    for start in range(0, num_rows, chunk_rows):
+        yield start, min(start + chunk_rows, num_rows)
+
+
+def write_normalized_shards(grouped_data, shard_dir, dtype=np.float32, chunk_rows=SHARD_CHUNK_ROWS):
+    """
+    Normalizes every state into its own memory-mapped .npy shard, chunk by chunk.
+
+    The per-state StreamingMinMaxScaler is fitted with partial_fit and then
+    applied in place to one chunk of the shard at a time, so neither the raw nor
+    the normalized data has to fit in memory (the raw arrays can themselves be
+    memory-mapped, e.g. from the CSV cache).
+
+    Parameters:
+    grouped_data (dict): {state: array-like of shape (rows, features)}.
+    shard_dir (str): Directory for the shard files and manifest.
+    dtype (numpy.dtype): Dtype of the normalized shards.
+    chunk_rows (int): Rows processed per chunk.
+
+    Returns:
+    tuple: ({state: read-only numpy.memmap}, {state: fitted StreamingMinMaxScaler})
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+
+    scalers = {}
+    entries = []
+    for i, (state, data) in enumerate(grouped_data.items()):
+        scaler = StreamingMinMaxScaler(feature_range=(0, 1))
+        for start, stop in _chunks(len(data), chunk_rows):
+            scaler.partial_fit(np.asarray(data[start:stop], dtype=dtype))
+
+        file_name = f'shard_{i:03d}.npy'
+        shard = np.lib.format.open_memmap(
+            os.path.join(shard_dir, file_name), mode='w+', dtype=dtype, shape=data.shape
+        )
+        for start, stop in _chunks(len(data), chunk_rows):
+            chunk = shard[start:stop]
+            chunk[...] = data[start:stop]
+            scaler.transform(chunk, out=chunk)
+        shard.flush()
+        del shard
+
+        scalers[state] = scaler
+        entries.append({'state': str(state), 'file': file_name, 'rows': int(len(data))})
+
+    with open(os.path.join(shard_dir, 'manifest.json'), 'w') as f:
+        json.dump({'dtype': np.dtype(dtype).name, 'shards': entries}, f, indent=2)
+
+    return load_shards(shard_dir), scalers
+
+
+def load_shards(shard_dir):
+    """
+    Opens the shards written by write_normalized_shards.
+
+    Parameters:
+    shard_dir (str): Directory holding the shards and manifest.
+
+    Returns:
+    dict: {state: read-only numpy.memmap}
+    """
+    with open(os.path.join(shard_dir, 'manifest.json'), 'r') as f:
+        manifest = json.load(f)
+
+    return {entry['state']: np.load(os.path.join(shard_dir, entry['file']), mmap_mode='r')
+            for entry in manifest['shards']}
+
+
+class BlockShuffleSampler:
+    """
+    Draws training batches as shuffled blocks of consecutive windows across shards.
+
+    Shuffling whole blocks instead of single windows keeps the sampler's memory at
+    one entry per block and turns each batch into a few sequential reads per
+    shard, while every batch still mixes windows from many shards (states).
+    Same interface as WindowSampler, so it plugs into WindowBatchDataset.
+    """
+
+    def __init__(self, windows, batch_size, block_size=256, shuffle=True, seed=None):
+        """
+        Parameters:
+        windows: ConcatWindows the global indices refer to.
+        batch_size (int): Windows per batch.
+        block_size (int): Consecutive windows per block.
+        shuffle (bool): Reshuffle block order after every epoch.
+        seed (int, optional): Seed for the block permutation.
+        """
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(seed)
+        self.num_windows = len(windows)
+
+        # Blocks never straddle two parts, so each one is a contiguous slice of one shard
+        starts, sizes = [], []
+        for offset, part in zip(windows.offsets[:-1], windows.parts):
+            part_starts = np.arange(offset, offset + len(part), block_size)
+            starts.append(part_starts)
+            sizes.append(np.minimum(block_size, offset + len(part) - part_starts))
+        self.block_starts = np.concatenate(starts) if starts else np.empty(0, dtype=np.int64)
+        self.block_sizes = np.concatenate(sizes) if sizes else np.empty(0, dtype=np.int64)
+
+        self.order = np.arange(len(self.block_starts))
+        self.on_epoch_end()
+
+    def __len__(self):
+        return -(-self.num_windows // self.batch_size)
+
+    def batch_indices(self, index):
+        """Returns the window indices of batch `index`, sorted for sequential reads."""
+        start = index * self.batch_size
+        stop = min(start + self.batch_size, self.num_windows)
+
+        # Windows [start, stop) of the virtual concatenation of blocks in shuffled order
+        first = np.searchsorted(self.block_ends, start, side='right')
+        last = np.searchsorted(self.block_ends, stop - 1, side='right')
+        indices = []
+        for position in range(first, last + 1):
+            block = self.order[position]
+            block_begin = self.block_ends[position] - self.block_sizes[block]
+            lo = max(start, block_begin) - block_begin
+            hi = min(stop, self.block_ends[position]) - block_begin
+            indices.append(self.block_starts[block] + np.arange(lo, hi))
+
+        return np.sort(np.concatenate(indices))
+
+    def on_epoch_end(self):
+        """Draws a new block order."""
+        if self.shuffle:
+            self.order = self.rng.permutation(len(self.block_starts))
+        self.block_ends = np.cumsum(self.block_sizes[self.order])
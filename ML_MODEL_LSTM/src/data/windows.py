@@ -0,0 +1,242 @@
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+
+def window_view(data, lookback):
+    """
+    Returns every lookback-long window that has a next-step target as a read-only strided view.
+
+    No data is copied: window i shares memory with rows i .. i + lookback - 1 of the input,
+    so the view costs the same memory whatever the lookback.
+
+    Parameters:
+    data (numpy.ndarray): Time series of shape (timesteps, features) or (timesteps,).
+    lookback (int): Number of timesteps in each window.
+
+    Returns:
+    numpy.ndarray: Read-only view of shape (timesteps - lookback, lookback, features).
+    """
+    data = np.asarray(data)
+    if data.ndim == 0:
+        raise ValueError("Expected a time series, got a scalar")
+    if lookback < 1:
+        raise ValueError(f"lookback must be positive, got {lookback}")
+
+    num_windows = max(len(data) - lookback, 0)
+    row_stride = data.strides[0]
+    return as_strided(
+        data,
+        shape=(num_windows, lookback) + data.shape[1:],
+        strides=(row_stride, row_stride) + data.strides[1:],
+        writeable=False
+    )
+
+
+def target_view(data, lookback):
+    """
+    Returns the next-step target of every window from window_view as a read-only view.
+
+    Parameters:
+    data (numpy.ndarray): Time series of shape (timesteps, features).
+    lookback (int): Number of timesteps in each window.
+
+    Returns:
+    numpy.ndarray: Read-only view of shape (timesteps - lookback, features).
+    """
+    targets = np.asarray(data)[lookback:].view()
+    targets.flags.writeable = False
+    return targets
+
+
+class SequenceWindows:
+    """
+    Lazy (window, next step) pairs over one time series.
+
+    Windows are only materialized when gathered, so a batch costs
+    batch_size * lookback rows of memory instead of the whole sequence set.
+
+    Attributes:
+        data: The underlying (timesteps, features) array.
+        lookback: Number of timesteps in each window.
+        start, stop: Range of window indices covered by this object.
+    """
+
+    def __init__(self, data, lookback, start=0, stop=None):
+        self.data = np.asarray(data)
+        self.lookback = lookback
+
+        total = max(len(self.data) - lookback, 0)
+        stop = total if stop is None else min(stop, total)
+        self.start = min(start, stop)
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    @property
+    def X(self):
+        """Read-only view of the windows, shape (len, lookback, features)."""
+        return window_view(self.data, self.lookback)[self.start:self.stop]
+
+    @property
+    def y(self):
+        """Read-only view of the targets, shape (len, features)."""
+        return target_view(self.data, self.lookback)[self.start:self.stop]
+
+    def subset(self, start, stop=None):
+        """
+        Returns the windows in [start, stop) relative to this object, sharing the same data.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        return SequenceWindows(self.data, self.lookback, self.start + start, self.start + stop)
+
+    def split(self, fraction):
+        """
+        Splits the windows in temporal order: the first `fraction` and the rest.
+
+        Returns:
+        tuple: Two SequenceWindows over the same data.
+        """
+        split_idx = int(len(self) * fraction)
+        return self.subset(0, split_idx), self.subset(split_idx)
+
+    def gather(self, indices):
+        """
+        Copies the windows at the given indices into new arrays.
+
+        Parameters:
+        indices (array-like): Window indices relative to this object.
+
+        Returns:
+        tuple: (X, y) arrays of shape (len(indices), lookback, features) and (len(indices), features).
+        """
+        indices = np.asarray(indices) + self.start
+        return (window_view(self.data, self.lookback)[indices],
+                target_view(self.data, self.lookback)[indices])
+
+
+def concat_windows(parts, order=None):
+    """
+    Gathers several SequenceWindows into one pair of preallocated arrays.
+
+    This is the only copy made: windows are written straight into the output,
+    without an intermediate list, per-part array or separate shuffle copy.
+
+    Parameters:
+    parts (list): SequenceWindows sharing the same lookback and feature count.
+    order (numpy.ndarray, optional): Permutation of range(total); output row k holds
+        the window that would otherwise be at position order[k].
+
+    Returns:
+    tuple: (X, y) arrays.
+    """
+    parts = [part for part in parts if len(part)]
+    if not parts:
+        return np.empty((0, 0, 0)), np.empty((0, 0))
+
+    total = sum(len(part) for part in parts)
+    lookback = parts[0].lookback
+    feature_shape = parts[0].data.shape[1:]
+    dtype = np.result_type(*[part.data.dtype for part in parts])
+
+    X = np.empty((total, lookback) + feature_shape, dtype=dtype)
+    y = np.empty((total,) + feature_shape, dtype=dtype)
+
+    # Position of each source window in the output
+    positions = None if order is None else np.argsort(order)
+
+    offset = 0
+    for part in parts:
+        if positions is None:
+            rows = slice(offset, offset + len(part))
+        else:
+            rows = positions[offset:offset + len(part)]
+        X[rows] = part.X
+        y[rows] = part.y
+        offset += len(part)
+
+    return X, y
+
+
+class ConcatWindows:
+    """
+    Several SequenceWindows addressed by one global window index.
+
+    Global index i maps to a (part, local index) pair; nothing is concatenated,
+    so indexing across parts costs no memory until a batch is gathered.
+    """
+
+    def __init__(self, parts):
+        self.parts = [part for part in parts if len(part)]
+        self.offsets = np.cumsum([0] + [len(part) for part in self.parts])
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    def gather(self, indices):
+        """
+        Copies the windows at the given global indices into new arrays.
+
+        Parameters:
+        indices (array-like): Global window indices in [0, len(self)).
+
+        Returns:
+        tuple: (X, y) arrays in the order of `indices`.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        if indices.size and (indices.min() < 0 or indices.max() >= len(self)):
+            raise IndexError(f"Window index out of range for {len(self)} windows")
+
+        first = self.parts[0]
+        dtype = np.result_type(*[part.data.dtype for part in self.parts])
+        X = np.empty((len(indices), first.lookback) + first.data.shape[1:], dtype=dtype)
+        y = np.empty((len(indices),) + first.data.shape[1:], dtype=dtype)
+
+        part_ids = np.searchsorted(self.offsets, indices, side='right') - 1
+        for part_id in np.unique(part_ids):
+            mask = part_ids == part_id
+            X[mask], y[mask] = self.parts[part_id].gather(indices[mask] - self.offsets[part_id])
+
+        return X, y
+
+    def iter_chunks(self, chunk_size):
+        """
+        Yields (X, y) for consecutive chunks of at most `chunk_size` windows, in index order.
+
+        Only one chunk is materialized at a time.
+        """
+        for start in range(0, len(self), chunk_size):
+            yield self.gather(np.arange(start, min(start + chunk_size, len(self))))
+
+
+class WindowSampler:
+    """
+    Yields batches of window indices, optionally reshuffled every epoch.
+
+    Shuffling permutes window start indices only; the windows themselves are
+    gathered per batch by the caller.
+    """
+
+    def __init__(self, num_windows, batch_size, shuffle=True, seed=None):
+        self.num_windows = num_windows
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(seed)
+        self.order = None
+        self.on_epoch_end()
+
+    def __len__(self):
+        return -(-self.num_windows // self.batch_size)
+
+    def batch_indices(self, index):
+        """Returns the window indices of batch `index`, sorted for sequential reads."""
+        start = index * self.batch_size
+        stop = min(start + self.batch_size, self.num_windows)
+        if self.order is None:
+            return np.arange(start, stop)
+        return np.sort(self.order[start:stop])
+
+    def on_epoch_end(self):
+        """Draws a new permutation of window start indices."""
+        if self.shuffle:
+            self.order = self.rng.permutation(self.num_windows)
@@ -1,8 +1,14 @@
 # File: /lstm-deep-learning-project/lstm-deep-learning-project/src/evaluation/evaluate.py
 
+import json
+import os
+import time
+
 import numpy as np
 from sklearn.metrics import mean_squared_error, mean_absolute_error
 
+from src.evaluation.thresholds import StreamingErrorStats
+
 def evaluate_model(model, X_test, y_test):
     """
     Evaluate the trained LSTM model on the test dataset.
@@ -41,4 +47,196 @@ def print_evaluation_metrics(metrics):
     """
     print("Evaluation Metrics:")
     print(f"RMSE: {metrics['RMSE']:.4f}")
-    print(f"MAE: {metrics['MAE']:.4f}")
\ No newline at end of file
+    print(f"MAE: {metrics['MAE']:.4f}")
+
+
+def _latency_summary(values_ms):
+    if not len(values_ms):
+        return {'mean': None, 'p50': None, 'p99': None, 'max': None}
+    return {
+        'mean': float(np.mean(values_ms)),
+        'p50': float(np.percentile(values_ms, 50)),
+        'p99': float(np.percentile(values_ms, 99)),
+        'max': float(np.max(values_ms)),
+    }
+
+
+def _error_summary(stats, bands):
+    """Overall and per-band RMSE/MAE (plus p99 absolute error) of one StreamingErrorStats."""
+    if stats.count == 0:
+        return {'samples': 0, 'RMSE': None, 'MAE': None, 'per_band': {}}
+    p99 = stats.percentile(99)
+    return {
+        'samples': stats.count,
+        # Over every sample and band, as in evaluate_model
+        'RMSE': float(np.sqrt(stats.sq_sum.sum() / (stats.count * len(bands)))),
+        'MAE': float(stats.abs_sum.sum() / (stats.count * len(bands))),
+        'per_band': {band: {'RMSE': float(stats.rmse[i]), 'MAE': float(stats.mae[i]),
+                            'p99_abs_error': float(p99[i])}
+                     for i, band in enumerate(bands)},
+    }
+
+
+class StreamingEvaluator:
+    """
+    Evaluates a model batch by batch in bounded memory.
+
+    Errors are accumulated per band, overall and per calibration state with
+    StreamingErrorStats, so memory does not grow with the test set. When
+    batches go through evaluate_batch, the model call is timed and the
+    report includes per-batch and per-sample latency and throughput.
+
+    Example:
+        evaluator = StreamingEvaluator(EEG_BANDS)
+        for X, y, states in batches:
+            evaluator.evaluate_batch(model_fn, X, y, states)
+        evaluator.write_report('eval_report.json')
+    """
+
+    def __init__(self, bands, relative_accuracy=0.005):
+        """
+        Parameters:
+        bands (list): Band names, in output column order.
+        relative_accuracy (float): Accuracy of the p99 error sketches.
+        """
+        self.bands = list(bands)
+        self.relative_accuracy = relative_accuracy
+        self.overall = StreamingErrorStats(len(self.bands), relative_accuracy)
+        self.per_state = {}
+        self.batch_seconds = []
+        self.batch_sizes = []
+
+    def update(self, y_true, y_pred, states=None):
+        """
+        Adds one batch of targets and predictions, both of shape (n, bands).
+
+        Parameters:
+        states (str or array-like, optional): The batch's calibration state,
+            or one state label per row.
+        """
+        y_true = np.asarray(y_true, dtype=np.float64).reshape(-1, len(self.bands))
+        y_pred = np.asarray(y_pred, dtype=np.float64).reshape(-1, len(self.bands))
+        self.overall.update(y_true, y_pred)
+        if states is None:
+            return
+
+        if isinstance(states, str) or np.ndim(states) == 0:
+            self._state_stats(str(states)).update(y_true, y_pred)
+            return
+        labels, codes = np.unique(np.asarray(states), return_inverse=True)
+        for code, label in enumerate(labels):
+            rows = codes == code
+            self._state_stats(str(label)).update(y_true[rows], y_pred[rows])
+
+    def _state_stats(self, state):
+        if state not in self.per_state:
+            self.per_state[state] = StreamingErrorStats(len(self.bands), self.relative_accuracy)
+        return self.per_state[state]
+
+    def evaluate_batch(self, predict_fn, X, y_true, states=None):
+        """
+        Times predict_fn(X) and adds the batch.
+
+        Returns:
+        numpy.ndarray: The batch predictions.
+        """
+        start = time.perf_counter()
+        # np.asarray waits for asynchronous backends (JAX) to finish
+        y_pred = np.asarray(predict_fn(X))
+        self.batch_seconds.append(time.perf_counter() - start)
+        self.batch_sizes.append(len(X))
+        self.update(y_true, y_pred, states)
+        return y_pred
+
+    def report(self):
+        """
+        Builds the JSON-serializable evaluation report.
+
+        Returns:
+        dict: samples, batches, overall and per_state error summaries
+        ({'RMSE', 'MAE', 'per_band': {band: {'RMSE', 'MAE', 'p99_abs_error'}}}),
+        latency_ms ({'per_batch', 'per_sample'}: mean/p50/p99/max) and
+        throughput_samples_per_s (over model time only). Latency fields are
+        None if no batch was timed.
+        """
+        batch_ms = np.asarray(self.batch_seconds) * 1000
+        sample_ms = batch_ms / np.maximum(np.asarray(self.batch_sizes), 1)
+        total_seconds = float(np.sum(self.batch_seconds))
+        return {
+            'bands': self.bands,
+            'samples': self.overall.count,
+            'batches': len(self.batch_sizes),
+            'overall': _error_summary(self.overall, self.bands),
+            'per_state': {state: _error_summary(stats, self.bands) for state, stats in self.per_state.items()},
+            'latency_ms': {
+                'per_batch': _latency_summary(batch_ms),
+                'per_sample': _latency_summary(sample_ms),
+            },
+            'throughput_samples_per_s': float(sum(self.batch_sizes) / total_seconds) if total_seconds > 0 else None,
+        }
+
+    def write_report(self, path, report=None):
+        """Writes the report as JSON (atomically: temp file + rename). Returns the report."""
+        report = report or self.report()
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp_path, path)
+        return report
+
+
+def evaluate_streaming(predict_fn, batches, bands, report_path=None):
+    """
+    Evaluates a model over streamed batches.
+
+    Parameters:
+    predict_fn (callable): Maps an X batch to predictions of shape (n, len(bands)).
+    batches (iterable): (X, y) or (X, y, states) batches; only one is held
+        in memory at a time.
+    bands (list): Band names, in output column order.
+    report_path (str, optional): Where to write the JSON report.
+
+    Returns:
+    dict: The report (see StreamingEvaluator.report).
+    """
+    evaluator = StreamingEvaluator(bands)
+    for batch in batches:
+        evaluator.evaluate_batch(predict_fn, *batch)
+    report = evaluator.report()
+    if report_path:
+        evaluator.write_report(report_path, report)
+    return report
+
+
+def _report_value(report, key):
+    value = report
+    for part in key.split('.'):
+        value = value[part]
+    return value
+
+
+def check_report(report, limits):
+    """
+    Compares report values against upper limits, e.g. for a deployment gate.
+
+    Parameters:
+    report (dict): Output of StreamingEvaluator.report().
+    limits (dict): {dotted key: maximum}, e.g. {'overall.RMSE': 0.05,
+        'per_state.Focused.per_band.Gamma.MAE': 0.03,
+        'latency_ms.per_sample.p99': 0.5}.
+
+    Returns:
+    list: One message per exceeded or missing limit; empty if the report passes.
+    """
+    failures = []
+    for key, maximum in limits.items():
+        try:
+            value = _report_value(report, key)
+        except (KeyError, TypeError):
+            failures.append(f"{key}: missing from report")
+            continue
+        if value is None:
+            failures.append(f"{key}: not measured")
+        elif value > maximum:
+            failures.append(f"{key}: {value} exceeds {maximum}")
+    return failures
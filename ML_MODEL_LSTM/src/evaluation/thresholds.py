@@ -0,0 +1,157 @@
+# Bounded-memory glitch threshold calibration.
+
+import numpy as np
+
+# Percentile thresholds written next to the MAE x multiplier thresholds
+DEFAULT_PERCENTILES = (99.0, 99.9)
+
+
+class LogQuantileSketch:
+    """
+    Fixed-size quantile sketch over non-negative values (one per series/band).
+
+    Values are counted in logarithmically spaced bins, so any quantile is
+    returned within `relative_accuracy` of the true value while memory stays at
+    a few thousand counters per series, however many values are added.
+    Values below `min_value` are counted as zero; values above `max_value`
+    land in the last bin and are reported as the exact running maximum.
+    """
+
+    def __init__(self, num_series=1, relative_accuracy=0.005, min_value=1e-6, max_value=1e2):
+        self.num_series = num_series
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = np.log(self.gamma)
+        self.offset = int(np.floor(np.log(min_value) / self.log_gamma))
+        num_bins = int(np.ceil(np.log(max_value) / self.log_gamma)) - self.offset + 1
+
+        # Bin 0 holds zeros (values below min_value)
+        self.counts = np.zeros((num_series, num_bins + 1), dtype=np.int64)
+        self.max = np.zeros(num_series)
+
+    @property
+    def count(self):
+        return int(self.counts[0].sum())
+
+    def update(self, values):
+        """
+        Adds a chunk of values.
+
+        Parameters:
+        values (numpy.ndarray): Shape (n, num_series), non-negative.
+        """
+        values = np.asarray(values, dtype=np.float64).reshape(-1, self.num_series)
+        if not len(values):
+            return
+
+        # Zeros (and anything below min_value) never reach the log
+        zero = values < self.min_value
+        logs = np.log(np.where(zero, self.min_value, values))
+        bins = np.ceil(logs / self.log_gamma).astype(np.int64) - self.offset
+        bins = np.where(zero, 0, np.clip(bins, 1, self.counts.shape[1] - 1))
+
+        for series in range(self.num_series):
+            self.counts[series] += np.bincount(bins[:, series], minlength=self.counts.shape[1])
+        self.max = np.maximum(self.max, values.max(axis=0))
+
+    def quantile(self, q):
+        """
+        Estimates the q-quantile (0 <= q <= 1) of every series.
+
+        Returns:
+        numpy.ndarray: Shape (num_series,).
+        """
+        result = np.zeros(self.num_series)
+        for series in range(self.num_series):
+            cumulative = np.cumsum(self.counts[series])
+            if cumulative[-1] == 0:
+                result[series] = np.nan
+                continue
+            rank = q * (cumulative[-1] - 1)
+            bin_index = int(np.searchsorted(cumulative, rank, side='right'))
+            if bin_index == 0:
+                continue
+            # Midpoint (in relative terms) of the bin's value range
+            value = 2 * self.gamma ** (bin_index + self.offset) / (self.gamma + 1)
+            result[series] = min(value, self.max[series])
+        return result
+
+
+class StreamingErrorStats:
+    """
+    Running per-band absolute error statistics for threshold calibration.
+
+    Holds sums, a running maximum and a LogQuantileSketch, so memory does not
+    depend on how many predictions are fed in.
+    """
+
+    def __init__(self, num_bands, relative_accuracy=0.005):
+        self.count = 0
+        self.abs_sum = np.zeros(num_bands)
+        self.sq_sum = np.zeros(num_bands)
+        self.sketch = LogQuantileSketch(num_bands, relative_accuracy=relative_accuracy)
+
+    def update(self, y_true, y_pred):
+        """Adds one chunk of targets and predictions, both of shape (n, num_bands)."""
+        errors = np.abs(np.asarray(y_true, dtype=np.float64) - np.asarray(y_pred, dtype=np.float64))
+        self.count += len(errors)
+        self.abs_sum += errors.sum(axis=0)
+        self.sq_sum += np.square(errors).sum(axis=0)
+        self.sketch.update(errors)
+
+    @property
+    def mae(self):
+        return self.abs_sum / max(self.count, 1)
+
+    @property
+    def rmse(self):
+        return np.sqrt(self.sq_sum / max(self.count, 1))
+
+    @property
+    def max(self):
+        return self.sketch.max
+
+    def percentile(self, p):
+        """Per-band p-th percentile (0-100) of the absolute error."""
+        return self.sketch.quantile(p / 100.0)
+
+
+def percentile_key(p):
+    """Formats a percentile as a JSON key: 99.0 -> 'p99', 99.9 -> 'p99.9'."""
+    return f"p{p:g}"
+
+
+def calibrate_thresholds(predict_fn, chunks, bands, multiplier=4, percentiles=DEFAULT_PERCENTILES):
+    """
+    Derives glitch thresholds from streamed (X, y) chunks.
+
+    Parameters:
+    predict_fn (callable): Maps an X chunk to predictions of shape (n, len(bands)).
+    chunks (iterable): (X, y) chunks; only one is held in memory at a time.
+    bands (list): Band names, in column order.
+    multiplier (float): MAE multiplier for the classic thresholds.
+    percentiles (tuple): Error percentiles to emit as alternative thresholds.
+
+    Returns:
+    tuple: (mae_per_band, thresholds, percentile_thresholds, stats) where the first
+    two are {band: float}, percentile_thresholds is {'p99': {band: float}, ...}
+    and stats is the StreamingErrorStats.
+    
+    Raises:
+    ValueError: If the chunks hold no windows (the thresholds would be NaN).
+    """
+    stats = StreamingErrorStats(len(bands))
+    for X, y in chunks:
+        stats.update(y, predict_fn(X))
+    if stats.count == 0:
+        raise ValueError("No test windows to calibrate thresholds on")
+
+    mae_per_band = {band: float(stats.mae[i]) for i, band in enumerate(bands)}
+    thresholds = {band: float(stats.mae[i] * multiplier) for i, band in enumerate(bands)}
+    percentile_thresholds = {}
+    for p in percentiles:
+        values = stats.percentile(p)
+        percentile_thresholds[percentile_key(p)] = {band: float(values[i]) for i, band in enumerate(bands)}
+
+    return mae_per_band, thresholds, percentile_thresholds, stats
@@ -0,0 +1,190 @@
+# Single-file detector bundle: model weights, scalers, thresholds, bands and lookback.
+#
+# Layout (all integers little-endian):
+#   8 bytes   magic b'EEGBNDL\0'
+#   4 bytes   uint32 format version
+#   4 bytes   uint32 header length in bytes
+#   header    UTF-8 JSON: detector config plus an 'arrays' table of
+#             {name: {'offset', 'shape', 'dtype'}}, offsets relative to the
+#             data section
+#   data      raw array bytes, each array starting on a 64-byte boundary
+#             (the data section itself starts on one too). Weights are
+#             float32; scaler parameters are float64, exactly as the .npz
+#             scaler file holds them
+#
+# load_bundle maps the whole file with a single np.memmap and returns the
+# arrays as zero-copy views of it.
+
+import json
+import os
+import struct
+
+import numpy as np
+
+from src.inference.scaling import AffineScaler
+
+BUNDLE_MAGIC = b'EEGBNDL\0'
+BUNDLE_VERSION = 1
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct('<8sII')
+
+
+def _align(n):
+    return -(-n // ALIGNMENT) * ALIGNMENT
+
+
+def write_bundle(path, numpy_model, scalers, config):
+    """
+    Writes a detector bundle (atomically: temp file + rename).
+
+    Parameters:
+    path (str): Output file.
+    numpy_model (NumpyLSTM): Model weights (e.g. NumpyLSTM.from_keras(model)).
+    scalers (dict): {state: fitted MinMaxScaler or AffineScaler}; the data
+        minimum, scale, offset and feature range are stored at full precision.
+    config (dict): Detector config as written to the thresholds JSON; must
+        contain 'lookback', 'bands' and 'glitch_thresholds'.
+
+    Returns:
+    str: path
+    """
+    missing = [key for key in ('lookback', 'bands', 'glitch_thresholds') if key not in config]
+    if missing:
+        raise ValueError(f"Bundle config is missing: {missing}")
+
+    arrays = {
+        'lstm/kernel': numpy_model.kernel,
+        'lstm/recurrent_kernel': numpy_model.recurrent_kernel,
+        'lstm/bias': numpy_model.bias,
+    }
+    head = []
+    for i, layer in enumerate(numpy_model.head_layers):
+        arrays[f'head/{i}/a'] = layer[1]
+        arrays[f'head/{i}/b'] = layer[2]
+        head.append({'kind': layer[0], 'activation': layer[3] if layer[0] == 'dense' else None})
+
+    scaler_meta = {}
+    for state, scaler in scalers.items():
+        if not isinstance(scaler, AffineScaler):
+            scaler = AffineScaler.from_minmax(scaler)
+        # float64, so bundle and .npz scalers normalize identically
+        for param in ('data_min', 'scale', 'offset'):
+            arrays[f'scalers/{state}/{param}'] = np.ascontiguousarray(getattr(scaler, param), dtype='<f8')
+        scaler_meta[state] = {'feature_range': list(scaler.feature_range)}
+
+    table, offset = {}, 0
+    for name, array in arrays.items():
+        if not name.startswith('scalers/'):
+            array = np.ascontiguousarray(array, dtype='<f4')
+        arrays[name] = array
+        table[name] = {'offset': offset, 'shape': list(array.shape), 'dtype': array.dtype.str}
+        offset = _align(offset + array.nbytes)
+
+    header = dict(config)
+    header.update({
+        'format_version': BUNDLE_VERSION,
+        'head': head,
+        'scalers': scaler_meta,
+        'arrays': table,
+    })
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_start = _align(_PREAMBLE.size + len(header_bytes))
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + table[name]['offset'])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+    return path
+
+
+class DetectorBundle:
+    """
+    A loaded bundle. `config` holds the thresholds-JSON keys (lookback,
+    bands, glitch_thresholds, mae_per_band, ...), `arrays` the memory-mapped
+    weights and scaler parameters.
+    """
+
+    def __init__(self, path, header, arrays):
+        self.path = path
+        self.arrays = arrays
+        self.head = header.pop('head')
+        self.scaler_meta = header.pop('scalers')
+        header.pop('arrays')
+        self.format_version = header.pop('format_version')
+        self.config = header
+
+    @property
+    def lookback(self):
+        return int(self.config['lookback'])
+
+    @property
+    def bands(self):
+        return self.config['bands']
+
+    @property
+    def states(self):
+        return list(self.scaler_meta)
+
+    def numpy_model(self, dtype=np.float64):
+        """The NumPy inference engine for the bundled weights."""
+        from src.inference.numpy_lstm import NumpyLSTM
+
+        head_layers = []
+        for i, layer in enumerate(self.head):
+            arrays = (self.arrays[f'head/{i}/a'], self.arrays[f'head/{i}/b'])
+            head_layers.append((layer['kind'],) + arrays +
+                               ((layer['activation'],) if layer['kind'] == 'dense' else ()))
+        return NumpyLSTM(self.arrays['lstm/kernel'], self.arrays['lstm/recurrent_kernel'],
+                         self.arrays['lstm/bias'], head_layers, dtype=dtype)
+
+    def scalers(self):
+        """{state: AffineScaler} built from the stored parameters."""
+        scalers = {}
+        for state in self.states:
+            scaler = AffineScaler(*self.scaler_params(state))
+            # Older bundles hold no offset and recompute it
+            offset = self.arrays.get(f'scalers/{state}/offset')
+            if offset is not None:
+                scaler.offset = offset
+            scalers[state] = scaler
+        return scalers
+
+    def scaler_params(self, state):
+        """(data_min, scale, feature_range) arrays of one state's MinMax scaler."""
+        return (self.arrays[f'scalers/{state}/data_min'],
+                self.arrays[f'scalers/{state}/scale'],
+                tuple(self.scaler_meta[state]['feature_range']))
+
+
+def load_bundle(path):
+    """
+    Loads a bundle with one read-only memory map of the file.
+
+    Raises:
+    ValueError: If the file is not a bundle or has an unsupported version.
+    """
+    raw = np.memmap(path, dtype=np.uint8, mode='r')
+    if len(raw) < _PREAMBLE.size:
+        raise ValueError(f"{path} is not a detector bundle")
+    magic, version, header_len = _PREAMBLE.unpack(raw[:_PREAMBLE.size].tobytes())
+    if magic != BUNDLE_MAGIC:
+        raise ValueError(f"{path} is not a detector bundle")
+    if version != BUNDLE_VERSION:
+        raise ValueError(f"Unsupported bundle version {version} in {path} (expected {BUNDLE_VERSION})")
+
+    header = json.loads(raw[_PREAMBLE.size:_PREAMBLE.size + header_len].tobytes().decode('utf-8'))
+    data_start = _align(_PREAMBLE.size + header_len)
+
+    arrays = {}
+    for name, entry in header['arrays'].items():
+        dtype = np.dtype(entry['dtype'])
+        start = data_start + entry['offset']
+        count = int(np.prod(entry['shape']))
+        arrays[name] = raw[start:start + count * dtype.itemsize].view(dtype).reshape(entry['shape'])
+
+    return DetectorBundle(path, header, arrays)
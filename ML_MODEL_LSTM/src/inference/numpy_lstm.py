@@ -0,0 +1,246 @@
+# NumPy re-implementation of the LSTM -> BatchNorm -> Dense forward pass.
+
+import os
+
+import numpy as np
+
+# Bump when the .npz layout written by NumpyLSTM.save_npz changes
+NPZ_FORMAT_VERSION = 1
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+_ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'tanh': np.tanh,
+    'sigmoid': _sigmoid,
+}
+
+
+def _prepare_gates(kernel, recurrent_kernel, bias):
+    """
+    Rearranges Keras LSTM weights for a cheaper step.
+
+    Keras orders the gate columns i, f, c, o. They are reordered to i, f, o, c
+    and the three sigmoid gates are scaled by 0.5, using
+    sigmoid(x) = 0.5 * tanh(x / 2) + 0.5: a single tanh over all pre-activations
+    then serves every gate.
+    """
+    units = recurrent_kernel.shape[0]
+    order = np.r_[0:2 * units, 3 * units:4 * units, 2 * units:3 * units]
+    scale = np.r_[np.full(3 * units, 0.5), np.ones(units)]
+    return tuple(np.ascontiguousarray(w[..., order] * scale) for w in (kernel, recurrent_kernel, bias))
+
+
+def _gate_update(z, c):
+    """Applies the gates to the cell state; z is overwritten (layout from _prepare_gates)."""
+    units = c.shape[-1]
+    np.tanh(z, out=z)
+    gates = z[..., :3 * units]
+    gates *= 0.5
+    gates += 0.5
+    c = z[..., units:2 * units] * c
+    c += z[..., :units] * z[..., 3 * units:]
+    return z[..., 2 * units:3 * units] * np.tanh(c), c
+
+
+def fold_batch_norm(head_layers):
+    """
+    Folds every BatchNorm into the Dense layer that follows it.
+
+    At inference BatchNorm is h * scale + shift, so
+    (h * scale + shift) @ W + b == h @ (scale[:, None] * W) + (shift @ W + b).
+    Consecutive BatchNorms are merged first; one with no Dense after it is kept.
+
+    Returns:
+    list: head layers in the same tuple format, usually Dense only.
+    """
+    folded = []
+    pending = None
+    for layer in head_layers:
+        if layer[0] == 'batch_norm':
+            if pending is not None:
+                _, scale, shift = pending
+                layer = ('batch_norm', scale * layer[1], shift * layer[1] + layer[2])
+            pending = layer
+        elif pending is not None:
+            _, scale, shift = pending
+            _, kernel, bias, activation = layer
+            folded.append(('dense', scale[:, None] * kernel, shift @ kernel + bias, activation))
+            pending = None
+        else:
+            folded.append(layer)
+    if pending is not None:
+        folded.append(pending)
+    return folded
+
+
+class NumpyLSTM:
+    """
+    Forward pass of a trained LSTM(return_sequences=False) model in NumPy.
+
+    Supports the layer stack the training scripts build: one LSTM followed by
+    BatchNormalization, Dropout (a no-op at inference) and Dense layers.
+    Besides whole-window prediction it exposes the recurrent state, so a
+    caller can advance the LSTM one reading at a time with step().
+
+    Attributes:
+        units: LSTM hidden size.
+        head_layers: ('batch_norm', scale, shift) and ('dense', kernel, bias,
+                     activation) tuples applied to the last hidden state.
+    """
+
+    def __init__(self, kernel, recurrent_kernel, bias, head_layers, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        self.kernel = np.asarray(kernel, dtype=self.dtype)
+        self.recurrent_kernel = np.asarray(recurrent_kernel, dtype=self.dtype)
+        self.bias = np.asarray(bias, dtype=self.dtype)
+        self.units = self.recurrent_kernel.shape[0]
+        self._kernel, self._recurrent_kernel, self._bias = _prepare_gates(
+            self.kernel, self.recurrent_kernel, self.bias
+        )
+        self.head_layers = [
+            (layer[0],) + tuple(np.asarray(a, dtype=self.dtype) for a in layer[1:3]) + tuple(layer[3:])
+            for layer in head_layers
+        ]
+
+    @classmethod
+    def from_keras(cls, model, dtype=np.float64, fold=True):
+        """
+        Copies the weights out of a built Keras model.
+
+        With fold=True, BatchNorm is folded into the following Dense layer.
+
+        Raises:
+        ValueError: If the model contains a layer this engine cannot run.
+        """
+        lstm = None
+        head_layers = []
+        for layer in model.layers:
+            kind = type(layer).__name__
+            if kind == 'LSTM' and lstm is None:
+                if layer.return_sequences or layer.activation.__name__ != 'tanh' \
+                        or layer.recurrent_activation.__name__ != 'sigmoid':
+                    raise ValueError("Only tanh/sigmoid LSTMs with return_sequences=False are supported")
+                lstm = [np.asarray(w) for w in layer.get_weights()]
+            elif kind == 'BatchNormalization':
+                gamma, beta, mean, var = (np.asarray(w) for w in layer.get_weights())
+                scale = gamma / np.sqrt(var + layer.epsilon)
+                head_layers.append(('batch_norm', scale, beta - mean * scale))
+            elif kind == 'Dense':
+                activation = layer.activation.__name__
+                if activation not in _ACTIVATIONS:
+                    raise ValueError(f"Unsupported Dense activation: {activation}")
+                kernel, bias = (np.asarray(w) for w in layer.get_weights())
+                head_layers.append(('dense', kernel, bias, activation))
+            elif kind in ('Dropout', 'InputLayer'):
+                continue
+            else:
+                raise ValueError(f"Unsupported layer for NumPy inference: {kind}")
+
+        if lstm is None:
+            raise ValueError("Model has no LSTM layer")
+        if fold:
+            head_layers = fold_batch_norm(head_layers)
+        return cls(*lstm, head_layers, dtype=dtype)
+
+    @classmethod
+    def from_npz(cls, path, dtype=np.float64):
+        """Loads weights written by save_npz (no Keras import)."""
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data['format_version'])
+            if version != NPZ_FORMAT_VERSION:
+                raise ValueError(f"Unsupported .npz format version {version} in {path}")
+            head_layers = []
+            for i, (kind, activation) in enumerate(zip(data['head_kinds'], data['head_activations'])):
+                arrays = (data[f'head_{i}_a'], data[f'head_{i}_b'])
+                head_layers.append((str(kind),) + arrays + ((str(activation),) if kind == 'dense' else ()))
+            return cls(data['kernel'], data['recurrent_kernel'], data['bias'], head_layers, dtype=dtype)
+
+    def save_npz(self, path):
+        """Writes the weights as an uncompressed .npz (float32)."""
+        arrays = {
+            'format_version': np.array(NPZ_FORMAT_VERSION),
+            'kernel': self.kernel.astype(np.float32),
+            'recurrent_kernel': self.recurrent_kernel.astype(np.float32),
+            'bias': self.bias.astype(np.float32),
+            'head_kinds': np.array([layer[0] for layer in self.head_layers]),
+            'head_activations': np.array([layer[3] if layer[0] == 'dense' else '' for layer in self.head_layers]),
+        }
+        for i, layer in enumerate(self.head_layers):
+            arrays[f'head_{i}_a'] = layer[1].astype(np.float32)
+            arrays[f'head_{i}_b'] = layer[2].astype(np.float32)
+        np.savez(path, **arrays)
+
+    def initial_state(self, batch_size=None):
+        """Zero (h, c), as Keras starts every window."""
+        shape = (self.units,) if batch_size is None else (batch_size, self.units)
+        return np.zeros(shape, dtype=self.dtype), np.zeros(shape, dtype=self.dtype)
+
+    def step(self, x, h, c):
+        """One timestep; x is a normalized reading of shape (features,) or (batch, features)."""
+        z = np.asarray(x, dtype=self.dtype) @ self._kernel + h @ self._recurrent_kernel
+        z += self._bias
+        return _gate_update(z, c)
+
+    def run(self, X, h=None, c=None):
+        """
+        Runs the LSTM over a window of shape (timesteps, features) or
+        (batch, timesteps, features), from zero state unless (h, c) is given.
+
+        Returns:
+        tuple: (h, c) after the last timestep.
+        """
+        X = np.asarray(X, dtype=self.dtype)
+        if h is None:
+            h, c = self.initial_state(None if X.ndim == 2 else len(X))
+
+        # Input projections for every timestep in one matmul
+        projected = X @ self._kernel + self._bias
+        for t in range(X.shape[-2]):
+            z = h @ self._recurrent_kernel
+            z += projected[..., t, :]
+            h, c = _gate_update(z, c)
+        return h, c
+
+    def head(self, h):
+        """Applies the layers after the LSTM to a hidden state."""
+        out = h
+        for layer in self.head_layers:
+            if layer[0] == 'batch_norm':
+                out = out * layer[1] + layer[2]
+            else:
+                out = _ACTIVATIONS[layer[3]](out @ layer[1] + layer[2])
+        return out
+
+    def predict(self, X):
+        """Model output for window(s) X, equivalent to model(X, training=False)."""
+        return self.head(self.run(X)[0])
+
+
+def export_npz(model_path, npz_path=None):
+    """
+    Exports a .keras model to the NumPy engine's .npz format.
+
+    Parameters:
+    model_path (str): Path to the .keras file (Keras is imported here only).
+    npz_path (str, optional): Output path; defaults to the model path with .npz.
+
+    Returns:
+    tuple: (npz_path, max_abs_diff) where max_abs_diff compares the exported
+    engine with the Keras model on random windows.
+    """
+    os.environ.setdefault('KERAS_BACKEND', 'jax')
+    from keras.models import load_model
+
+    npz_path = npz_path or os.path.splitext(model_path)[0] + '.npz'
+    model = load_model(model_path)
+    NumpyLSTM.from_keras(model).save_npz(npz_path)
+
+    X = np.random.RandomState(0).rand(8, *model.input_shape[1:]).astype(np.float32)
+    expected = np.asarray(model(X, training=False))
+    max_abs_diff = float(np.abs(NumpyLSTM.from_npz(npz_path).predict(X) - expected).max())
+    return npz_path, max_abs_diff
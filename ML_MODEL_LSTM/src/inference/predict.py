@@ -2,13 +2,156 @@
 
 import numpy as np
 import pandas as pd
-from keras.models import load_model
 from src.data.preprocessing import create_sliding_windows
+from src.inference.compiled import make_forward_fn
+from src.inference.registry import registry as default_registry, load_keras_model
+
+BATCH_SIZE = 1024  # Windows per forward pass
+CHUNK_ROWS = 100_000  # Input rows per streamed chunk
+
+
+def _prediction_columns(n_outputs):
+    if n_outputs == 1:
+        return ['Predicted Values']
+    return [f'Predicted Values {i}' for i in range(n_outputs)]
+
+
+class Predictor:
+    """
+    Loads a trained model once and predicts over inputs of any size.
+
+    Inputs are consumed in chunks of rows. The last window_size rows of
+    each chunk are carried into the next, so chunked results match one
+    pass over the whole series while memory stays bounded by the chunk.
+    Every window is paired with its next-step target row, as in
+    create_sliding_windows: the first window_size rows get no prediction.
+
+    The model (and its compiled forward pass) is fetched through the
+    artifact registry, so Predictors for the same file share one copy.
+
+    Example:
+        predictor = Predictor('model.keras', window_size=60)
+        predictor.predict_to_csv(pd.read_csv('big.csv', chunksize=100_000), 'out.csv')
+    """
+
+    def __init__(self, model_path, window_size, batch_size=BATCH_SIZE, fast_inference=True,
+                 feature_columns=None, registry=None):
+        """
+        Parameters:
+        model_path (str): Path to the trained Keras model.
+        window_size (int): Timesteps per input window.
+        batch_size (int): Windows per forward pass.
+        fast_inference (bool): Use the jit-compiled forward pass instead of model.predict.
+        feature_columns (list, optional): DataFrame columns fed to the model; defaults to all.
+        registry (ArtifactRegistry, optional): Registry to load through; defaults to the shared one.
+        """
+        registry = registry or default_registry
+        self.model_path = model_path
+        self.window_size = window_size
+        self.batch_size = batch_size
+        self.feature_columns = feature_columns
+        self.model = registry.get('keras', model_path, load_keras_model)
+        self.n_outputs = int(np.prod(self.model.output_shape[1:]))
+
+        if fast_inference:
+            self._forward = registry.get(('forward', window_size), model_path,
+                                         lambda _: make_forward_fn(self.model))
+        else:
+            self._forward = lambda X: self.model.predict(X, verbose=0)
+
+    def predict_windows(self, X):
+        """
+        Predicts windows of shape (n, window_size, features) in batches.
+
+        Returns:
+        numpy.ndarray: Predictions of shape (n, outputs).
+        """
+        outputs = [np.asarray(self._forward(X[start:start + self.batch_size])).reshape(-1, self.n_outputs)
+                   for start in range(0, len(X), self.batch_size)]
+        if not outputs:
+            return np.empty((0, self.n_outputs), dtype=np.float32)
+        return np.concatenate(outputs)
+
+    def _frames(self, input_data, chunk_rows):
+        """Splits in-memory input into chunks; an iterable of DataFrames is passed through."""
+        if isinstance(input_data, np.ndarray):
+            input_data = pd.DataFrame(input_data)
+        if isinstance(input_data, pd.DataFrame):
+            return (input_data.iloc[start:start + chunk_rows] for start in range(0, len(input_data), chunk_rows))
+        return input_data
+
+    def iter_predictions(self, input_data, chunk_rows=CHUNK_ROWS):
+        """
+        Yields predictions chunk by chunk.
+
+        Parameters:
+        input_data: DataFrame, 2-D array, or an iterable of DataFrames
+            (e.g. pd.read_csv(..., chunksize=N)) holding consecutive rows.
+        chunk_rows (int): Rows per chunk when input_data is in memory.
+
+        Yields:
+        tuple: (index, predictions) where index holds the input index labels
+        of the target rows and predictions has shape (len(index), outputs).
+        """
+        tail_values = tail_index = None
+        for frame in self._frames(input_data, chunk_rows):
+            if self.feature_columns is not None:
+                frame = frame[self.feature_columns]
+            values = frame.to_numpy(dtype=np.float32)
+            index = frame.index.to_numpy()
+            if tail_values is not None:
+                values = np.concatenate([tail_values, values])
+                index = np.concatenate([tail_index, index])
+
+            X, _ = create_sliding_windows(values, self.window_size)
+            if len(X):
+                yield index[self.window_size:], self.predict_windows(X)
+
+            tail_values = values[-self.window_size:]
+            tail_index = index[-self.window_size:]
+
+    def predict(self, input_data, chunk_rows=CHUNK_ROWS):
+        """Predictions for every window of the input as one array, shape (n, outputs)."""
+        chunks = [predictions for _, predictions in self.iter_predictions(input_data, chunk_rows)]
+        if not chunks:
+            return np.empty((0, self.n_outputs), dtype=np.float32)
+        return np.concatenate(chunks)
+
+    def predict_to_csv(self, input_data, output_file, chunk_rows=CHUNK_ROWS, columns=None):
+        """
+        Streams predictions to a CSV file, one chunk at a time.
+
+        Only one chunk of predictions is held in memory. The file has a
+        'row' column with the index label of each target row, followed by
+        the prediction columns.
+
+        Parameters:
+        input_data: As for iter_predictions.
+        output_file (str): Path to the output CSV file.
+        chunk_rows (int): Rows per chunk when input_data is in memory.
+        columns (list, optional): Names of the prediction columns.
+
+        Returns:
+        int: Number of prediction rows written.
+        """
+        columns = columns or _prediction_columns(self.n_outputs)
+        written = 0
+        with open(output_file, 'w', newline='') as f:
+            pd.DataFrame(columns=['row'] + list(columns)).to_csv(f, index=False)
+            for index, predictions in self.iter_predictions(input_data, chunk_rows):
+                chunk = pd.DataFrame(predictions, columns=columns)
+                chunk.insert(0, 'row', index)
+                chunk.to_csv(f, index=False, header=False)
+                written += len(chunk)
+        return written
+
 
 def make_predictions(model_path, input_data, window_size):
     """
     Load the trained LSTM model and make predictions on the input data.
 
+    The model is loaded once per process and reused by later calls.
+
     Parameters:
     model_path (str): Path to the trained LSTM model.
     input_data (pd.DataFrame): DataFrame containing the input data for predictions.
@@ -17,35 +160,33 @@ def make_predictions(model_path, input_data, window_size):
     Returns:
     np.ndarray: Predicted values.
     """
-    # Load the trained model from the specified path
-    model = load_model(model_path)
-
-    # Prepare the input data using sliding windows
-    X = create_sliding_windows(input_data.values, window_size)
-
-    # Make predictions using the loaded model
-    predictions = model.predict(X)
-
-    return predictions
+    return Predictor(model_path, window_size).predict(input_data)
 
 def save_predictions(predictions, output_file):
     """
     Save the predictions to a CSV file.
 
+    For inputs too large to hold every prediction in memory, use
+    Predictor.predict_to_csv instead.
+
     Parameters:
     predictions (np.ndarray): Array of predicted values.
     output_file (str): Path to the output CSV file.
     """
+    predictions = np.asarray(predictions)
+    if predictions.ndim == 1:
+        predictions = predictions[:, np.newaxis]
+
     # Convert predictions to a DataFrame
-    predictions_df = pd.DataFrame(predictions, columns=['Predicted Values'])
+    predictions_df = pd.DataFrame(predictions, columns=_prediction_columns(predictions.shape[1]))
 
     # Save the DataFrame to a CSV file
     predictions_df.to_csv(output_file, index=False)
 
 # Example usage (uncomment to use):
 # if __name__ == "__main__":
-#     model_path = 'path/to/your/model.h5'
-#     input_data = pd.read_csv('path/to/your/input_data.csv')
+#     model_path = 'path/to/your/model.keras'
 #     window_size = 10
-#     predictions = make_predictions(model_path, input_data, window_size)
-#     save_predictions(predictions, 'path/to/save/predictions.csv')
\ No newline at end of file
+#     predictor = Predictor(model_path, window_size)
+#     predictor.predict_to_csv(pd.read_csv('path/to/your/input_data.csv', chunksize=100_000),
+#                              'path/to/save/predictions.csv')
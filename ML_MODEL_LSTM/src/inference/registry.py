@@ -0,0 +1,77 @@
+# Process-wide cache of loaded inference artifacts, shared between detectors.
+
+import json
+import os
+import threading
+
+
+def load_keras_model(path):
+    """Loads a .keras model (Keras is imported on first use only)."""
+    os.environ.setdefault('KERAS_BACKEND', 'jax')
+    from keras.models import load_model
+    return load_model(path)
+
+
+def load_numpy_model(path):
+    from src.inference.numpy_lstm import NumpyLSTM
+    return NumpyLSTM.from_npz(path)
+
+
+def load_scalers(path):
+    """Per-state AffineScalers from a .npz (or legacy pickled MinMaxScaler dict)."""
+    from src.inference.scaling import load_scalers as _load_scalers
+    return _load_scalers(path)
+
+
+def load_json(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+class ArtifactRegistry:
+    """
+    Loads each artifact file once per process and hands out the shared object.
+
+    Entries are keyed by (kind, real path), so two detectors pointing at the
+    same model, scaler or thresholds file share one in-memory copy. Shared
+    objects must be treated as read-only by their users. Loading happens
+    under a lock, so concurrent detectors never load the same file twice.
+
+    Example:
+        model = registry.get('keras', model_path, load_keras_model)
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.RLock()
+
+    def get(self, kind, path, loader):
+        """
+        Returns the cached artifact, calling loader(path) on first use.
+
+        Parameters:
+        kind (hashable): Artifact kind; the same file may be cached under several kinds.
+        path (str): Artifact file path.
+        loader (callable): Loads the artifact from the path.
+        """
+        key = (kind, os.path.realpath(path))
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = loader(path)
+            return self._entries[key]
+
+    def __contains__(self, kind_and_path):
+        kind, path = kind_and_path
+        return (kind, os.path.realpath(path)) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Drops every cached artifact (e.g. after retraining in the same process)."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Default registry used by the glitch detectors
+registry = ArtifactRegistry()
@@ -0,0 +1,103 @@
+# Closed-form MinMax scaling for inference, without sklearn.
+
+import os
+import pickle
+
+import numpy as np
+
+
+class AffineScaler:
+    """
+    Per-band affine scaler: x_norm = x * scale + offset.
+
+    Holds exactly what a fitted sklearn MinMaxScaler applies (scale_ and
+    min_), so transform/inverse_transform reproduce it bit for bit, but as a
+    plain multiply-add that can write into preallocated buffers and needs no
+    input validation or sklearn import.
+
+    Attributes:
+        scale: Per-band multiplier, (feature_max - feature_min) / (data_max - data_min)
+        offset: Per-band offset, feature_min - data_min * scale
+        data_min: Per-band minimum seen during fitting
+        feature_range: (min, max) of the normalized values
+    """
+
+    def __init__(self, data_min, scale, feature_range=(0.0, 1.0)):
+        self.data_min = np.asarray(data_min)
+        self.scale = np.asarray(scale)
+        self.feature_range = tuple(float(v) for v in feature_range)
+        self.offset = self.feature_range[0] - self.data_min * self.scale
+
+    @classmethod
+    def from_minmax(cls, scaler):
+        """Converts a fitted sklearn MinMaxScaler."""
+        affine = cls(scaler.data_min_, scaler.scale_, scaler.feature_range)
+        affine.offset = np.asarray(scaler.min_)
+        return affine
+
+    def transform(self, X, out=None):
+        """
+        Normalizes X (..., n_bands).
+
+        Parameters:
+        X (array-like): Readings in the original scale.
+        out (numpy.ndarray, optional): Preallocated output of X's shape; may be X itself.
+
+        Returns:
+        numpy.ndarray: The normalized values (out, if given).
+        """
+        out = np.multiply(X, self.scale, out=out)
+        out += self.offset
+        return out
+
+    def inverse_transform(self, X, out=None):
+        """Maps normalized values back to the original scale (optionally into out)."""
+        out = np.subtract(X, self.offset, out=out)
+        out /= self.scale
+        return out
+
+
+def save_scalers_npz(scalers, path):
+    """
+    Writes per-state MinMax parameters as plain arrays.
+
+    Parameters:
+    scalers (dict): {state: fitted MinMaxScaler or AffineScaler}
+    path (str): Output .npz path.
+    """
+    arrays = {'states': np.array(list(scalers))}
+    for state, scaler in scalers.items():
+        if not isinstance(scaler, AffineScaler):
+            scaler = AffineScaler.from_minmax(scaler)
+        arrays[f'{state}/data_min'] = scaler.data_min
+        arrays[f'{state}/scale'] = scaler.scale
+        arrays[f'{state}/offset'] = scaler.offset
+        arrays[f'{state}/feature_range'] = np.array(scaler.feature_range)
+    np.savez(path, **arrays)
+    return path
+
+
+def load_scalers_npz(path):
+    """Reads save_scalers_npz output into {state: AffineScaler}."""
+    scalers = {}
+    with np.load(path, allow_pickle=False) as data:
+        for state in data['states']:
+            state = str(state)
+            scaler = AffineScaler(data[f'{state}/data_min'], data[f'{state}/scale'],
+                                  data[f'{state}/feature_range'])
+            scaler.offset = data[f'{state}/offset']
+            scalers[state] = scaler
+    return scalers
+
+
+def load_scalers(path):
+    """
+    Loads per-state scalers as AffineScalers.
+
+    .npz files are read as plain arrays. Pickled sklearn MinMaxScaler dicts
+    (.pkl) are still accepted for compatibility; unpickling them imports sklearn.
+    """
+    if os.path.splitext(path)[1] == '.npz':
+        return load_scalers_npz(path)
+    with open(path, 'rb') as f:
+        return {state: AffineScaler.from_minmax(scaler) for state, scaler in pickle.load(f).items()}
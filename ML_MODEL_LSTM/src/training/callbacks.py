@@ -0,0 +1,73 @@
+import time
+
+from keras.callbacks import Callback
+
+
+class ThroughputLogger(Callback):
+    """
+    Logs training throughput (samples/sec) per epoch and the first-step compile time.
+
+    The first train step of a run includes tracing and XLA compilation, so its
+    duration minus the median of the following steps is reported as compile time.
+    Epoch throughput only counts time spent in train steps, not validation.
+
+    Attributes:
+        compile_time: Estimated first-step compile time in seconds.
+        epochs: One dict per epoch with train_s, samples and samples_per_s.
+    """
+
+    def __init__(self, samples_per_epoch, verbose=1):
+        """
+        Parameters:
+        samples_per_epoch (int): Training samples seen in one epoch.
+        verbose (int): Print a line per epoch when > 0.
+        """
+        super().__init__()
+        self.samples_per_epoch = samples_per_epoch
+        self.verbose = verbose
+        self.compile_time = None
+        self.first_step_time = None
+        self.epochs = []
+
+    def on_train_begin(self, logs=None):
+        self.compile_time = None
+        self.first_step_time = None
+        self.epochs = []
+        self._step_times = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._epoch_start = time.perf_counter()
+        self._last_step_end = self._epoch_start
+
+    def on_train_batch_begin(self, batch, logs=None):
+        self._step_start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        now = time.perf_counter()
+        duration = now - self._step_start
+        if self.first_step_time is None:
+            self.first_step_time = duration
+        elif len(self._step_times) < 50:
+            self._step_times.append(duration)
+        self._last_step_end = now
+
+    def on_epoch_end(self, epoch, logs=None):
+        train_s = self._last_step_end - self._epoch_start
+        samples_per_s = self.samples_per_epoch / train_s if train_s > 0 else float('nan')
+        self.epochs.append({
+            'epoch': epoch + 1,
+            'train_s': train_s,
+            'samples': self.samples_per_epoch,
+            'samples_per_s': samples_per_s,
+        })
+
+        if self.compile_time is None and self._step_times:
+            typical = sorted(self._step_times)[len(self._step_times) // 2]
+            self.compile_time = max(self.first_step_time - typical, 0.0)
+
+        if self.verbose:
+            message = f"\n  [throughput] epoch {epoch + 1}: {samples_per_s:,.0f} samples/s ({train_s:.2f}s in train steps)"
+            if epoch == 0 and self.first_step_time is not None:
+                compile_time = self.compile_time if self.compile_time is not None else self.first_step_time
+                message += f", first-step compile ~{compile_time:.2f}s"
+            print(message)
@@ -0,0 +1,40 @@
+from keras.utils import PyDataset
+
+from src.data.windows import WindowSampler
+
+
+class WindowBatchDataset(PyDataset):
+    """
+    Keras dataset that gathers (X, y) batches from lazy windows on demand.
+
+    Only one batch of windows is materialized at a time, so training memory
+    depends on the batch size rather than on the number of sequences.
+
+    Example:
+        windows = ConcatWindows([SequenceWindows(data, 60) for data in series])
+        train_ds = WindowBatchDataset(windows, batch_size=2048, shuffle=True)
+        model.fit(train_ds, epochs=10)
+    """
+
+    def __init__(self, windows, batch_size, shuffle=True, seed=None, sampler=None, **kwargs):
+        """
+        Parameters:
+        windows: ConcatWindows (or any object with __len__ and gather(indices)).
+        batch_size (int): Number of windows per batch.
+        shuffle (bool): Reshuffle window order after every epoch.
+        seed (int, optional): Seed for the shuffling permutation.
+        sampler (optional): Custom sampler with __len__, batch_indices() and on_epoch_end().
+        **kwargs: Passed to keras.utils.PyDataset (workers, use_multiprocessing, ...).
+        """
+        super().__init__(**kwargs)
+        self.windows = windows
+        self.sampler = sampler or WindowSampler(len(windows), batch_size, shuffle=shuffle, seed=seed)
+
+    def __len__(self):
+        return len(self.sampler)
+
+    def __getitem__(self, index):
+        return self.windows.gather(self.sampler.batch_indices(index))
+
+    def on_epoch_end(self):
+        self.sampler.on_epoch_end()
@@ -0,0 +1,119 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from bulk_scan import iter_scan, scan_csv, scan_frame
+from src.inference.scaling import AffineScaler
+
+BANDS = ['Delta', 'Theta', 'Alpha', 'Beta', 'Gamma']
+
+
+class PersistenceDetector:
+    """Detector stand-in whose 'model' predicts the last reading of each window."""
+
+    bands = BANDS
+    lookback = 4
+    thresholds = {band: 0.5 for band in BANDS}
+
+    def __init__(self, states):
+        self.scalers = {state: AffineScaler([0.0] * 5, [0.1] * 5) for state in states}
+
+    def predict_windows(self, X):
+        return np.asarray(X)[:, -1]
+
+
+class TestBulkScan(unittest.TestCase):
+    def test_runs_masks_and_errors(self):
+        values = np.full((20, 5), 5.0)
+        values[7] = [5.0, 5.0, 10.0, 5.0, 5.0]  # Alpha jump of 0.5 -> not above threshold
+        values[15] = [0.0, 5.0, 5.0, 5.0, 5.0]  # Delta drop of 0.5 in the second run
+        values[16] = [9.0, 5.0, 5.0, 5.0, 5.0]  # Delta jump of 0.9 from the glitch row
+        df = pd.DataFrame(values, columns=BANDS)
+        df.insert(0, 'State', ['Baseline'] * 10 + ['Focused'] * 8 + ['Unknown'] * 2)
+
+        result = scan_frame(df, PersistenceDetector(['Baseline', 'Focused']), batch_size=3)
+
+        # First `lookback` rows of each run and unknown states are not checked
+        expected_checked = np.zeros(20, dtype=bool)
+        expected_checked[4:10] = True
+        expected_checked[14:18] = True
+        np.testing.assert_array_equal(result['checked'], expected_checked)
+
+        self.assertAlmostEqual(result.loc[7, 'Alpha_error'], 0.5, places=6)
+        self.assertAlmostEqual(result.loc[8, 'Alpha_error'], 0.5, places=6)
+        self.assertAlmostEqual(result.loc[16, 'Delta_error'], 0.9, places=6)
+        self.assertTrue(np.isnan(result.loc[2, 'Delta_error']))
+        self.assertEqual(result.index[result['is_glitch']].tolist(), [16])
+
+    def test_threaded_batches_match_sequential(self):
+        rng = np.random.RandomState(2)
+        df = pd.DataFrame(5 + rng.normal(0, 2, (200, 5)), columns=BANDS)
+        df.insert(0, 'State', ['Baseline'] * 80 + ['Focused'] * 120)
+        detector = PersistenceDetector(['Baseline', 'Focused'])
+
+        expected = scan_frame(df, detector, batch_size=7, workers=1)
+        pd.testing.assert_frame_equal(scan_frame(df, detector, batch_size=7, workers=4), expected)
+
+    def test_chunked_csv_matches_one_pass(self):
+        rng = np.random.RandomState(0)
+        df = pd.DataFrame(5 + rng.normal(0, 2, (50, 5)), columns=BANDS)
+        df.insert(0, 'State', ['Baseline'] * 13 + ['Focused'] * 3 + ['Baseline'] * 20 + ['Unknown'] * 4
+                  + ['Focused'] * 10)
+        detector = PersistenceDetector(['Baseline', 'Focused'])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'recording.csv')
+            df.to_csv(path, index=False)
+            expected = scan_frame(pd.read_csv(path, dtype={band: np.float32 for band in BANDS}), detector)
+            for chunk_rows in (3, 7, 50):
+                scanned = pd.concat(chunk for _, chunk in iter_scan(path, detector, batch_size=4, chunk_rows=chunk_rows))
+                pd.testing.assert_frame_equal(scanned[expected.columns], expected)
+
+            output = os.path.join(tmp, 'scanned.csv')
+            summary = scan_csv(path, output, detector=detector, chunk_rows=7)
+            self.assertEqual(len(pd.read_csv(output)), len(df))
+            self.assertEqual(summary.loc['Baseline', 'rows'], 33)
+            self.assertEqual(summary.loc['Baseline', 'checked'], expected['checked'][df['State'] == 'Baseline'].sum())
+            self.assertEqual(summary['glitches'].sum(), expected['is_glitch'].sum())
+
+    def test_output_keeps_input_lines_verbatim(self):
+        rng = np.random.RandomState(1)
+        df = pd.DataFrame(5 + rng.normal(0, 2, (30, 5)), columns=BANDS)
+        df.insert(0, 'State', ['Baseline'] * 30)
+        df['Note'] = 'raw'
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'recording.csv')
+            df.to_csv(path, index=False)
+            output = os.path.join(tmp, 'scanned.csv')
+            scan_csv(path, output, detector=PersistenceDetector(['Baseline']), chunk_rows=7)
+            with open(path) as f:
+                input_lines = f.read().splitlines()
+            with open(output) as f:
+                output_lines = f.read().splitlines()
+            scanned = pd.read_csv(output)
+
+        self.assertEqual(len(output_lines), len(input_lines))
+        for input_line, output_line in zip(input_lines, output_lines):
+            self.assertTrue(output_line.startswith(input_line + ','))
+        pd.testing.assert_frame_equal(scanned[df.columns], df)
+        self.assertEqual(list(scanned.columns[len(df.columns):]),
+                         ['checked', 'is_glitch'] + [f'{band}_error' for band in BANDS])
+
+    def test_custom_state_column(self):
+        df = pd.DataFrame(np.full((12, 5), 5.0), columns=BANDS)
+        df.insert(0, 'Condition', ['Baseline'] * 12)
+        df.loc[9, 'Beta'] = 20.0
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'recording.csv')
+            df.to_csv(path, index=False)
+            summary = scan_csv(path, os.path.join(tmp, 'scanned.csv'), detector=PersistenceDetector(['Baseline']),
+                               state_column='Condition')
+        self.assertEqual(summary.loc['Baseline', 'checked'], 8)
+        self.assertEqual(summary.loc['Baseline', 'glitches'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler
+from src.inference.bundle import load_bundle, write_bundle, ALIGNMENT
+from src.inference.numpy_lstm import NumpyLSTM
+from src.inference.scaling import AffineScaler, load_scalers_npz, save_scalers_npz
+
+BANDS = ['Delta', 'Theta', 'Alpha', 'Beta', 'Gamma']
+
+
+class TestDetectorBundle(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        units = 8
+        self.model = NumpyLSTM(
+            rng.randn(5, 4 * units), rng.randn(units, 4 * units), rng.randn(4 * units),
+            [('dense', rng.randn(units, 4), rng.randn(4), 'relu'),
+             ('dense', rng.randn(4, 5), rng.randn(5), 'linear')],
+            dtype=np.float32
+        )
+        self.scalers = {
+            'Baseline': MinMaxScaler().fit(rng.rand(50, 5).astype(np.float32) * 40),
+            'Focused': MinMaxScaler().fit(rng.rand(50, 5).astype(np.float32) * 20 + 3),
+        }
+        self.config = {'lookback': 12, 'bands': BANDS,
+                       'glitch_thresholds': {band: 0.1 for band in BANDS},
+                       'mae_per_band': {band: 0.025 for band in BANDS}}
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'detector.bundle')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip(self):
+        write_bundle(self.path, self.model, self.scalers, self.config)
+        bundle = load_bundle(self.path)
+
+        self.assertEqual(bundle.lookback, 12)
+        self.assertEqual(bundle.bands, BANDS)
+        self.assertEqual(bundle.config['mae_per_band'], self.config['mae_per_band'])
+        self.assertEqual(bundle.states, ['Baseline', 'Focused'])
+        for array in bundle.arrays.values():
+            self.assertIsInstance(array.base, np.memmap)
+            self.assertEqual(array.__array_interface__['data'][0] % ALIGNMENT, 0)
+
+        X = np.random.RandomState(1).rand(3, 12, 5)
+        np.testing.assert_allclose(bundle.numpy_model().predict(X), self.model.predict(X), rtol=1e-6)
+
+        rows = np.random.RandomState(2).rand(10, 5) * 40
+        for state, scaler in bundle.scalers().items():
+            np.testing.assert_allclose(scaler.transform(rows), self.scalers[state].transform(rows), rtol=1e-6)
+
+    def test_scalers_match_npz_exactly(self):
+        # Parameters a float32 round trip would change
+        scalers = dict(self.scalers, Stressed=AffineScaler([0.1, 2.3, 4.56789, 1e-3, 7.0],
+                                                           [1 / 3, 0.0123456789, 2.5, 1 / 7, 0.3]))
+        write_bundle(self.path, self.model, scalers, self.config)
+        npz_path = save_scalers_npz(scalers, os.path.join(self.tmp.name, 'scaler.npz'))
+
+        from_bundle = load_bundle(self.path).scalers()
+        from_npz = load_scalers_npz(npz_path)
+        rows = np.random.RandomState(3).rand(10, 5) * 40
+        for state, scaler in from_npz.items():
+            np.testing.assert_array_equal(from_bundle[state].offset, scaler.offset)
+            np.testing.assert_array_equal(from_bundle[state].transform(rows), scaler.transform(rows))
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a bundle at all')
+        with self.assertRaises(ValueError):
+            load_bundle(self.path)
+
+    def test_requires_lookback(self):
+        with self.assertRaises(ValueError):
+            write_bundle(self.path, self.model, self.scalers, {'bands': BANDS, 'glitch_thresholds': {}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import json
+import tempfile
+import unittest
+import numpy as np
+from src.data.cache import load_grouped_cached, default_cache_dir
+
+BANDS = ['Delta', 'Theta', 'Alpha', 'Beta', 'Gamma']
+CSV = (
+    "State,Delta,Theta,Alpha,Beta,Gamma\n"
+    "Baseline,9.6,19.65,23.16,18.45,5.44\n"
+    "Focused,7.1,9.68,34.98,15.03,4.07\n"
+    "Baseline,7.65,16.76,33.38,16.59,4.63\n"
+)
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp_dir.name, 'data.csv')
+        with open(self.csv_path, 'w') as f:
+            f.write(CSV)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def manifest(self):
+        with open(os.path.join(default_cache_dir(self.csv_path), 'manifest.json')) as f:
+            return json.load(f)
+
+    def test_builds_memory_mapped_float32_cache(self):
+        grouped = load_grouped_cached(self.csv_path, BANDS)
+        self.assertEqual(list(grouped), ['Baseline', 'Focused'])
+        self.assertIsInstance(grouped['Baseline'], np.memmap)
+        self.assertEqual(grouped['Baseline'].dtype, np.float32)
+        np.testing.assert_allclose(grouped['Baseline'][1], [7.65, 16.76, 33.38, 16.59, 4.63], rtol=1e-6)
+
+    def test_touched_file_reuses_cache_and_edited_file_rebuilds(self):
+        load_grouped_cached(self.csv_path, BANDS)
+        digest = self.manifest()['source_sha256']
+
+        # Same content, new mtime: the hash matches, so the cache is kept
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        load_grouped_cached(self.csv_path, BANDS)
+        self.assertEqual(self.manifest()['source_mtime_ns'], stat.st_mtime_ns + 10**9)
+        self.assertEqual(self.manifest()['source_sha256'], digest)
+
+        # Different content of the same size: rebuilt
+        with open(self.csv_path, 'w') as f:
+            f.write(CSV.replace('9.6,', '9.7,'))
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+        grouped = load_grouped_cached(self.csv_path, BANDS)
+        self.assertNotEqual(self.manifest()['source_sha256'], digest)
+        self.assertAlmostEqual(float(grouped['Baseline'][0, 0]), 9.7, places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import os
+os.environ.setdefault('KERAS_BACKEND', 'jax')
+
+import unittest
+
+import numpy as np
+import keras
+
+from src.inference.compiled import _bucket_size, make_forward_fn
+
+
+class TestCompiledForward(unittest.TestCase):
+    def setUp(self):
+        keras.utils.set_random_seed(0)
+        self.model = keras.Sequential([
+            keras.layers.Input(shape=(6, 5)),
+            keras.layers.LSTM(8),
+            keras.layers.Dense(5)
+        ])
+
+    def test_bucket_size(self):
+        self.assertEqual([_bucket_size(n) for n in (1, 2, 3, 5, 8, 9)], [1, 2, 4, 8, 8, 16])
+
+    def test_matches_model_predict(self):
+        forward = make_forward_fn(self.model, warmup_shape=(6, 5))
+        X = np.random.rand(3, 6, 5).astype(np.float32)
+        np.testing.assert_allclose(forward(X), self.model.predict(X, verbose=0), rtol=1e-5, atol=1e-6)
+        self.assertEqual(forward(X[:1]).shape, (1, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
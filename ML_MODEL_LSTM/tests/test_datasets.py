@@ -0,0 +1,47 @@
+import unittest
+import numpy as np
+from src.data.datasets import TimeSeriesDataset
+
+
+class TestTimeSeriesDataset(unittest.TestCase):
+    def setUp(self):
+        self.data = np.arange(40, dtype=np.float32).reshape(20, 2)
+        self.dataset = TimeSeriesDataset(self.data, sequence_length=3, train_size=0.5)
+
+    def test_indexing_and_splits_are_views(self):
+        self.assertEqual(len(self.dataset), 17)
+        X, y = self.dataset[4]
+        np.testing.assert_array_equal(X, self.data[4:7])
+        np.testing.assert_array_equal(y, self.data[7])
+        self.assertTrue(np.shares_memory(X, self.data))
+
+        X, y = self.dataset[2:6]
+        self.assertEqual(X.shape, (4, 3, 2))
+        self.assertTrue(np.shares_memory(X, self.data))
+        np.testing.assert_array_equal(self.dataset[[5, 1]][1], self.data[[8, 4]])
+
+        # Splits match windows built from each half on its own
+        X_train, y_train = self.dataset.get_train_data()
+        X_test, y_test = self.dataset.get_test_data()
+        self.assertEqual((len(X_train), len(X_test)), (7, 7))
+        np.testing.assert_array_equal(X_test[0], self.data[10:13])
+        np.testing.assert_array_equal(y_train[-1], self.data[9])
+        self.assertTrue(np.shares_memory(X_test, self.data))
+
+    def test_iter_batches(self):
+        batches = list(self.dataset.iter_batches(3, split='train'))
+        self.assertEqual([len(X) for X, _ in batches], [3, 3, 1])
+        self.assertEqual(self.dataset.num_batches(3, 'train'), 3)
+        np.testing.assert_array_equal(np.concatenate([y for _, y in batches]), self.dataset.get_train_data()[1])
+
+        shuffled = self.dataset.iter_batches(3, split='test', shuffle=True, seed=0, repeat=True)
+        epoch = np.concatenate([next(shuffled)[1] for _ in range(3)])
+        np.testing.assert_array_equal(np.sort(epoch[:, 0]), self.dataset.get_test_data()[1][:, 0])
+        self.assertEqual(len(next(shuffled)[0]), 3)  # repeat starts a new pass
+
+        with self.assertRaises(ValueError):
+            next(self.dataset.iter_batches(3, split='validation'))
+
+
+if __name__ == '__main__':
+    unittest.main()
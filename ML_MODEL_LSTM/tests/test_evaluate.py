@@ -0,0 +1,55 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.evaluation.evaluate import StreamingEvaluator, check_report, evaluate_streaming
+
+BANDS = ['Delta', 'Theta', 'Alpha', 'Beta', 'Gamma']
+
+
+class TestStreamingEvaluator(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.y = rng.rand(300, 5)
+        self.noise = rng.randn(300, 5) * 0.1
+        self.states = np.array(['Baseline', 'Focused', 'Stressed'])[rng.randint(0, 3, 300)]
+        self.batches = [(self.y[i:i + 64] + self.noise[i:i + 64], self.y[i:i + 64], self.states[i:i + 64])
+                        for i in range(0, 300, 64)]
+
+    def test_batched_metrics_match_full_pass(self):
+        # The "model" returns X, so the errors are exactly the noise
+        report = evaluate_streaming(lambda X: X, self.batches, BANDS)
+
+        self.assertEqual((report['samples'], report['batches']), (300, 5))
+        self.assertAlmostEqual(report['overall']['RMSE'], np.sqrt(np.mean(self.noise ** 2)))
+        self.assertAlmostEqual(report['overall']['per_band']['Gamma']['MAE'], np.mean(np.abs(self.noise[:, 4])))
+        focused = self.states == 'Focused'
+        self.assertEqual(report['per_state']['Focused']['samples'], focused.sum())
+        self.assertAlmostEqual(report['per_state']['Focused']['per_band']['Alpha']['RMSE'],
+                               np.sqrt(np.mean(self.noise[focused, 2] ** 2)))
+
+        latency = report['latency_ms']
+        self.assertLessEqual(latency['per_sample']['p50'], latency['per_batch']['p50'])
+        self.assertGreater(report['throughput_samples_per_s'], 0)
+
+    def test_report_file_and_gates(self):
+        evaluator = StreamingEvaluator(BANDS)
+        evaluator.update(self.y, self.y + self.noise, states='Baseline')
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'report.json')
+            evaluator.write_report(path)
+            with open(path) as f:
+                report = json.load(f)
+
+        self.assertEqual(list(report['per_state']), ['Baseline'])
+        self.assertEqual(check_report(report, {'overall.RMSE': 1.0}), [])
+        failures = check_report(report, {'overall.MAE': 0.01, 'latency_ms.per_sample.p99': 1.0,
+                                         'per_state.Focused.RMSE': 1.0})
+        self.assertEqual(len(failures), 3)
+        self.assertIn('not measured', failures[1])
+        self.assertIn('missing', failures[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import os
+os.environ.setdefault('KERAS_BACKEND', 'jax')
+
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+
+import numpy as np
+import keras
+
+from glitch_detector import EEGGlitchDetector, StreamingGlitchDetector, compare_streaming_accuracy
+from src.inference.bundle import write_bundle
+from src.inference.numpy_lstm import NumpyLSTM
+from src.inference.registry import ArtifactRegistry
+from src.inference.scaling import AffineScaler, save_scalers_npz
+
+BANDS = ['Delta', 'Theta', 'Alpha', 'Beta', 'Gamma']
+LOOKBACK = 6
+
+
+class TestGlitchDetector(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        keras.utils.set_random_seed(0)
+        model = keras.Sequential([
+            keras.layers.Input(shape=(LOOKBACK, 5)),
+            keras.layers.LSTM(8),
+            keras.layers.BatchNormalization(),
+            keras.layers.Dense(5)
+        ])
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.model_path = os.path.join(cls.tmp.name, 'model.keras')
+        cls.scaler_path = os.path.join(cls.tmp.name, 'scaler.npz')
+        cls.thresholds_path = os.path.join(cls.tmp.name, 'thresholds.json')
+        cls.bundle_path = os.path.join(cls.tmp.name, 'detector.bundle')
+        model.save(cls.model_path)
+
+        scalers = {
+            'Baseline': AffineScaler([0.0] * 5, [0.1] * 5),
+            'Focused': AffineScaler([5.0, 0.0, 2.0, 0.0, 1.0], [0.05, 0.2, 0.1, 0.08, 0.25]),
+        }
+        save_scalers_npz(scalers, cls.scaler_path)
+        config = {'lookback': LOOKBACK, 'bands': BANDS,
+                  'glitch_thresholds': {band: 1.2 for band in BANDS},
+                  'mae_per_band': {band: 0.3 for band in BANDS}}
+        with open(cls.thresholds_path, 'w') as f:
+            json.dump(config, f)
+        write_bundle(cls.bundle_path, NumpyLSTM.from_keras(model), scalers, config)
+
+        # A slow random walk with a few spikes, so both verdicts occur
+        rng = np.random.RandomState(1)
+        cls.readings = 5 + np.cumsum(rng.normal(0, 0.2, (60, 5)), axis=0)
+        cls.readings[[20, 33, 47], [1, 3, 0]] += 12
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def _detector(self, cls=EEGGlitchDetector, registry=None, **kwargs):
+        if 'bundle_path' not in kwargs:
+            kwargs.setdefault('model_path', self.model_path)
+            kwargs.setdefault('scaler_path', self.scaler_path)
+            kwargs.setdefault('thresholds_path', self.thresholds_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return cls(registry=registry or ArtifactRegistry(), **kwargs)
+
+    def _checks(self):
+        """(history, reading) pairs over the recording."""
+        return [(self.readings[i - LOOKBACK:i], self.readings[i]) for i in range(LOOKBACK, len(self.readings))]
+
+    def test_push_matches_check_reading(self):
+        detector = self._detector()
+        pushed = [detector.push(reading) for reading in self.readings]
+        self.assertEqual(pushed[:LOOKBACK], [None] * LOOKBACK)
+
+        expected = [detector.check_reading(history, reading)[0] for history, reading in self._checks()]
+        self.assertEqual(pushed[LOOKBACK:], expected)
+        self.assertEqual(set(expected), {True, False})
+
+    def test_batch_with_mixed_states(self):
+        detector = self._detector(engine='numpy')
+        focused = self._detector(engine='numpy', state='Focused')
+
+        checks = self._checks()[:8]
+        states = ['Baseline', 'Focused'] * 4
+        results = detector.check_readings_batch([h for h, _ in checks], [r for _, r in checks], states=states)
+        self.assertEqual(len(results), len(checks))
+        for (history, reading), state, (is_valid, details) in zip(checks, states, results):
+            single = (detector if state == 'Baseline' else focused).check_reading(history, reading)[1]
+            self.assertEqual(details['state'], state)
+            self.assertEqual(is_valid, single['is_valid'])
+            for band in BANDS:
+                self.assertAlmostEqual(details['normalized_errors'][band], single['normalized_errors'][band])
+
+    def test_streaming_resync_every_reading_is_exact(self):
+        stream = self._detector(StreamingGlitchDetector, resync_every=1)
+        report = compare_streaming_accuracy(stream, self.readings)
+        self.assertLess(report['max_abs_diff'], 1e-5)
+        self.assertEqual(report['validity_agreement'], 1.0)
+
+    def test_registry_shares_artifacts(self):
+        registry = ArtifactRegistry()
+        detector = self._detector(registry=registry)
+        loaded = len(registry)
+        focused = self._detector(registry=registry, state='Focused')
+
+        self.assertEqual(len(registry), loaded)
+        self.assertIs(focused.model, detector.model)
+        self.assertIs(focused.scalers, detector.scalers)
+        self.assertIs(focused.config, detector.config)
+        self.assertIs(focused._forward, detector._forward)
+
+    def test_set_state_renormalizes_buffer(self):
+        detector = self._detector(engine='numpy')
+        detector.prime(self.readings[:LOOKBACK])
+        detector.set_state('Focused')
+
+        self.assertEqual(detector.state, 'Focused')
+        np.testing.assert_allclose(detector.window, detector.normalize(self.readings[:LOOKBACK]), atol=1e-12)
+        pushed = [detector.push(reading) for reading in self.readings[LOOKBACK:]]
+        expected = [detector.check_reading(history, reading)[0] for history, reading in self._checks()]
+        self.assertEqual(pushed, expected)
+
+    def test_compact_result_and_is_valid_reading(self):
+        detector = self._detector(engine='numpy')
+        for history, reading in self._checks():
+            is_valid, details = detector.check_reading(history, reading)
+            result = detector.check_reading(history, reading, compact=True)
+            self.assertEqual(result.to_dict(), details)
+            self.assertEqual(bool(result), is_valid)
+            self.assertEqual(detector.is_valid_reading(history, reading), is_valid)
+
+    def test_bundle_matches_keras(self):
+        from_keras = self._detector()
+        from_bundle = self._detector(bundle_path=self.bundle_path)
+        self.assertEqual(from_bundle.engine, 'numpy')
+        self.assertEqual(from_bundle.lookback, LOOKBACK)
+        for history, reading in self._checks():
+            expected = from_keras.check_reading(history, reading, compact=True)
+            result = from_bundle.check_reading(history, reading, compact=True)
+            np.testing.assert_allclose(result.errors, expected.errors, atol=1e-5)
+            self.assertEqual(result.is_valid, expected.is_valid)
+
+
+if __name__ == '__main__':
+    unittest.main()
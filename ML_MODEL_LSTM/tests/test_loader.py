@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.data.loader import load_grouped_by_state, load_multiple_files
+
+BANDS = ['Delta', 'Theta', 'Alpha', 'Beta', 'Gamma']
+
+
+class TestGroupedLoading(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp_dir.name, 'data.csv')
+        with open(self.csv_path, 'w') as f:
+            f.write("Timestamp,State,Delta,Theta,Alpha,Beta,Gamma\n")
+            for i in range(9):
+                state = ['Stressed', 'Baseline', 'Focused'][i % 3]
+                f.write(f"{i},{state},{i},{i + 0.5},{i * 2},{i * 3},{i * 4}\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_single_pass_grouping_keeps_order(self):
+        grouped = load_grouped_by_state(self.csv_path, BANDS)
+        self.assertEqual(list(grouped), ['Stressed', 'Baseline', 'Focused'])
+        self.assertEqual(grouped['Baseline'].dtype, np.float32)
+        np.testing.assert_array_equal(grouped['Baseline'][:, 0], [1, 4, 7])
+        np.testing.assert_array_equal(grouped['Focused'][:, 4], [8, 20, 32])
+
+    def test_missing_band_column(self):
+        with self.assertRaises(ValueError):
+            load_grouped_by_state(self.csv_path, BANDS + ['Mu'])
+
+
+class TestMultipleFileLoading(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.paths = []
+        for subject, rows in (('A', 3), ('B', 2), ('C', 4)):
+            path = os.path.join(self.tmp_dir.name, f'EEG_Dataset_{subject}.csv')
+            with open(path, 'w') as f:
+                f.write("State,Delta,Theta,Alpha,Beta,Gamma\n")
+                for i in range(rows):
+                    f.write(f"{'Baseline' if i % 2 else 'Focused'},{i}.5,1,2,3,4\n")
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_glob_parallel_load_tags_source(self):
+        pattern = os.path.join(self.tmp_dir.name, 'EEG_Dataset_*.csv')
+        for executor in ('thread', 'process'):
+            data = load_multiple_files(pattern, workers=2, executor=executor,
+                                       dtype={'State': 'category', 'Delta': np.float32})
+            self.assertEqual(len(data), 9)
+            self.assertEqual(data['source_file'].tolist(),
+                             [self.paths[0]] * 3 + [self.paths[1]] * 2 + [self.paths[2]] * 4)
+            self.assertEqual(data['Delta'].dtype, np.float32)
+            self.assertIsInstance(data['State'].dtype, pd.CategoricalDtype)
+            np.testing.assert_array_equal(data['Delta'][:5], [0.5, 1.5, 2.5, 0.5, 1.5])
+
+    def test_missing_files_are_skipped(self):
+        data = load_multiple_files([self.paths[0], os.path.join(self.tmp_dir.name, 'missing.csv')],
+                                   source_column=None)
+        self.assertEqual(list(data.columns), ['State', 'Delta', 'Theta', 'Alpha', 'Beta', 'Gamma'])
+        self.assertEqual(len(data), 3)
+
+    def test_schema_mismatch(self):
+        with open(self.paths[1], 'w') as f:
+            f.write("State,Delta,Theta,Alpha,Beta\nBaseline,1,2,3,4\n")
+        with self.assertRaisesRegex(ValueError, 'Gamma'):
+            load_multiple_files(self.paths)
+
+        with open(self.paths[1], 'w') as f:
+            f.write("State,Delta,Theta,Alpha,Beta,Gamma\nBaseline,1,2,high,4,5\n")
+        with self.assertRaisesRegex(ValueError, 'Alpha'):
+            load_multiple_files(self.paths)
+
+
+if __name__ == '__main__':
+    unittest.main()
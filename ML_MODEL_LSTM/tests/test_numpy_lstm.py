@@ -0,0 +1,54 @@
+import os
+os.environ.setdefault('KERAS_BACKEND', 'jax')
+
+import tempfile
+import unittest
+
+import numpy as np
+import keras
+
+from src.inference.numpy_lstm import NumpyLSTM
+
+
+class TestNumpyLSTM(unittest.TestCase):
+    def setUp(self):
+        keras.utils.set_random_seed(0)
+        self.model = keras.Sequential([
+            keras.layers.Input(shape=(10, 5)),
+            keras.layers.LSTM(16),
+            keras.layers.BatchNormalization(),
+            keras.layers.Dense(8, activation='relu'),
+            keras.layers.Dense(5)
+        ])
+        # Non-trivial BatchNorm statistics
+        bn = self.model.layers[1]
+        gamma, beta, mean, var = bn.get_weights()
+        bn.set_weights([gamma * 1.5, beta + 0.1, mean + 0.2, var * 2])
+        self.X = np.random.RandomState(0).rand(4, 10, 5).astype(np.float32)
+
+    def test_matches_keras(self):
+        engine = NumpyLSTM.from_keras(self.model)
+        expected = np.asarray(self.model(self.X, training=False))
+        np.testing.assert_allclose(engine.predict(self.X), expected, atol=1e-5)
+        np.testing.assert_allclose(engine.predict(self.X[0]), expected[0], atol=1e-5)
+
+    def test_step_matches_run(self):
+        engine = NumpyLSTM.from_keras(self.model)
+        h, c = engine.initial_state()
+        for x in self.X[0]:
+            h, c = engine.step(x, h, c)
+        np.testing.assert_allclose(h, engine.run(self.X[0])[0], atol=1e-12)
+
+    def test_npz_roundtrip_folds_batch_norm(self):
+        engine = NumpyLSTM.from_keras(self.model)
+        self.assertEqual([layer[0] for layer in engine.head_layers], ['dense', 'dense'])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'model.npz')
+            engine.save_npz(path)
+            loaded = NumpyLSTM.from_npz(path)
+        expected = np.asarray(self.model(self.X, training=False))
+        np.testing.assert_allclose(loaded.predict(self.X), expected, atol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+os.environ.setdefault('KERAS_BACKEND', 'jax')
+
+import contextlib
+import io
+import unittest
+
+import numpy as np
+import keras
+
+import train_1hz_model
+import train_eeg_lstm
+
+
+class TestThresholdPrecision(unittest.TestCase):
+    """float32 calibration must match the float64 pipeline within THRESHOLD_RTOL."""
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        t = np.arange(600)[:, None]
+        self.grouped = {
+            'Baseline': np.sin(t / 7.0 + np.arange(5)) * 30 + 50 + rng.rand(600, 5) * 5,
+            'Focused': np.cos(t / 5.0 + np.arange(5)) * 10 + 20 + rng.rand(600, 5) * 2,
+        }
+
+    def _calibrate(self, trainer, model, lookback, dtype):
+        with contextlib.redirect_stdout(io.StringIO()):
+            normalized, _ = trainer.normalize_data(self.grouped, dtype=dtype)
+            _, _, test_windows, _ = trainer.prepare_window_datasets(normalized, lookback=lookback, batch_size=64)
+            return trainer.calculate_thresholds(model, test_windows, multiplier=4, chunk_size=100)
+
+    def test_float32_thresholds_match_float64(self):
+        for trainer in (train_1hz_model, train_eeg_lstm):
+            with self.subTest(trainer=trainer.__name__):
+                keras.utils.set_random_seed(0)
+                lookback = 12
+                model = keras.Sequential([
+                    keras.layers.Input(shape=(lookback, 5)),
+                    keras.layers.LSTM(8),
+                    keras.layers.Dense(5)
+                ])
+                mae32, thresholds32, percentiles32 = self._calibrate(trainer, model, lookback, np.float32)
+                mae64, thresholds64, percentiles64 = self._calibrate(trainer, model, lookback, np.float64)
+
+                for band in trainer.EEG_BANDS:
+                    np.testing.assert_allclose(mae32[band], mae64[band], rtol=trainer.THRESHOLD_RTOL)
+                    np.testing.assert_allclose(thresholds32[band], thresholds64[band], rtol=trainer.THRESHOLD_RTOL)
+                    # Percentiles come from a log-binned sketch: at most one bin apart
+                    for key in percentiles64:
+                        np.testing.assert_allclose(percentiles32[key][band], percentiles64[key][band], rtol=0.011)
+
+
+if __name__ == '__main__':
+    unittest.main()
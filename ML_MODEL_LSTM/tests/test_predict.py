@@ -0,0 +1,58 @@
+import os
+os.environ.setdefault('KERAS_BACKEND', 'jax')
+
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import keras
+
+from src.inference.predict import Predictor
+from src.inference.registry import ArtifactRegistry
+
+
+class TestPredictor(unittest.TestCase):
+    def setUp(self):
+        keras.utils.set_random_seed(0)
+        model = keras.Sequential([
+            keras.layers.Input(shape=(6, 3)),
+            keras.layers.LSTM(8),
+            keras.layers.Dense(2)
+        ])
+        self.tmp = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.tmp.name, 'model.keras')
+        model.save(self.model_path)
+        self.df = pd.DataFrame(np.random.RandomState(0).rand(50, 3), columns=['a', 'b', 'c'])
+        self.df.index += 100
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_chunked_matches_single_pass_and_loads_once(self):
+        registry = ArtifactRegistry()
+        predictor = Predictor(self.model_path, window_size=6, batch_size=8, registry=registry)
+        self.assertIs(Predictor(self.model_path, window_size=6, registry=registry).model, predictor.model)
+
+        windows = np.stack([self.df.values[i:i + 6] for i in range(len(self.df) - 6)]).astype(np.float32)
+        expected = predictor.model.predict(windows, verbose=0)
+        np.testing.assert_allclose(predictor.predict(self.df, chunk_rows=7), expected, rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(predictor.predict(self.df.values), expected, rtol=1e-5, atol=1e-6)
+
+    def test_streams_csv_from_chunked_reader(self):
+        input_path = os.path.join(self.tmp.name, 'input.csv')
+        output_path = os.path.join(self.tmp.name, 'predictions.csv')
+        self.df.to_csv(input_path, index=False)
+        predictor = Predictor(self.model_path, window_size=6, registry=ArtifactRegistry())
+
+        written = predictor.predict_to_csv(pd.read_csv(input_path, chunksize=9), output_path)
+
+        result = pd.read_csv(output_path)
+        self.assertEqual(written, 44)
+        self.assertEqual(list(result.columns), ['row', 'Predicted Values 0', 'Predicted Values 1'])
+        self.assertEqual(result['row'].tolist(), list(range(6, 50)))
+        np.testing.assert_allclose(result.iloc[:, 1:].to_numpy(), predictor.predict(self.df), rtol=1e-5, atol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
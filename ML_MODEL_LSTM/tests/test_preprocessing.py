@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+from src.data.preprocessing import StreamingMinMaxScaler, StreamingStandardScaler
+
+
+class TestStreamingScalers(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.data = (rng.randn(1000, 5) * [1, 10, 100, 1000, 0] + [0, 5, -50, 1e4, 3]).astype(np.float32)
+        self.chunks = np.array_split(self.data, 7)
+
+    def test_minmax_matches_sklearn(self):
+        scaler = StreamingMinMaxScaler(feature_range=(-1, 1))
+        for chunk in self.chunks:
+            scaler.partial_fit(chunk)
+        expected = MinMaxScaler(feature_range=(-1, 1)).fit(self.data)
+
+        np.testing.assert_array_equal(scaler.scale_, expected.scale_)
+        np.testing.assert_array_equal(scaler.min_, expected.min_)
+        self.assertEqual(scaler.n_samples_seen_, 1000)
+
+        chunk = self.chunks[2].copy()
+        self.assertIs(scaler.transform(chunk, out=chunk), chunk)
+        np.testing.assert_array_equal(chunk, expected.transform(self.chunks[2]))
+        np.testing.assert_allclose(scaler.inverse_transform(chunk), self.chunks[2], rtol=1e-5, atol=1e-3)
+
+    def test_standard_matches_sklearn_for_any_chunking(self):
+        expected = StandardScaler().fit(self.data.astype(np.float64))
+        for chunks in (self.chunks, np.array_split(self.data, 1), np.array_split(self.data, 100)):
+            scaler = StreamingStandardScaler()
+            for chunk in chunks:
+                scaler.partial_fit(chunk)
+            np.testing.assert_allclose(scaler.mean_, expected.mean_, rtol=1e-10, atol=1e-9)
+            np.testing.assert_allclose(scaler.var_, expected.var_, rtol=1e-10, atol=1e-9)
+            np.testing.assert_array_equal(scaler.scale_[4], 1.0)
+
+        chunk = self.chunks[0].copy()
+        scaler.transform(chunk, out=chunk)
+        np.testing.assert_allclose(chunk, expected.transform(self.chunks[0]), rtol=1e-5, atol=1e-5)
+
+    def test_plain_array_roundtrip_resumes_fitting(self):
+        for cls in (StreamingMinMaxScaler, StreamingStandardScaler):
+            scaler = cls().partial_fit(self.chunks[0])
+            restored = cls.from_arrays(scaler.to_arrays())
+            for chunk in self.chunks[1:]:
+                scaler.partial_fit(chunk)
+                restored.partial_fit(chunk)
+            np.testing.assert_allclose(restored.transform(self.data), scaler.transform(self.data), rtol=1e-12)
+
+    def test_nan_is_ignored(self):
+        data = self.data[:20].astype(np.float64)
+        data[3, 1] = np.nan
+        minmax = StreamingMinMaxScaler().partial_fit(data)
+        standard = StreamingStandardScaler().partial_fit(data)
+        self.assertFalse(np.isnan(minmax.data_min_).any())
+        np.testing.assert_allclose(standard.mean_[1], np.nanmean(data[:, 1]))
+        self.assertEqual(standard.n_samples_seen_.tolist(), [20, 19, 20, 20, 20])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+
+from src.inference.registry import ArtifactRegistry, load_json
+
+
+class TestArtifactRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'thresholds.json')
+        with open(self.path, 'w') as f:
+            f.write('{"bands": ["Delta"]}')
+        self.calls = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _loader(self, path):
+        self.calls.append(path)
+        return load_json(path)
+
+    def test_loads_each_file_once(self):
+        registry = ArtifactRegistry()
+        first = registry.get('thresholds', self.path, self._loader)
+        # Same file through a different spelling of the path
+        second = registry.get('thresholds', os.path.join(self.tmp.name, '.', 'thresholds.json'), self._loader)
+        self.assertIs(first, second)
+        self.assertEqual(len(self.calls), 1)
+        self.assertIn(('thresholds', self.path), registry)
+
+    def test_kinds_and_clear(self):
+        registry = ArtifactRegistry()
+        registry.get('thresholds', self.path, self._loader)
+        registry.get('raw', self.path, self._loader)
+        self.assertEqual(len(registry), 2)
+        registry.clear()
+        registry.get('thresholds', self.path, self._loader)
+        self.assertEqual(len(self.calls), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import pickle
+import tempfile
+import unittest
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler
+from src.inference.scaling import AffineScaler, load_scalers, save_scalers_npz
+
+
+class TestAffineScaler(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.scalers = {
+            'Baseline': MinMaxScaler().fit(rng.rand(100, 5) * 40),
+            'Focused': MinMaxScaler(feature_range=(-1, 1)).fit(rng.rand(100, 5) * 20 + 3),
+        }
+        self.rows = rng.rand(30, 5) * 50
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_sklearn_exactly(self):
+        for scaler in self.scalers.values():
+            affine = AffineScaler.from_minmax(scaler)
+            normalized = affine.transform(self.rows)
+            np.testing.assert_array_equal(normalized, scaler.transform(self.rows))
+            np.testing.assert_array_equal(affine.inverse_transform(normalized),
+                                          scaler.inverse_transform(normalized))
+
+            out = np.empty_like(self.rows)
+            self.assertIs(affine.transform(self.rows, out=out), out)
+            np.testing.assert_array_equal(out, normalized)
+
+    def test_npz_and_pickle_load_the_same_parameters(self):
+        npz_path = save_scalers_npz(self.scalers, os.path.join(self.tmp.name, 'scaler.npz'))
+        pkl_path = os.path.join(self.tmp.name, 'scaler.pkl')
+        with open(pkl_path, 'wb') as f:
+            pickle.dump(self.scalers, f)
+
+        for path in (npz_path, pkl_path):
+            loaded = load_scalers(path)
+            self.assertEqual(sorted(loaded), sorted(self.scalers))
+            for state, scaler in self.scalers.items():
+                self.assertEqual(loaded[state].feature_range, scaler.feature_range)
+                np.testing.assert_array_equal(loaded[state].transform(self.rows), scaler.transform(self.rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
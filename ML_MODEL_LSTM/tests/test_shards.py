@@ -0,0 +1,35 @@
+import tempfile
+import unittest
+import numpy as np
+from src.data.shards import write_normalized_shards, load_shards, BlockShuffleSampler
+from src.data.windows import SequenceWindows, ConcatWindows
+
+
+class TestShards(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.RandomState(0)
+        self.grouped = {'Baseline': rng.rand(1000, 5) * 40, 'Focused': rng.rand(700, 5) * 20}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_chunked_normalization_matches_full_fit(self):
+        shards, scalers = write_normalized_shards(self.grouped, self.tmp_dir.name, chunk_rows=128)
+        for state, data in self.grouped.items():
+            expected = (data - data.min(axis=0)) / (data.max(axis=0) - data.min(axis=0))
+            np.testing.assert_allclose(shards[state], expected, atol=1e-6)
+            self.assertIsInstance(shards[state], np.memmap)
+        self.assertEqual(list(load_shards(self.tmp_dir.name)), ['Baseline', 'Focused'])
+
+    def test_block_sampler_covers_every_window_once(self):
+        windows = ConcatWindows([SequenceWindows(data, 60) for data in self.grouped.values()])
+        sampler = BlockShuffleSampler(windows, batch_size=100, block_size=32, seed=0)
+        for _ in range(2):
+            seen = np.concatenate([sampler.batch_indices(i) for i in range(len(sampler))])
+            np.testing.assert_array_equal(np.sort(seen), np.arange(len(windows)))
+            sampler.on_epoch_end()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from run_sweep import expand_trials, write_results
+
+
+class TestSweepExpansion(unittest.TestCase):
+    def test_list_parameters_form_a_grid(self):
+        experiment = {'parameters': {'batch_size': [64, 128], 'learning_rate': [0.001, 0.01], 'epochs': 5}}
+        trials = expand_trials(experiment)
+        self.assertEqual(len(trials), 4)
+        self.assertIn({'batch_size': 128, 'learning_rate': 0.001, 'epochs': 5}, trials)
+
+    def test_explicit_trials_override_parameters(self):
+        experiment = {'parameters': {'batch_size': 64, 'epochs': 5},
+                      'trials': [{'batch_size': 32}, {'epochs': 10}]}
+        self.assertEqual(expand_trials(experiment),
+                         [{'batch_size': 32, 'epochs': 5}, {'batch_size': 64, 'epochs': 10}])
+
+    def test_results_come_from_best_trial(self):
+        experiment = {'results': {'metrics': [{'name': 'RMSE', 'value': None}, {'name': 'MAE', 'value': None}]}}
+        trials = [
+            {'trial_id': 't0', 'params': {}, 'best_validation_loss': 0.2, 'best_epoch': 3,
+             'rmse': 0.4, 'mae': 0.3, 'model_path': '/tmp/t0.keras', 'wall_s': 1.0},
+            {'trial_id': 't1', 'params': {}, 'best_validation_loss': 0.1, 'best_epoch': 7,
+             'rmse': 0.2, 'mae': 0.1, 'model_path': '/tmp/t1.keras', 'wall_s': 1.0},
+        ]
+        results = write_results(experiment, trials)['results']
+        self.assertEqual(results['best_epoch'], 7)
+        self.assertEqual(results['metrics'][0], {'name': 'RMSE', 'value': 0.2})
+        self.assertEqual(results['model_path'], '/tmp/t1.keras')
+
+
+if __name__ == '__main__':
+    unittest.main()
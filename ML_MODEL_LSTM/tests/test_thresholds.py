@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+from src.evaluation.thresholds import LogQuantileSketch, calibrate_thresholds
+
+BANDS = ['Delta', 'Theta', 'Alpha', 'Beta', 'Gamma']
+
+
+class TestThresholdCalibration(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.y = rng.rand(20000, 5)
+        self.pred = self.y + rng.normal(0, 0.05, self.y.shape)
+
+    def test_sketch_quantiles_within_relative_accuracy(self):
+        errors = np.abs(self.y - self.pred)
+        sketch = LogQuantileSketch(5, relative_accuracy=0.005)
+        for start in range(0, len(errors), 3000):
+            sketch.update(errors[start:start + 3000])
+        for q in (0.5, 0.99, 0.999):
+            expected = np.quantile(errors, q, axis=0, method='lower')
+            np.testing.assert_allclose(sketch.quantile(q), expected, rtol=0.01)
+
+    def test_streamed_thresholds_match_full_pass(self):
+        chunks = ((self.y[i:i + 1000], self.pred[i:i + 1000]) for i in range(0, len(self.y), 1000))
+        mae, thresholds, percentiles, _ = calibrate_thresholds(lambda X: X, chunks, BANDS, multiplier=4)
+        expected_mae = np.mean(np.abs(self.y - self.pred), axis=0)
+        for i, band in enumerate(BANDS):
+            self.assertAlmostEqual(mae[band], expected_mae[i])
+            self.assertAlmostEqual(thresholds[band], 4 * expected_mae[i])
+        self.assertEqual(list(percentiles), ['p99', 'p99.9'])
+        self.assertGreater(percentiles['p99.9']['Beta'], percentiles['p99']['Beta'])
+
+    def test_exact_zero_errors_go_to_the_zero_bin(self):
+        sketch = LogQuantileSketch(2)
+        with np.errstate(all='raise'):
+            sketch.update(np.array([[0.0, 0.1], [0.0, 0.2], [1e-9, 0.3]]))
+        self.assertEqual(sketch.counts[0, 0], 3)
+        self.assertEqual(sketch.quantile(0.99)[0], 0.0)
+
+    def test_no_windows_raises(self):
+        with self.assertRaises(ValueError):
+            calibrate_thresholds(lambda X: X, iter([]), BANDS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+from src.data.windows import (window_view, target_view, SequenceWindows, ConcatWindows,
+                              WindowSampler, concat_windows)
+
+
+def naive_sequences(data, lookback):
+    X, y = [], []
+    for i in range(len(data) - lookback):
+        X.append(data[i:i + lookback])
+        y.append(data[i + lookback])
+    return np.array(X), np.array(y)
+
+
+class TestWindows(unittest.TestCase):
+    def setUp(self):
+        self.data = np.arange(50, dtype=np.float64).reshape(10, 5)
+        self.lookback = 3
+
+    def test_views_match_list_comprehension(self):
+        X, y = naive_sequences(self.data, self.lookback)
+        np.testing.assert_array_equal(window_view(self.data, self.lookback), X)
+        np.testing.assert_array_equal(target_view(self.data, self.lookback), y)
+
+    def test_views_share_memory_and_are_read_only(self):
+        X = window_view(self.data, self.lookback)
+        self.assertTrue(np.shares_memory(X, self.data))
+        self.assertFalse(X.flags.writeable)
+
+    def test_split_and_gather(self):
+        windows = SequenceWindows(self.data, self.lookback)
+        train, test = windows.split(0.8)
+        self.assertEqual((len(train), len(test)), (5, 2))
+        X, y = test.gather([1])
+        np.testing.assert_array_equal(X[0], self.data[6:9])
+        np.testing.assert_array_equal(y[0], self.data[9])
+
+    def test_concat_windows_with_order(self):
+        parts = [SequenceWindows(self.data, self.lookback), SequenceWindows(self.data * 2, self.lookback)]
+        X_all, y_all = concat_windows(parts)
+        order = np.random.RandomState(0).permutation(len(X_all))
+        X, y = concat_windows(parts, order=order)
+        np.testing.assert_array_equal(X, X_all[order])
+        np.testing.assert_array_equal(y, y_all[order])
+
+    def test_concat_windows_gather_across_parts(self):
+        parts = [SequenceWindows(self.data, self.lookback), SequenceWindows(self.data * 2, self.lookback)]
+        X_all, y_all = concat_windows(parts)
+        windows = ConcatWindows(parts)
+        ids = np.array([8, 0, 13, 6])
+        X, y = windows.gather(ids)
+        np.testing.assert_array_equal(X, X_all[ids])
+        np.testing.assert_array_equal(y, y_all[ids])
+        with self.assertRaises(IndexError):
+            windows.gather([len(windows)])
+
+    def test_window_sampler_covers_every_window_once(self):
+        sampler = WindowSampler(10, batch_size=4, shuffle=True, seed=0)
+        self.assertEqual(len(sampler), 3)
+        seen = np.concatenate([sampler.batch_indices(i) for i in range(len(sampler))])
+        np.testing.assert_array_equal(np.sort(seen), np.arange(10))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,16 @@
 Trains an LSTM model on FFT-processed EEG data (1 sample/second).
 Uses 60-second lookback to predict the next second's values.
 Optimized for large datasets (~300k rows per state).
+
+Float precision:
+    FLOAT_DTYPE = np.float32 (default) keeps raw data, normalized data,
+    sequences and the fitted scaler parameters in float32, halving memory
+    against the float64 path; Keras computes in float32 either way.
+    Per-band errors are accumulated in float64, so the MAE and glitch
+    thresholds written to eeg_1hz_thresholds.json match the float64 path to a
+    relative tolerance of THRESHOLD_RTOL (1e-4); the percentile thresholds
+    agree to within one quantile-sketch bin (tests/test_precision.py). Set
+    FLOAT_DTYPE = np.float64 to reproduce the legacy full-precision pipeline.
 """
 
 import os
@@ -11,15 +21,26 @@ import os
 os.environ['KERAS_BACKEND'] = 'jax'
 
 import numpy as np
-import pandas as pd
 import pickle
 import json
 import matplotlib.pyplot as plt
 from sklearn.preprocessing import MinMaxScaler
+from keras import optimizers
 from keras.models import Sequential
-from keras.layers import LSTM, Dense, BatchNormalization
+from keras.layers import LSTM, Dense, BatchNormalization, Dropout
 from keras.callbacks import EarlyStopping, ReduceLROnPlateau
 
+from src.data.cache import load_grouped_cached
+from src.data.loader import load_grouped_by_state
+from src.data.shards import write_normalized_shards, BlockShuffleSampler
+from src.evaluation.thresholds import calibrate_thresholds, DEFAULT_PERCENTILES
+from src.inference.bundle import write_bundle
+from src.inference.numpy_lstm import NumpyLSTM
+from src.inference.scaling import save_scalers_npz
+from src.data.windows import SequenceWindows, ConcatWindows
+from src.training.callbacks import ThroughputLogger
+from src.training.datasets import WindowBatchDataset
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -33,7 +54,22 @@ DENSE_UNITS = 32       # Hidden dense layer units
 EPOCHS = 50            # Max epochs (early stopping will likely trigger before)
 BATCH_SIZE = 2048      # Large batch for 300k+ rows dataset
 TEST_SPLIT = 0.2       # 20% held out for validation
+VALIDATION_SPLIT = 0.1 # Last 10% of each state's training windows
+
+# Compilation (JAX backend)
+JIT_COMPILE = True        # XLA-compile the train and predict steps
+STEPS_PER_EXECUTION = 1   # Train steps batched into one dispatch (try 4-8 on CPU)
 GLITCH_MULTIPLIER = 4  # Threshold = MAE * this value
+CALIBRATION_CHUNK = 65536  # Test windows predicted per chunk during calibration
+
+# Precision
+FLOAT_DTYPE = np.float32  # np.float64 reproduces the legacy pipeline
+THRESHOLD_RTOL = 1e-4     # float32 vs float64 MAE/glitch threshold tolerance (tests/test_precision.py)
+
+# Out-of-core mode: normalized data lives in memory-mapped per-state shards
+OUT_OF_CORE = False
+SHARD_DIR = os.path.join(OUTPUT_DIR, 'data', 'shards')
+SHARD_BLOCK_SIZE = 256    # Consecutive windows drawn together from one shard
 
 # EEG Band columns
 EEG_BANDS = ['Delta', 'Theta', 'Alpha', 'Beta', 'Gamma']
@@ -42,34 +78,45 @@ EEG_BANDS = ['Delta', 'Theta', 'Alpha', 'Beta', 'Gamma']
 # =============================================================================
 # DATA LOADING & PREPROCESSING
 # =============================================================================
-def load_and_group_data(csv_path):
-    """Load CSV and group by State."""
+def load_and_group_data(csv_path, use_cache=True, dtype=FLOAT_DTYPE):
+    """
+    Load CSV and group by State.
+    
+    With use_cache, the CSV is parsed once into per-state float32 .npy files
+    next to it; later runs memory-map those instead of re-reading the text.
+    The cache only holds float32, so other dtypes always parse the CSV.
+    """
     print("=" * 60)
     print("Loading data...")
-    df = pd.read_csv(csv_path)
+    if use_cache and np.dtype(dtype) == np.float32:
+        grouped = load_grouped_cached(csv_path, EEG_BANDS)
+    else:
+        grouped = load_grouped_by_state(csv_path, EEG_BANDS, dtype=dtype)
     
-    states = df['State'].unique()
-    print(f"Dataset: {len(df):,} total rows")
-    print(f"States found: {list(states)}")
+    print(f"Dataset: {sum(len(data) for data in grouped.values()):,} total rows")
+    print(f"States found: {list(grouped)}")
     
-    grouped = {}
-    for state in states:
-        state_data = df[df['State'] == state][EEG_BANDS].values
-        grouped[state] = state_data
+    for state, state_data in grouped.items():
         print(f"  {state}: {len(state_data):,} rows")
     
     return grouped
 
 
-def normalize_data(grouped_data):
-    """Apply MinMaxScaler per state. Returns normalized data and scalers."""
+def normalize_data(grouped_data, dtype=FLOAT_DTYPE):
+    """
+    Apply MinMaxScaler per state. Returns normalized data and scalers.
+    
+    MinMaxScaler preserves float32 input, so with dtype=float32 both the
+    normalized arrays and the fitted scaler parameters stay in float32.
+    """
     print("\n" + "=" * 60)
-    print("Normalizing data per state (0-1 range)...")
+    print(f"Normalizing data per state (0-1 range, {np.dtype(dtype).name})...")
     
     scalers = {}
     normalized_data = {}
     
     for state, data in grouped_data.items():
+        data = np.asarray(data, dtype=dtype)
         scaler = MinMaxScaler(feature_range=(0, 1))
         normalized_data[state] = scaler.fit_transform(data)
         scalers[state] = scaler
@@ -82,91 +129,140 @@ def normalize_data(grouped_data):
     return normalized_data, scalers
 
 
+def normalize_to_shards(grouped_data, shard_dir=SHARD_DIR, dtype=FLOAT_DTYPE):
+    """
+    Out-of-core counterpart of normalize_data.
+    
+    Fits each state's MinMaxScaler chunk by chunk and writes the normalized
+    data to memory-mapped shards in `shard_dir`, so the returned arrays are
+    backed by disk instead of RAM.
+    """
+    print("\n" + "=" * 60)
+    print(f"Normalizing data per state into shards: {shard_dir}")
+    
+    normalized_data, scalers = write_normalized_shards(grouped_data, shard_dir, dtype=dtype)
+    
+    for state, shard in normalized_data.items():
+        print(f"  {state}: {len(shard):,} rows -> {os.path.basename(shard.filename)}")
+    
+    return normalized_data, scalers
+
+
 def create_sequences(data, lookback=60):
     """
     Create sliding window sequences.
     
     Input: (samples, lookback, 5 features)
     Target: (samples, 5 features) - next timestep
+    
+    Both are read-only strided views over `data`: no rows are copied until
+    windows are gathered into a batch.
     """
-    X, y = [], []
-    for i in range(len(data) - lookback):
-        X.append(data[i:i + lookback])
-        y.append(data[i + lookback])
-    return np.array(X), np.array(y)
+    windows = SequenceWindows(data, lookback)
+    return windows.X, windows.y
 
 
-def prepare_all_sequences(normalized_data, lookback=60, test_split=0.2):
-    """Create sequences for all states and combine into train/test sets."""
+def prepare_window_datasets(normalized_data, lookback=60, test_split=0.2,
+                            validation_split=0.1, batch_size=2048, block_size=None):
+    """
+    Build streaming train/validation datasets over the per-state arrays.
+    
+    Per state, windows are split in temporal order into train, validation
+    (last `validation_split` of the training range) and test ranges. Batches
+    are gathered on demand, so no sequence array is ever materialized whole.
+    
+    With `block_size`, training batches are drawn as shuffled blocks of
+    consecutive windows (BlockShuffleSampler), which suits memory-mapped shards.
+    
+    Returns:
+        train_ds, val_ds: WindowBatchDataset for model.fit
+        test_windows: ConcatWindows over every state's test range
+        test_data_by_state: {state: (X_test, y_test)} read-only views
+    """
     print("\n" + "=" * 60)
-    print(f"Creating sliding window sequences (lookback={lookback})...")
+    print(f"Creating streaming window datasets (lookback={lookback})...")
     
-    all_X_train, all_y_train = [], []
-    all_X_test, all_y_test = [], []
+    train_parts, val_parts, test_parts = [], [], []
     test_data_by_state = {}
     
     for state, data in normalized_data.items():
-        X, y = create_sequences(data, lookback)
+        windows = SequenceWindows(data, lookback)
         
-        # Split: first 80% train, last 20% test (preserving temporal order)
-        split_idx = int(len(X) * (1 - test_split))
-        X_train, X_test = X[:split_idx], X[split_idx:]
-        y_train, y_test = y[:split_idx], y[split_idx:]
+        # Temporal order: [ train | validation | test ]
+        fit_windows, test_windows = windows.split(1 - test_split)
+        train_windows, val_windows = fit_windows.split(1 - validation_split)
         
-        all_X_train.append(X_train)
-        all_y_train.append(y_train)
-        all_X_test.append(X_test)
-        all_y_test.append(y_test)
+        train_parts.append(train_windows)
+        val_parts.append(val_windows)
+        test_parts.append(test_windows)
         
-        test_data_by_state[state] = (X_test, y_test)
+        test_data_by_state[state] = (test_windows.X, test_windows.y)
         
-        print(f"  {state}: Train={len(X_train):,}, Test={len(X_test):,}")
-    
-    # Combine all states
-    X_train = np.concatenate(all_X_train, axis=0)
-    y_train = np.concatenate(all_y_train, axis=0)
-    X_test = np.concatenate(all_X_test, axis=0)
-    y_test = np.concatenate(all_y_test, axis=0)
-    
-    # Shuffle training data (important for mixed-state batches)
-    shuffle_idx = np.random.permutation(len(X_train))
-    X_train, y_train = X_train[shuffle_idx], y_train[shuffle_idx]
-    
-    print(f"\nTotal Training: {X_train.shape[0]:,} sequences")
-    print(f"Total Testing:  {X_test.shape[0]:,} sequences")
-    print(f"Input shape:    {X_train.shape[1:]} (lookback, features)")
-    print(f"Output shape:   {y_train.shape[1:]} (features)")
-    
-    return X_train, y_train, X_test, y_test, test_data_by_state
+        print(f"  {state}: Train={len(train_windows):,}, "
+              f"Val={len(val_windows):,}, Test={len(test_windows):,}")
+    
+    # Training batches mix states: shuffle permutes window start indices
+    train_windows = ConcatWindows(train_parts)
+    sampler = None
+    if block_size:
+        sampler = BlockShuffleSampler(train_windows, batch_size, block_size=block_size)
+    train_ds = WindowBatchDataset(train_windows, batch_size, shuffle=True, sampler=sampler)
+    val_ds = WindowBatchDataset(ConcatWindows(val_parts), batch_size, shuffle=False)
+    test_windows = ConcatWindows(test_parts)
+    
+    print(f"\nTotal Training:   {len(train_ds.windows):,} sequences ({len(train_ds):,} batches)")
+    print(f"Total Validation: {len(val_ds.windows):,} sequences")
+    print(f"Total Testing:    {len(test_windows):,} sequences")
+    
+    return train_ds, val_ds, test_windows, test_data_by_state
 
 
 # =============================================================================
 # MODEL BUILDING
 # =============================================================================
-def build_model(input_shape, output_units):
+def build_model(input_shape, output_units, learning_rate=None, dropout_rate=0.0,
+                optimizer='adam', loss='mse', jit_compile=JIT_COMPILE,
+                steps_per_execution=STEPS_PER_EXECUTION):
     """
     Build LSTM model with BatchNormalization for FFT-processed data.
     
     Architecture:
         LSTM(64) -> BatchNormalization -> Dense(32, ReLU) -> Dense(5)
+    
+    The keyword arguments default to the production setup; the sweep runner
+    overrides them per trial. A Dropout layer is only added when
+    dropout_rate > 0. jit_compile XLA-compiles the train/predict steps and
+    steps_per_execution runs several train steps per compiled dispatch.
     """
     print("\n" + "=" * 60)
     print("Building LSTM model...")
     print(f"  Input shape:  {input_shape}")
     print(f"  Output units: {output_units}")
     
-    model = Sequential([
+    layers = [
         LSTM(LSTM_UNITS, input_shape=input_shape, return_sequences=False),
         BatchNormalization(),
+    ]
+    if dropout_rate:
+        layers.append(Dropout(dropout_rate))
+    layers += [
         Dense(DENSE_UNITS, activation='relu'),
         Dense(output_units)
-    ])
+    ]
+    model = Sequential(layers)
+    
+    if learning_rate is not None:
+        optimizer = optimizers.get({'class_name': optimizer,
+                                    'config': {'learning_rate': learning_rate}})
     
     model.compile(
-        optimizer='adam',
-        loss='mse',
-        metrics=['mae']
+        optimizer=optimizer,
+        loss=loss,
+        metrics=['mae'],
+        jit_compile=jit_compile,
+        steps_per_execution=steps_per_execution
     )
+    print(f"  jit_compile={jit_compile}, steps_per_execution={steps_per_execution}")
     
     print("\nModel Summary:")
     model.summary()
@@ -177,30 +273,44 @@ def build_model(input_shape, output_units):
 # =============================================================================
 # THRESHOLD CALCULATION
 # =============================================================================
-def calculate_thresholds(model, X_test, y_test, multiplier=4):
-    """Calculate MAE per band and derive glitch thresholds."""
+def calculate_thresholds(model, test_windows, multiplier=4, chunk_size=CALIBRATION_CHUNK,
+                         percentiles=DEFAULT_PERCENTILES):
+    """
+    Calculate MAE per band and derive glitch thresholds, streaming the test set.
+    
+    Test windows are gathered and predicted `chunk_size` at a time; only running
+    per-band error sums and a fixed-size quantile sketch are kept, so memory is
+    constant however large the test set is. Errors are accumulated in float64
+    whatever the data dtype, which keeps float32 thresholds within
+    THRESHOLD_RTOL of the float64 path.
+    
+    Returns:
+        mae_per_band: {band: MAE}
+        thresholds: {band: MAE * multiplier}
+        percentile_thresholds: {'p99': {band: error}, 'p99.9': {band: error}}
+    """
     print("\n" + "=" * 60)
-    print("Calculating glitch thresholds...")
+    print(f"Calculating glitch thresholds ({len(test_windows):,} windows, "
+          f"chunks of {chunk_size:,})...")
     
-    predictions = model.predict(X_test, verbose=0, batch_size=BATCH_SIZE)
+    def predict(X):
+        return model.predict(X, verbose=0, batch_size=BATCH_SIZE)
     
-    mae_per_band = {}
-    thresholds = {}
+    mae_per_band, thresholds, percentile_thresholds, _ = calibrate_thresholds(
+        predict, test_windows.iter_chunks(chunk_size), EEG_BANDS,
+        multiplier=multiplier, percentiles=percentiles
+    )
     
-    print(f"\n  {'Band':<8} {'MAE':>10} {'Threshold (MAE×{})':>20}".format(multiplier))
-    print("  " + "-" * 40)
+    keys = list(percentile_thresholds)
+    header = ''.join(f"{key:>12}" for key in keys)
+    print(f"\n  {'Band':<8} {'MAE':>10} {'Threshold (MAE×{})':>20}".format(multiplier) + header)
+    print("  " + "-" * (40 + 12 * len(keys)))
     
-    for i, band in enumerate(EEG_BANDS):
-        abs_errors = np.abs(y_test[:, i] - predictions[:, i])
-        mae = float(np.mean(abs_errors))
-        threshold = float(mae * multiplier)
-        
-        mae_per_band[band] = mae
-        thresholds[band] = threshold
-        
-        print(f"  {band:<8} {mae:>10.6f} {threshold:>20.6f}")
+    for band in EEG_BANDS:
+        row = ''.join(f"{percentile_thresholds[key][band]:>12.6f}" for key in keys)
+        print(f"  {band:<8} {mae_per_band[band]:>10.6f} {thresholds[band]:>20.6f}" + row)
     
-    return mae_per_band, thresholds, predictions
+    return mae_per_band, thresholds, percentile_thresholds
 
 
 # =============================================================================
@@ -238,6 +348,62 @@ def visualize_predictions(y_actual, y_pred, state_name, band_idx=3, num_samples=
     print(f"\nVisualization saved: {save_path}")
 
 
+# =============================================================================
+# ARTIFACTS
+# =============================================================================
+def save_artifacts(model, scalers, mae_per_band, thresholds, percentile_thresholds,
+                   output_dir=None):
+    """Save model, scalers and thresholds. Returns {artifact: path}."""
+    output_dir = output_dir or OUTPUT_DIR
+    
+    print("\n" + "=" * 60)
+    print("Saving artifacts...")
+    
+    # Save model
+    model_path = os.path.join(output_dir, 'eeg_1hz_model.keras')
+    model.save(model_path)
+    print(f"  ✓ Model: {model_path}")
+    
+    # NumPy weights for EEGGlitchDetector(engine='numpy')
+    numpy_model_path = os.path.join(output_dir, 'eeg_1hz_model.npz')
+    numpy_model = NumpyLSTM.from_keras(model)
+    numpy_model.save_npz(numpy_model_path)
+    print(f"  ✓ NumPy model: {numpy_model_path}")
+    
+    # Save scalers
+    scaler_path = os.path.join(output_dir, 'eeg_1hz_scaler.pkl')
+    with open(scaler_path, 'wb') as f:
+        pickle.dump(scalers, f)
+    print(f"  ✓ Scalers: {scaler_path}")
+    
+    # Plain-array scaler parameters: the detectors load these without sklearn
+    scaler_params_path = save_scalers_npz(scalers, os.path.join(output_dir, 'eeg_1hz_scaler.npz'))
+    print(f"  ✓ Scaler parameters: {scaler_params_path}")
+    
+    # Save thresholds
+    thresholds_path = os.path.join(output_dir, 'eeg_1hz_thresholds.json')
+    thresholds_data = {
+        'lookback': LOOKBACK,
+        'mae_per_band': mae_per_band,
+        'glitch_thresholds': thresholds,
+        'glitch_multiplier': GLITCH_MULTIPLIER,
+        'percentile_thresholds': percentile_thresholds,
+        'dtype': np.dtype(FLOAT_DTYPE).name,
+        'bands': EEG_BANDS
+    }
+    with open(thresholds_path, 'w') as f:
+        json.dump(thresholds_data, f, indent=2)
+    print(f"  ✓ Thresholds: {thresholds_path}")
+    
+    # Single-file bundle for EEGGlitchDetector(bundle_path=...)
+    bundle_path = write_bundle(os.path.join(output_dir, 'eeg_1hz_detector.bundle'),
+                               numpy_model, scalers, thresholds_data)
+    print(f"  ✓ Detector bundle: {bundle_path}")
+    
+    return {'model': model_path, 'numpy_model': numpy_model_path, 'scalers': scaler_path,
+            'scaler_params': scaler_params_path, 'thresholds': thresholds_path, 'bundle': bundle_path}
+
+
 # =============================================================================
 # MAIN TRAINING FUNCTION
 # =============================================================================
@@ -250,14 +416,20 @@ def main():
     # Step 1: Load and group data by state
     grouped_data = load_and_group_data(DATA_PATH)
     
-    # Step 2: Normalize per state
-    normalized_data, scalers = normalize_data(grouped_data)
+    # Step 2: Normalize per state (into memory-mapped shards when out-of-core)
+    if OUT_OF_CORE:
+        normalized_data, scalers = normalize_to_shards(grouped_data, SHARD_DIR)
+    else:
+        normalized_data, scalers = normalize_data(grouped_data)
     
-    # Step 3: Create sequences
-    X_train, y_train, X_test, y_test, test_by_state = prepare_all_sequences(
+    # Step 3: Create streaming window datasets
+    train_ds, val_ds, test_windows, test_by_state = prepare_window_datasets(
         normalized_data, 
         lookback=LOOKBACK, 
-        test_split=TEST_SPLIT
+        test_split=TEST_SPLIT,
+        validation_split=VALIDATION_SPLIT,
+        batch_size=BATCH_SIZE,
+        block_size=SHARD_BLOCK_SIZE if OUT_OF_CORE else None
     )
     
     # Step 4: Build model
@@ -283,64 +455,37 @@ def main():
             patience=3,
             min_lr=1e-6,
             verbose=1
-        )
+        ),
+        ThroughputLogger(samples_per_epoch=len(train_ds.windows))
     ]
     
     history = model.fit(
-        X_train, y_train,
+        train_ds,
         epochs=EPOCHS,
-        batch_size=BATCH_SIZE,
-        validation_split=0.1,
+        validation_data=val_ds,
         callbacks=callbacks,
         verbose=1
     )
     
-    # Step 6: Calculate thresholds
-    mae_per_band, thresholds, predictions = calculate_thresholds(
-        model, X_test, y_test, multiplier=GLITCH_MULTIPLIER
+    # Step 6: Calculate thresholds (streamed over the test windows)
+    mae_per_band, thresholds, percentile_thresholds = calculate_thresholds(
+        model, test_windows, multiplier=GLITCH_MULTIPLIER
     )
     
     # Step 7: Visualize (Beta wave on Focused state)
     print("\n" + "=" * 60)
     print("Generating visualization...")
     
-    if 'Focused' in test_by_state:
-        X_vis, y_vis = test_by_state['Focused']
-        preds_vis = model.predict(X_vis, verbose=0, batch_size=BATCH_SIZE)
-        visualize_predictions(y_vis, preds_vis, 'Focused', band_idx=3, num_samples=200)
-    else:
-        first_state = list(test_by_state.keys())[0]
-        X_vis, y_vis = test_by_state[first_state]
-        preds_vis = model.predict(X_vis, verbose=0, batch_size=BATCH_SIZE)
-        visualize_predictions(y_vis, preds_vis, first_state, band_idx=3, num_samples=200)
+    # Only the plotted windows are predicted
+    num_samples = 200
+    vis_state = 'Focused' if 'Focused' in test_by_state else list(test_by_state.keys())[0]
+    X_vis, y_vis = test_by_state[vis_state]
+    X_vis, y_vis = X_vis[:num_samples], y_vis[:num_samples]
+    preds_vis = model.predict(X_vis, verbose=0, batch_size=BATCH_SIZE)
+    visualize_predictions(y_vis, preds_vis, vis_state, band_idx=3, num_samples=len(X_vis))
     
     # Step 8: Save artifacts
-    print("\n" + "=" * 60)
-    print("Saving artifacts...")
-    
-    # Save model
-    model_path = os.path.join(OUTPUT_DIR, 'eeg_1hz_model.keras')
-    model.save(model_path)
-    print(f"  ✓ Model: {model_path}")
-    
-    # Save scalers
-    scaler_path = os.path.join(OUTPUT_DIR, 'eeg_1hz_scaler.pkl')
-    with open(scaler_path, 'wb') as f:
-        pickle.dump(scalers, f)
-    print(f"  ✓ Scalers: {scaler_path}")
-    
-    # Save thresholds
-    thresholds_path = os.path.join(OUTPUT_DIR, 'eeg_1hz_thresholds.json')
-    thresholds_data = {
-        'lookback': LOOKBACK,
-        'mae_per_band': mae_per_band,
-        'glitch_thresholds': thresholds,
-        'glitch_multiplier': GLITCH_MULTIPLIER,
-        'bands': EEG_BANDS
-    }
-    with open(thresholds_path, 'w') as f:
-        json.dump(thresholds_data, f, indent=2)
-    print(f"  ✓ Thresholds: {thresholds_path}")
+    save_artifacts(model, scalers, mae_per_band, thresholds, percentile_thresholds)
     
     print("\n" + "=" * 60)
     print("  TRAINING COMPLETE!")
@@ -10,7 +10,6 @@ import os
 os.environ['KERAS_BACKEND'] = 'jax'
 
 import numpy as np
-import pandas as pd
 import pickle
 import json
 import matplotlib.pyplot as plt
@@ -19,6 +18,16 @@ from keras.models import Sequential
 from keras.layers import LSTM, Dense
 from keras.callbacks import EarlyStopping
 
+from src.data.cache import load_grouped_cached
+from src.data.loader import load_grouped_by_state
+from src.evaluation.thresholds import calibrate_thresholds
+from src.inference.bundle import write_bundle
+from src.inference.numpy_lstm import NumpyLSTM
+from src.inference.scaling import save_scalers_npz
+from src.training.callbacks import ThroughputLogger
+from src.data.windows import SequenceWindows, ConcatWindows
+from src.training.datasets import WindowBatchDataset
+
 # Configuration
 DATA_PATH = os.path.join(os.path.dirname(__file__), 'data', 'Synthetic_EEG_Data.csv')
 OUTPUT_DIR = os.path.dirname(__file__)
@@ -28,31 +37,38 @@ LSTM_UNITS = 50
 EPOCHS = 50
 BATCH_SIZE = 64
 TEST_SPLIT = 0.2
+VALIDATION_SPLIT = 0.1  # Last 10% of each state's training windows
 GLITCH_MULTIPLIER = 4  # MAE * this = glitch threshold
+CALIBRATION_CHUNK = 65536  # Test sequences predicted per chunk
+FLOAT_DTYPE = np.float32  # np.float64 reproduces the legacy pipeline
+THRESHOLD_RTOL = 1e-4     # float32 MAE/glitch thresholds match float64 within this (tests/test_precision.py)
+JIT_COMPILE = True        # XLA-compile the train and predict steps (JAX backend)
+STEPS_PER_EXECUTION = 1   # Train steps batched into one dispatch
 
 # EEG Band columns
 EEG_BANDS = ['Delta', 'Theta', 'Alpha', 'Beta', 'Gamma']
 
 
-def load_and_group_data(csv_path):
-    """Load CSV and group by State."""
+def load_and_group_data(csv_path, use_cache=True, dtype=FLOAT_DTYPE):
+    """Load CSV and group by State (through the per-state float32 .npy cache by default)."""
     print("Loading data...")
-    df = pd.read_csv(csv_path)
-    print(f"Loaded {len(df)} rows with states: {df['State'].unique()}")
-    
-    grouped = {state: df[df['State'] == state][EEG_BANDS].values 
-               for state in df['State'].unique()}
+    if use_cache and np.dtype(dtype) == np.float32:
+        grouped = load_grouped_cached(csv_path, EEG_BANDS)
+    else:
+        grouped = load_grouped_by_state(csv_path, EEG_BANDS, dtype=dtype)
+    print(f"Loaded {sum(len(data) for data in grouped.values())} rows with states: {list(grouped)}")
     
     return grouped
 
 
-def normalize_data(grouped_data):
-    """Apply MinMaxScaler per state, return normalized data and scalers."""
+def normalize_data(grouped_data, dtype=FLOAT_DTYPE):
+    """Apply MinMaxScaler per state, return normalized data and scalers (kept in `dtype`)."""
     print("Normalizing data per state...")
     scalers = {}
     normalized_data = {}
     
     for state, data in grouped_data.items():
+        data = np.asarray(data, dtype=dtype)
         scaler = MinMaxScaler(feature_range=(0, 1))
         normalized_data[state] = scaler.fit_transform(data)
         scalers[state] = scaler
@@ -66,48 +82,44 @@ def create_sequences(data, lookback=10):
     
     X: shape (samples, lookback, features)
     y: shape (samples, features) - next timestep prediction
+    
+    Both are read-only strided views over `data`, so nothing is copied here.
     """
-    X, y = [], []
-    for i in range(len(data) - lookback):
-        X.append(data[i:i + lookback])
-        y.append(data[i + lookback])
-    return np.array(X), np.array(y)
+    windows = SequenceWindows(data, lookback)
+    return windows.X, windows.y
 
 
-def prepare_all_sequences(normalized_data, lookback=10, test_split=0.2):
-    """Create sequences for all states and combine."""
-    all_X_train, all_y_train = [], []
-    all_X_test, all_y_test = [], []
-    test_data_by_state = {}  # For visualization
+def prepare_window_datasets(normalized_data, lookback=10, test_split=0.2,
+                            validation_split=0.1, batch_size=64):
+    """Build streaming train/validation datasets and test windows over the per-state arrays.
+    
+    Per state, windows are split in temporal order into train, validation (last
+    `validation_split` of the training range) and test ranges. Batches are
+    gathered on demand, so no (N, lookback, features) array is materialized.
+    """
+    train_parts, val_parts, test_parts = [], [], []
+    test_data_by_state = {}  # For visualization (views only)
     
     for state, data in normalized_data.items():
-        X, y = create_sequences(data, lookback)
+        windows = SequenceWindows(data, lookback)
         
-        # Split into train/test
-        split_idx = int(len(X) * (1 - test_split))
-        X_train, X_test = X[:split_idx], X[split_idx:]
-        y_train, y_test = y[:split_idx], y[split_idx:]
+        # Temporal order: [ train | validation | test ]
+        fit_windows, test_windows = windows.split(1 - test_split)
+        train_windows, val_windows = fit_windows.split(1 - validation_split)
         
-        all_X_train.append(X_train)
-        all_y_train.append(y_train)
-        all_X_test.append(X_test)
-        all_y_test.append(y_test)
+        train_parts.append(train_windows)
+        val_parts.append(val_windows)
+        test_parts.append(test_windows)
         
-        test_data_by_state[state] = (X_test, y_test)
+        test_data_by_state[state] = (test_windows.X, test_windows.y)
         
-        print(f"  {state}: Train={len(X_train)}, Test={len(X_test)}")
-    
-    # Combine all states
-    X_train = np.concatenate(all_X_train, axis=0)
-    y_train = np.concatenate(all_y_train, axis=0)
-    X_test = np.concatenate(all_X_test, axis=0)
-    y_test = np.concatenate(all_y_test, axis=0)
+        print(f"  {state}: Train={len(train_windows)}, Val={len(val_windows)}, Test={len(test_windows)}")
     
-    # Shuffle training data
-    shuffle_idx = np.random.permutation(len(X_train))
-    X_train, y_train = X_train[shuffle_idx], y_train[shuffle_idx]
+    # Training batches mix states: shuffle permutes window start indices
+    train_ds = WindowBatchDataset(ConcatWindows(train_parts), batch_size, shuffle=True)
+    val_ds = WindowBatchDataset(ConcatWindows(val_parts), batch_size, shuffle=False)
     
-    return X_train, y_train, X_test, y_test, test_data_by_state
+    return train_ds, val_ds, ConcatWindows(test_parts), test_data_by_state
 
 
 def build_lstm_model(input_shape, output_shape):
@@ -119,30 +131,32 @@ def build_lstm_model(input_shape, output_shape):
         Dense(output_shape)
     ])
     
-    model.compile(optimizer='adam', loss='mse', metrics=['mae'])
+    model.compile(optimizer='adam', loss='mse', metrics=['mae'],
+                  jit_compile=JIT_COMPILE, steps_per_execution=STEPS_PER_EXECUTION)
     model.summary()
     
     return model
 
 
-def calculate_thresholds(model, X_test, y_test, multiplier=4):
-    """Calculate MAE per band and glitch thresholds."""
-    print("Calculating glitch thresholds...")
+def calculate_thresholds(model, test_windows, multiplier=4, chunk_size=CALIBRATION_CHUNK):
+    """Calculate MAE per band, glitch thresholds and p99/p99.9 error thresholds.
     
-    predictions = model.predict(X_test, verbose=0)
+    Test windows are gathered and predicted chunk by chunk and reduced to
+    running statistics, so memory does not grow with the test set (errors
+    accumulated in float64).
+    """
+    print("Calculating glitch thresholds...")
     
-    # Calculate MAE per band
-    mae_per_band = {}
-    thresholds = {}
+    mae_per_band, thresholds, percentile_thresholds, _ = calibrate_thresholds(
+        lambda X: model.predict(X, verbose=0), test_windows.iter_chunks(chunk_size), EEG_BANDS,
+        multiplier=multiplier
+    )
     
-    for i, band in enumerate(EEG_BANDS):
-        abs_errors = np.abs(y_test[:, i] - predictions[:, i])
-        mae = np.mean(abs_errors)
-        mae_per_band[band] = float(mae)
-        thresholds[band] = float(mae * multiplier)
-        print(f"  {band}: MAE={mae:.6f}, Threshold={mae * multiplier:.6f}")
+    for band in EEG_BANDS:
+        percentiles = ', '.join(f"{key}={values[band]:.6f}" for key, values in percentile_thresholds.items())
+        print(f"  {band}: MAE={mae_per_band[band]:.6f}, Threshold={thresholds[band]:.6f}, {percentiles}")
     
-    return mae_per_band, thresholds, predictions
+    return mae_per_band, thresholds, percentile_thresholds
 
 
 def visualize_predictions(y_actual, y_pred, state_name, band_idx=3, num_samples=100):
@@ -177,13 +191,13 @@ def main():
     # Step 2: Normalize per state
     normalized_data, scalers = normalize_data(grouped_data)
     
-    # Step 3: Create sequences
-    print("\nCreating sliding window sequences...")
-    X_train, y_train, X_test, y_test, test_by_state = prepare_all_sequences(
-        normalized_data, lookback=LOOKBACK, test_split=TEST_SPLIT
+    # Step 3: Create streaming window datasets
+    print("\nCreating sliding window datasets...")
+    train_ds, val_ds, test_windows, test_by_state = prepare_window_datasets(
+        normalized_data, lookback=LOOKBACK, test_split=TEST_SPLIT,
+        validation_split=VALIDATION_SPLIT, batch_size=BATCH_SIZE
     )
-    print(f"\nTotal: X_train={X_train.shape}, y_train={y_train.shape}")
-    print(f"Total: X_test={X_test.shape}, y_test={y_test.shape}")
+    print(f"\nTotal: Train={len(train_ds.windows)}, Val={len(val_ds.windows)}, Test={len(test_windows)}")
     
     # Step 4: Build and train model
     print("\n" + "=" * 60)
@@ -193,35 +207,32 @@ def main():
     )
     
     early_stop = EarlyStopping(monitor='val_loss', patience=5, restore_best_weights=True)
+    throughput = ThroughputLogger(samples_per_epoch=len(train_ds.windows))
     
     print("\nTraining model...")
     history = model.fit(
-        X_train, y_train,
+        train_ds,
         epochs=EPOCHS,
-        batch_size=BATCH_SIZE,
-        validation_split=0.1,
-        callbacks=[early_stop],
+        validation_data=val_ds,
+        callbacks=[early_stop, throughput],
         verbose=1
     )
     
     # Step 5: Calculate thresholds
     print("\n" + "=" * 60)
-    mae_per_band, thresholds, predictions = calculate_thresholds(
-        model, X_test, y_test, multiplier=GLITCH_MULTIPLIER
+    mae_per_band, thresholds, percentile_thresholds = calculate_thresholds(
+        model, test_windows, multiplier=GLITCH_MULTIPLIER
     )
     
     # Step 6: Visualize on Focused state Beta wave
     print("\n" + "=" * 60)
-    if 'Focused' in test_by_state:
-        X_focused, y_focused = test_by_state['Focused']
-        preds_focused = model.predict(X_focused, verbose=0)
-        visualize_predictions(y_focused, preds_focused, 'Focused', band_idx=3, num_samples=100)
-    else:
-        # Fallback to first available state
-        first_state = list(test_by_state.keys())[0]
-        X_first, y_first = test_by_state[first_state]
-        preds_first = model.predict(X_first, verbose=0)
-        visualize_predictions(y_first, preds_first, first_state, band_idx=3, num_samples=100)
+    # Only the plotted windows are predicted
+    num_samples = 100
+    vis_state = 'Focused' if 'Focused' in test_by_state else list(test_by_state.keys())[0]
+    X_vis, y_vis = test_by_state[vis_state]
+    X_vis, y_vis = X_vis[:num_samples], y_vis[:num_samples]
+    preds_vis = model.predict(X_vis, verbose=0)
+    visualize_predictions(y_vis, preds_vis, vis_state, band_idx=3, num_samples=len(X_vis))
     
     # Step 7: Save artifacts
     print("\n" + "=" * 60)
@@ -237,19 +248,29 @@ def main():
     with open(scaler_path, 'wb') as f:
         pickle.dump(scalers, f)
     print(f"  Scalers saved: {scaler_path}")
+    scaler_params_path = save_scalers_npz(scalers, os.path.join(OUTPUT_DIR, 'eeg_scaler.npz'))
+    print(f"  Scaler parameters saved: {scaler_params_path}")
     
     # Save thresholds
     thresholds_path = os.path.join(OUTPUT_DIR, 'eeg_thresholds.json')
     thresholds_data = {
+        'lookback': LOOKBACK,
         'mae_per_band': mae_per_band,
         'glitch_thresholds': thresholds,
         'glitch_multiplier': GLITCH_MULTIPLIER,
+        'percentile_thresholds': percentile_thresholds,
+        'dtype': np.dtype(FLOAT_DTYPE).name,
         'bands': EEG_BANDS
     }
     with open(thresholds_path, 'w') as f:
         json.dump(thresholds_data, f, indent=2)
     print(f"  Thresholds saved: {thresholds_path}")
     
+    # Single-file bundle (weights, scalers, thresholds, lookback) for the detectors
+    bundle_path = write_bundle(os.path.join(OUTPUT_DIR, 'eeg_detector.bundle'),
+                               NumpyLSTM.from_keras(model), scalers, thresholds_data)
+    print(f"  Detector bundle saved: {bundle_path}")
+    
     print("\n" + "=" * 60)
     print("Training complete!")
     print("=" * 60)